@@ -0,0 +1,77 @@
+"""
+Compares serializing ORM like objects with plain fields, which a serializer
+fetches all at once, against the same fields with their own attribute
+getters, which are called one at a time.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.bench_attributes
+
+"""
+import operator
+import timeit
+
+from strainer import serializer, field, dict_field
+
+FIELD_COUNT = 40
+RECORD_COUNT = 5000
+REPEAT = 5
+
+NAMES = ['f%s' % (n) for n in range(FIELD_COUNT)]
+
+
+class Model(object):
+    """Like an ORM instance, attributes live in __dict__, next to a few
+    class level defaults"""
+    deleted = False
+
+    def __init__(self, i):
+        for n, name in enumerate(NAMES):
+            setattr(self, name, i + n)
+
+
+class SlottedModel(object):
+    __slots__ = NAMES
+
+    def __init__(self, i):
+        for n, name in enumerate(NAMES):
+            setattr(self, name, i + n)
+
+
+bulk_serializer = serializer(*[field(name) for name in NAMES])
+single_serializer = serializer(*[field(name, attr_getter=operator.attrgetter(name))
+                                 for name in NAMES])
+bulk_dict_serializer = serializer(*[dict_field(name) for name in NAMES])
+single_dict_serializer = serializer(*[
+    dict_field(name, attr_getter=operator.itemgetter(name)) for name in NAMES
+])
+
+
+def per_record(a_serializer, sources):
+    serialize = a_serializer.serialize
+    best = min(timeit.repeat(lambda: [serialize(source) for source in sources],
+                             number=1, repeat=REPEAT))
+    return best / len(sources) * 1e6
+
+
+def main():
+    models = [Model(i) for i in range(RECORD_COUNT)]
+    slotted = [SlottedModel(i) for i in range(RECORD_COUNT)]
+    dicts = [dict(vars(model)) for model in models]
+
+    cases = [
+        ('objects, getter per field', single_serializer, models),
+        ('objects, bulk', bulk_serializer, models),
+        ('__slots__, getter per field', single_serializer, slotted),
+        ('__slots__, bulk', bulk_serializer, slotted),
+        ('dicts, getter per field', single_dict_serializer, dicts),
+        ('dicts, bulk', bulk_dict_serializer, dicts),
+    ]
+
+    print('%s records, %s fields' % (RECORD_COUNT, FIELD_COUNT))
+    for name, a_serializer, sources in cases:
+        print('%-30s %8.2f us/record' % (name, per_record(a_serializer, sources)))
+
+
+if __name__ == '__main__':
+    main()
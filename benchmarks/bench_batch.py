@@ -0,0 +1,59 @@
+"""
+Compares the per record cost of `Translator.serialize_many`, and
+`Translator.deserialize_many` against a list comprehension over
+`serialize`, and `deserialize`.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.bench_batch
+
+"""
+import timeit
+
+from strainer import serializer, field, validators, SerializationContext
+
+FIELD_COUNT = 20
+RECORD_COUNT = 5000
+REPEAT = 5
+
+
+class Row(object):
+    def __init__(self, i):
+        for n in range(FIELD_COUNT):
+            setattr(self, 'f%s' % (n), i + n)
+
+
+row_serializer = serializer(*[
+    field('f%s' % (n), validators=[validators.required(), validators.integer()])
+    for n in range(FIELD_COUNT)
+])
+
+
+def per_record(stmt):
+    best = min(timeit.repeat(stmt, number=1, repeat=REPEAT))
+    return best / RECORD_COUNT * 1e6
+
+
+def main():
+    rows = [Row(i) for i in range(RECORD_COUNT)]
+    payloads = [row_serializer.serialize(row) for row in rows]
+    context = SerializationContext(drop_empty=True)
+
+    cases = [
+        ('serialize, list comprehension',
+         lambda: [row_serializer.serialize(row, context=context) for row in rows]),
+        ('serialize_many',
+         lambda: row_serializer.serialize_many(rows, context=context)),
+        ('deserialize, list comprehension',
+         lambda: [row_serializer.deserialize(payload) for payload in payloads]),
+        ('deserialize_many',
+         lambda: row_serializer.deserialize_many(payloads)),
+    ]
+
+    print('%s records, %s fields' % (RECORD_COUNT, FIELD_COUNT))
+    for name, stmt in cases:
+        print('%-35s %8.2f us/record' % (name, per_record(stmt)))
+
+
+if __name__ == '__main__':
+    main()
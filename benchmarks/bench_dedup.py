@@ -0,0 +1,53 @@
+"""
+Serializes posts that share a few authors, with, and without a `dedup`
+context.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.bench_dedup
+
+"""
+import datetime
+import timeit
+
+from strainer import serializer, field, child, formatters, SerializationContext
+
+POST_COUNT = 5000
+AUTHOR_COUNT = 30
+REPEAT = 5
+
+
+class Model(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+user_serializer = serializer(
+    field('id'), field('name'), field('email'), field('bio'),
+    field('joined', formatters=[formatters.format_datetime()]),
+)
+post_serializer = serializer(field('id'), field('title'),
+                             child('author', serializer=user_serializer))
+
+
+def main():
+    authors = [Model(id=n, name='User %s' % (n), email='user%s@example.com' % (n), bio='...',
+                     joined=datetime.datetime(2020, 1, 1)) for n in range(AUTHOR_COUNT)]
+    posts = [Model(id=n, title='Post %s' % (n), author=authors[n % AUTHOR_COUNT])
+             for n in range(POST_COUNT)]
+
+    def run(context_factory):
+        return min(timeit.repeat(
+            lambda: post_serializer.serialize_many(posts, context=context_factory()),
+            number=1, repeat=REPEAT)) * 1000
+
+    plain = run(lambda: None)
+    deduped = run(lambda: SerializationContext(dedup=True))
+
+    print('%s posts, %s authors' % (POST_COUNT, AUTHOR_COUNT))
+    print('without dedup %8.2f ms' % (plain))
+    print('with dedup    %8.2f ms  (%.2fx)' % (deduped, plain / deduped))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares `json.dumps(serializer.serialize(obj))` against `serializer.dumps(obj)`,
+which writes JSON straight from the field definitions.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.bench_dumps
+
+"""
+import json
+import timeit
+
+from strainer import serializer, field, child, many
+
+RECORD_COUNT = 2000
+REPEAT = 9
+
+
+class Model(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def make(i):
+    tracks = [Model(title='Track %s' % (n), number=n, length=180.5 + n) for n in range(5)]
+    artist = Model(name='Artist %s' % (i), country='NL', active=True)
+    return Model(id=i, title='Album %s' % (i), year=1990 + i % 30, rating=4.5,
+                 explicit=False, label=None, artist=artist, tracks=tracks)
+
+
+artist_serializer = serializer(field('name'), field('country'), field('active'))
+track_serializer = serializer(field('title'), field('number'), field('length'))
+album_serializer = serializer(
+    field('id'), field('title'), field('year'), field('rating'), field('explicit'),
+    field('label'), child('artist', serializer=artist_serializer),
+    many('tracks', serializer=track_serializer),
+)
+flat_serializer = serializer(*[field(name) for name in
+                               ('id', 'title', 'year', 'rating', 'explicit', 'label')])
+
+
+def per_record(function, sources):
+    best = min(timeit.repeat(lambda: [function(source) for source in sources],
+                             number=1, repeat=REPEAT))
+    return best / len(sources) * 1e6
+
+
+def main():
+    sources = [make(i) for i in range(RECORD_COUNT)]
+
+    print('%s records' % (RECORD_COUNT))
+    for name, a_serializer in [('flat', flat_serializer), ('nested', album_serializer)]:
+        serialize = a_serializer.serialize
+        via_dict = per_record(lambda source: json.dumps(serialize(source)).encode('utf-8'),
+                              sources)
+        direct = per_record(a_serializer.dumps, sources)
+        print('%-8s json.dumps(serialize()) %8.2f us/record' % (name, via_dict))
+        print('%-8s dumps()                 %8.2f us/record  (%.2fx)' % (
+            name, direct, via_dict / direct))
+
+
+if __name__ == '__main__':
+    main()
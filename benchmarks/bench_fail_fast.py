@@ -0,0 +1,66 @@
+"""
+Compares the cost of rejecting invalid payloads with, and without a
+`fail_fast` context, and with cost ordered fields.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.bench_fail_fast
+
+"""
+import timeit
+
+from strainer import serializer, field, many, validators, SerializationContext
+
+REPEAT = 5
+NUMBER = 2000
+
+item_serializer = serializer(
+    field('sku', validators=[validators.required(), validators.string(max_length=20)]),
+    field('price', validators=[validators.required(), validators.integer()]),
+)
+
+fields = [
+    many('items', serializer=item_serializer),
+    field('created', validators=[validators.datetime()]),
+    field('updated', validators=[validators.datetime()]),
+] + [
+    field('f%s' % (n), validators=[validators.required(), validators.integer()])
+    for n in range(10)
+]
+
+plain_serializer = serializer(*fields)
+ordered_serializer = serializer(*fields, order_by_cost=True)
+
+# A bot sending garbage: every field is wrong
+garbage = {
+    'items': [{'sku': None, 'price': 'x'}] * 20,
+    'created': 'yesterday',
+    'updated': 'today',
+}
+
+
+def per_payload(a_serializer, context):
+    def run():
+        try:
+            a_serializer.deserialize(garbage, context=context)
+        except Exception:
+            pass
+
+    best = min(timeit.repeat(run, number=NUMBER, repeat=REPEAT))
+    return best / NUMBER * 1e6
+
+
+def main():
+    fail_fast = SerializationContext(fail_fast=True)
+    cases = [
+        ('collect every error', plain_serializer, None),
+        ('fail_fast', plain_serializer, fail_fast),
+        ('fail_fast, order_by_cost', ordered_serializer, fail_fast),
+    ]
+
+    for name, a_serializer, context in cases:
+        print('%-30s %8.2f us/payload' % (name, per_payload(a_serializer, context)))
+
+
+if __name__ == '__main__':
+    main()
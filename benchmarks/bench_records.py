@@ -0,0 +1,52 @@
+"""
+Compares the memory held by deserialized dicts against records from a
+serializer built with `record=True`, and how long each takes to build.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.bench_records
+
+"""
+import gc
+import timeit
+import tracemalloc
+
+from strainer import serializer, field
+
+FIELD_COUNT = 10
+RECORD_COUNT = 100000
+REPEAT = 3
+
+NAMES = ['f%s' % (n) for n in range(FIELD_COUNT)]
+
+dict_serializer = serializer(*[field(name) for name in NAMES], compiled=True)
+record_serializer = serializer(*[field(name) for name in NAMES], compiled=True, record=True)
+
+
+def measure(a_serializer, items):
+    """Returns the memory held per item, and the best time to deserialize
+    all of them"""
+    elapsed = min(timeit.repeat(lambda: a_serializer.deserialize_many(items),
+                                number=1, repeat=REPEAT))
+
+    gc.collect()
+    tracemalloc.start()
+    results, _ = a_serializer.deserialize_many(items)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(results) == len(items)
+    return size / len(items), elapsed
+
+
+def main():
+    items = [dict((name, n) for name in NAMES) for n in range(RECORD_COUNT)]
+
+    print('%s items, %s fields' % (RECORD_COUNT, FIELD_COUNT))
+    for name, a_serializer in [('dicts', dict_serializer), ('records', record_serializer)]:
+        size, elapsed = measure(a_serializer, items)
+        print('%-8s %8.1f bytes/item held  %8.1f ms' % (name, size, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
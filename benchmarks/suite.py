@@ -0,0 +1,241 @@
+"""
+Measures serialize, and deserialize throughput for every structure, and
+validator against realistic schemas, so runs can be compared across upgrades.
+
+Run it from the root of the repo::
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --json results.json
+    python -m benchmarks.suite --quick --filter many
+
+Every case reports records per second, and the latency of a single record, in
+microseconds. With `--json` the results are also written out, along with the
+python, and strainer versions they were measured with.
+
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import timeit
+
+import iso8601
+
+import strainer
+from strainer import (serializer, field, multiple_field, child, many,
+                      formatters, validators, ValidationException)
+
+REPEAT = 5
+RECORD_COUNT = 2000
+QUICK_RECORD_COUNT = 200
+
+
+class Record(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def flat_schema(field_count):
+    fields = [
+        field('f%s' % (n), validators=[validators.required(), validators.integer()])
+        for n in range(field_count)
+    ]
+
+    def source(i):
+        return Record(**dict(('f%s' % (n), i + n) for n in range(field_count)))
+
+    return serializer(*fields), source
+
+
+def nested_schema(depth):
+    a_serializer = serializer(
+        field('name', validators=[validators.required(), validators.string()]),
+        field('count', validators=[validators.integer()]),
+    )
+
+    for _ in range(depth):
+        a_serializer = serializer(
+            field('name', validators=[validators.required(), validators.string()]),
+            field('count', validators=[validators.integer()]),
+            child('child', serializer=a_serializer, validators=[validators.required()]),
+        )
+
+    def source(i):
+        record = Record(name='leaf %s' % (i), count=i)
+        for _ in range(depth):
+            record = Record(name='node %s' % (i), count=i, child=record)
+
+        return record
+
+    return a_serializer, source
+
+
+item_serializer = serializer(
+    field('sku', validators=[validators.required(), validators.string(max_length=20)]),
+    field('price', validators=[validators.required(), validators.integer()]),
+    field('quantity', validators=[validators.integer(bounds=(0, 100))]),
+)
+
+
+def many_schema(item_count):
+    a_serializer = serializer(
+        field('id', validators=[validators.required(), validators.integer()]),
+        many('items', serializer=item_serializer),
+    )
+
+    items = [Record(sku='sku-%s' % (n), price=n * 100, quantity=n % 10)
+             for n in range(item_count)]
+
+    def source(i):
+        return Record(id=i, items=items)
+
+    return a_serializer, source
+
+
+def multiple_field_schema():
+    a_serializer = serializer(
+        field('id', validators=[validators.required(), validators.integer()]),
+        multiple_field('tags', validators=[validators.string(max_length=20)]),
+        multiple_field('scores', validators=[validators.integer()]),
+    )
+
+    def source(i):
+        return Record(id=i, tags=['tag-%s' % (n) for n in range(20)],
+                      scores=list(range(i % 7, i % 7 + 20)))
+
+    return a_serializer, source
+
+
+def datetime_schema():
+    fields = [
+        field('t%s' % (n), validators=[validators.datetime()],
+              formatters=[formatters.format_datetime()])
+        for n in range(10)
+    ]
+    start = datetime.datetime(2017, 1, 1, tzinfo=iso8601.UTC)
+
+    def source(i):
+        return Record(**dict(('t%s' % (n), start + datetime.timedelta(minutes=i + n))
+                             for n in range(10)))
+
+    return serializer(*fields), source
+
+
+def invalid_payload(payload):
+    """Breaks most of the scalar values in a serialized payload, keeping its
+    shape"""
+    if isinstance(payload, dict):
+        return dict((key, invalid_payload(value) if n % 5 else value)
+                    for n, (key, value) in enumerate(sorted(payload.items())))
+
+    if isinstance(payload, list):
+        return [invalid_payload(value) for value in payload]
+
+    return 'not valid'
+
+
+def measure(run, records):
+    best = min(timeit.repeat(run, number=1, repeat=REPEAT))
+    return {
+        'records_per_second': records / best if best else None,
+        'latency_us': best / records * 1e6,
+    }
+
+
+def deserialize_all(a_serializer, payloads):
+    deserialize = a_serializer.deserialize
+
+    def run():
+        for payload in payloads:
+            try:
+                deserialize(payload)
+            except ValidationException:
+                pass
+
+    return run
+
+
+def build_cases(record_count, quick):
+    many_sizes = [10, 1000] if quick else [10, 1000, 100000]
+
+    cases = [
+        ('flat 5 fields', flat_schema(5), record_count),
+        ('flat 50 fields', flat_schema(50), record_count),
+    ]
+    cases += [
+        ('child depth %s' % (depth), nested_schema(depth), record_count)
+        for depth in range(1, 6)
+    ]
+    # One parent holding more items is the same work as more records
+    cases += [
+        ('many %s items' % (size), many_schema(size), max(1, record_count // size))
+        for size in many_sizes
+    ]
+    cases += [
+        ('multiple_field', multiple_field_schema(), record_count),
+        ('datetime heavy', datetime_schema(), record_count),
+    ]
+
+    return cases
+
+
+def run_case(name, schema, count):
+    a_serializer, source = schema
+    sources = [source(i) for i in range(count)]
+    serialize = a_serializer.serialize
+
+    result = {'name': name, 'records': count}
+    result['serialize'] = measure(lambda: [serialize(s) for s in sources], count)
+
+    payloads = [serialize(s) for s in sources]
+    result['deserialize'] = measure(deserialize_all(a_serializer, payloads), count)
+
+    invalid = [invalid_payload(payload) for payload in payloads]
+    result['deserialize_invalid'] = measure(deserialize_all(a_serializer, invalid), count)
+
+    return result
+
+
+def print_result(result):
+    for operation in ['serialize', 'deserialize', 'deserialize_invalid']:
+        timing = result[operation]
+        print('%-20s %-20s %12.0f records/s %10.2f us/record' % (
+            result['name'], operation, timing['records_per_second'], timing['latency_us']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--json', help='Write the results to this file, - for stdout')
+    parser.add_argument('--quick', action='store_true', help='Fewer, smaller runs')
+    parser.add_argument('--filter', help='Only run cases with this in their name')
+    args = parser.parse_args(argv)
+
+    record_count = QUICK_RECORD_COUNT if args.quick else RECORD_COUNT
+    cases = build_cases(record_count, args.quick)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case[0]]
+
+    results = []
+    for name, schema, count in cases:
+        result = run_case(name, schema, count)
+        results.append(result)
+        if args.json != '-':
+            print_result(result)
+
+    if args.json:
+        report = {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'strainer': strainer.__version__,
+            'results': results,
+        }
+        if args.json == '-':
+            json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        else:
+            with open(args.json, 'w') as fileobj:
+                json.dump(report, fileobj, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+Async
+=====
+
+Validators can be coroutine functions, which is handy when validating against
+a database, or a cache. They only run when deserializing with
+`Translator.adeserialize`, which awaits the validators of independent fields
+concurrently, including the fields of children, and the items of a many.
+
+Validators of a single field still run in order, because each one is passed the
+value returned by the one before it.
+
+This module needs python 3.5 or newer.
+
+"""
+import asyncio
+import inspect
+
+from .context import check_context
+from .exceptions import ValidationException, ErrorCollector
+from .structure import (collecting_deserialize, collecting_serializer_deserialize,
+                        run_batch_validators, list_value, deserialize_order)
+from .records import as_record
+
+
+async def run_validators(value, validators, context):
+    """Just like `strainer.structure.run_validators`, but awaits any
+    validator that returns an awaitable."""
+    errors = []
+    for validator in validators:
+        try:
+            value = validator(value, context=context)
+            if inspect.isawaitable(value):
+                value = await value
+        except ValidationException as e:
+            errors += [e.errors]
+            if check_context(context, 'fail_fast', False):
+                break
+
+    return value, errors
+
+
+async def _field(options, source, target, context, errors, path):
+    target_field = options['target_field']
+    value, field_errors = await run_validators(source.get(target_field),
+                                               options['validators'], context)
+    if field_errors:
+        errors.extend_errors(path + (target_field,), field_errors)
+        return target
+
+    target[options['source_field']] = value
+
+    return target
+
+
+async def _validate_item(value, validators, context, errors, path):
+    value, item_errors = await run_validators(value, validators, context)
+    if item_errors:
+        errors.extend_errors(path, item_errors)
+        return FAILED
+
+    return value
+
+
+async def _multiple_field(options, source, target, context, errors, path):
+    target_field = options['target_field']
+    value = list_value(source.get(target_field))
+
+    if options.get('batch_validators'):
+        value, failed = run_batch_validators(value, options['batch_validators'], context,
+                                             errors, path + (target_field,))
+        if failed:
+            return target
+
+    results = await asyncio.gather(*[
+        _validate_item(v, options['validators'], context, errors, path + (target_field, i))
+        for i, v in enumerate(value)
+    ])
+
+    failed = FAILED in results
+    value = [result for result in results if result is not FAILED]
+
+    full_validators = options.get('full_validators')
+    if full_validators:
+        value, full_errors = await run_validators(value, full_validators, context)
+        if full_errors:
+            failed = True
+            errors.extend_errors(path + (target_field, '_full_errors'), full_errors)
+
+    if failed:
+        return target
+
+    target[options['source_field']] = value
+
+    return target
+
+
+async def _child(options, source, target, context, errors, path):
+    target_field = options['target_field']
+    sub_source = source.get(target_field)
+    sub_path = path + (target_field,)
+
+    if options.get('validators'):
+        sub_source, child_errors = await run_validators(sub_source, options['validators'],
+                                                        context)
+
+        if child_errors:
+            errors.extend_errors(sub_path, child_errors)
+            return target
+
+    error_count = len(errors)
+    value = await _adeserialize(options['serializer'], sub_source, context, errors, sub_path)
+    if len(errors) > error_count:
+        return target
+
+    target[options['source_field']] = value
+
+    return target
+
+
+async def _many(options, source, target, context, errors, path):
+    target_field = options['target_field']
+    sub_source = source.get(target_field, [])
+
+    if options.get('validators'):
+        sub_source, many_errors = await run_validators(sub_source, options['validators'],
+                                                       context)
+
+        if many_errors:
+            errors.extend_errors(path + (target_field, '_full_errors'), many_errors)
+            return target
+
+    target[options['source_field']] = list(await asyncio.gather(*[
+        _adeserialize(options['serializer'], item, context, errors, path + (target_field, i))
+        for i, item in enumerate(sub_source)
+    ]))
+
+    return target
+
+
+async def _other(translator, source, target, context, errors, path):
+    return collecting_deserialize(translator)(source, target, context, errors, path)
+
+
+STRUCTURES = {
+    'field': _field,
+    'dict_field': _field,
+    'multiple_field': _multiple_field,
+    'child': _child,
+    'many': _many,
+}
+
+FAILED = object()
+
+
+def _deserialize_field(translator, source, target, context, errors, path):
+    structure = STRUCTURES.get(translator.kind)
+    if structure is None:
+        return _other(translator, source, target, context, errors, path)
+
+    return structure(translator.options, source, target, context, errors, path)
+
+
+async def _adeserialize(translator, source, context, errors, path):
+    if translator.kind != 'serializer':
+        deserialize = collecting_serializer_deserialize(translator)
+        return deserialize(source, context, errors=errors, path=path)
+
+    options = translator.options
+    fields = deserialize_order(options['fields'], options.get('order_by_cost'))
+
+    results = await asyncio.gather(*[
+        _deserialize_field(field, source, {}, context, errors, path) for field in fields
+    ])
+
+    target = {}
+    for field, result in zip(fields, results):
+        target.update(result)
+
+        # Like deserialize, the full validators of a child see the target with
+        # every field before it, so they run once those are put together
+        full_validators = field.kind == 'child' and field.options.get('full_validators')
+        if full_validators and field.options['source_field'] in result:
+            _, full_errors = await run_validators(target, full_validators, context)
+            if full_errors:
+                errors.extend_errors(path + (field.options['target_field'], '_full_errors'),
+                                     full_errors)
+
+    return as_record(translator, target)
+
+
+async def adeserialize(translator, source, context=None):
+    """Deserializes source with a serializer translator, awaiting async
+    validators. Every field is deserialized concurrently, and the result is
+    put together in the order of the fields.
+
+    Any other translator is just deserialized as usual."""
+    errors = ErrorCollector()
+    target = await _adeserialize(translator, source, context, errors, ())
+
+    if errors:
+        raise errors.exception()
+
+    return target
@@ -0,0 +1,179 @@
+"""
+Caching
+=======
+
+Feeds tend to repeat the same values over and over, the same timestamps, the
+same enum strings, the same dates. Validators and formatters that are pure,
+meaning their result only depends on the value passed in, can be memoized so
+each distinct value is only validated, or formatted once.
+
+.. code-block:: python
+
+  >>> from strainer import validators
+  >>> from strainer.cache import memoize
+  >>> parse_date = memoize(validators.datetime(), maxsize=4096)
+
+Failures are cached too, and raised again as a new `ValidationException` with
+the same errors.
+
+"""
+from collections import OrderedDict
+
+from .exceptions import ValidationException
+
+DEFAULT_MAXSIZE = 1024
+SCOPES = ('global', 'call')
+MISSING = object()
+
+
+class LRUCache(object):
+    """A dict like cache, that holds at most `maxsize` items, dropping the
+    least recently used one when it's full.
+
+    Counts hits, and misses as it goes.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.data = OrderedDict()
+
+    def get(self, key, default=None):
+        value = self.data.pop(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            return default
+
+        self.data[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        data = self.data
+        data.pop(key, None)
+        data[key] = value
+
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.data),
+            'maxsize': self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+
+class _Failure(object):
+    """A cached ValidationException"""
+    __slots__ = ('errors',)
+
+    def __init__(self, errors):
+        self.errors = errors
+
+
+class Memoized(object):
+    """A validator, or formatter, that caches its results by value.
+
+    With `scope='global'` one cache is shared by every call. With
+    `scope='call'` the cache is kept on the context passed in, so it only lives
+    as long as that context, and nothing is cached without a context.
+    """
+
+    def __init__(self, function, maxsize=DEFAULT_MAXSIZE, scope='global'):
+        if scope not in SCOPES:
+            raise ValueError('Unknown scope: %s' % (scope))
+
+        self.function = function
+        self.maxsize = maxsize
+        self.scope = scope
+        self.cache = LRUCache(maxsize) if scope == 'global' else None
+
+        cost = getattr(function, 'cost', None)
+        if cost is None:
+            cost = getattr(getattr(function, 'func', None), 'cost', None)
+
+        if cost is not None:
+            self.cost = cost
+
+    def cache_for(self, context=None):
+        """Returns the LRUCache used for calls made with context, or None"""
+        if self.cache is not None:
+            return self.cache
+
+        if context is None:
+            return None
+
+        caches = getattr(context, '_memoized', None)
+        if caches is None:
+            caches = {}
+            context._memoized = caches
+
+        cache = caches.get(self)
+        if cache is None:
+            cache = caches[self] = LRUCache(self.maxsize)
+
+        return cache
+
+    def __call__(self, value, context=None):
+        cache = self.cache
+        if cache is None:
+            cache = self.cache_for(context)
+            if cache is None:
+                return self.function(value, context=context)
+
+        # Include the type, so 1, 1.0, and True are cached separately
+        try:
+            key = (type(value), value)
+            result = cache.get(key, MISSING)
+        except TypeError:
+            return self.function(value, context=context)
+
+        if result is MISSING:
+            try:
+                result = self.function(value, context=context)
+            except ValidationException as e:
+                cache.set(key, _Failure(e.errors))
+                raise
+
+            cache.set(key, result)
+            return result
+
+        if result.__class__ is _Failure:
+            raise ValidationException(result.errors)
+
+        return result
+
+    def __reduce__(self):
+        return (Memoized, (self.function, self.maxsize, self.scope))
+
+
+def memoize(function, maxsize=DEFAULT_MAXSIZE, scope='global'):
+    """Wraps a pure validator, or formatter, so its results are cached in a
+    bounded LRU cache.
+
+    :param function: A validator, or formatter, like `validators.datetime()`
+    :param int maxsize: The most values to remember
+    :param str scope: `global` to share one cache between every call, or `call`
+                      to keep a cache on each context
+    """
+    return Memoized(function, maxsize=maxsize, scope=scope)
@@ -0,0 +1,151 @@
+"""
+Changes
+=======
+
+When an object changes a few attributes at a time, like one pushed over a
+websocket on every update, serializing it all again, and then diffing the
+output is wasteful. `serialize_changed` takes the names of the attributes
+that changed, and the previous output, and only runs the fields that read
+those attributes. It returns the updated document, and a patch from the
+previous one to it.
+
+>>> from strainer import serializer, field
+>>> a_serializer = serializer(field('id'), field('name'))
+>>> previous = {'id': 1, 'name': 'Changes'}
+>>> class Track(object):
+...     id = 1
+...     name = 'Kooks'
+>>> a_serializer.serialize_changed(Track(), ['name'], previous)
+({'id': 1, 'name': 'Kooks'}, {'name': 'Kooks'})
+
+The patch is a JSON Merge Patch (RFC 7386) by default, or a JSON Patch
+(RFC 6902) with `patch='json'`. In a merge patch null means a key was
+removed, so use a JSON Patch when the output itself has nulls that matter.
+
+Fields are matched by the first part of their source field. Custom
+translators, and fields with an `attr_getter` can read anything, so they always
+run, and keys custom translators stop writing are not removed.
+
+"""
+from .exceptions import json_pointer
+
+PATCH_FORMATS = ('merge', 'json')
+
+
+def _index(translator):
+    """Returns the positions of the fields of a serializer, keyed by the
+    attribute they read, and of the custom translators, and fields with an
+    attr_getter, that have to run for any change"""
+    if translator._changes is None:
+        by_attribute = {}
+        always = []
+
+        for position, field in enumerate(translator.options['fields']):
+            source_field = field.options.get('source_field') if field.kind else None
+            if source_field is None or field.options.get('attr_getter') is not None:
+                always.append(position)
+                continue
+
+            by_attribute.setdefault(source_field.split('.')[0], []).append(position)
+
+        translator._changes = (by_attribute, always)
+
+    return translator._changes
+
+
+def merge_patch(old, new):
+    """Returns the JSON Merge Patch that turns old into new"""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return new
+
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif old[key] != value:
+            patch[key] = merge_patch(old[key], value)
+
+    for key in old:
+        if key not in new:
+            patch[key] = None
+
+    return patch
+
+
+def json_patch(old, new, path=()):
+    """Returns the JSON Patch operations that turn old into new"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key, value in new.items():
+            if key not in old:
+                operations.append({'op': 'add', 'path': json_pointer(path + (key,)),
+                                   'value': value})
+            elif old[key] != value:
+                operations.extend(json_patch(old[key], value, path + (key,)))
+
+        for key in old:
+            if key not in new:
+                operations.append({'op': 'remove', 'path': json_pointer(path + (key,))})
+
+        return operations
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        operations = []
+        for i, (old_item, new_item) in enumerate(zip(old, new)):
+            if old_item != new_item:
+                operations.extend(json_patch(old_item, new_item, path + (i,)))
+
+        return operations
+
+    return [{'op': 'replace', 'path': json_pointer(path), 'value': new}]
+
+
+def serialize_changed(translator, source, changed_fields, previous, context=None,
+                      patch='merge'):
+    """Updates the previous output of a serializer, by only running the
+    fields that read one of the changed attributes.
+
+    :param source: The object that changed
+    :param changed_fields: The names of the attributes that changed
+    :param dict previous: What the serializer returned for source before it
+                          changed, it's left as it is
+    :param str patch: `merge` for a JSON Merge Patch, `json` for a JSON Patch
+    :returns: The updated document, and the patch from previous to it
+    """
+    if translator.kind != 'serializer':
+        raise TypeError('Only serializers can serialize changes')
+
+    if patch not in PATCH_FORMATS:
+        raise ValueError('Unknown patch format: %s' % (patch))
+
+    by_attribute, always = _index(translator)
+
+    positions = set(always)
+    for name in changed_fields:
+        positions.update(by_attribute.get(name, ()))
+
+    # Rebuilt in field order, so keys come out in the same order as serialize
+    document = {}
+    touched = set()
+    for position, field in enumerate(translator.options['fields']):
+        target_field = field.options.get('target_field')
+
+        if position not in positions:
+            if target_field in previous:
+                document[target_field] = previous[target_field]
+            continue
+
+        written = field.serialize(source, {}, context=context)
+        document.update(written)
+        touched.update(written)
+        if target_field is not None:
+            # drop_empty might leave the field out this time
+            touched.add(target_field)
+
+    old = dict((key, previous[key]) for key in touched if key in previous)
+    new = dict((key, document[key]) for key in touched if key in document)
+
+    if patch == 'merge':
+        return document, merge_patch(old, new)
+
+    return document, json_patch(old, new)
@@ -0,0 +1,253 @@
+"""
+Columns
+=======
+
+Analytics results are often consumed as columns rather than rows. Instead of
+serializing every object into its own dict, and pivoting those into columns,
+`serialize_columns` builds `{target_field: column}` directly from the field
+definitions of a serializer. With `numpy=True` numeric, and datetime columns
+are returned as NumPy arrays.
+
+`deserialize_columns` goes the other way, and validates a whole column at a
+time.
+
+>>> from strainer import serializer, field
+>>> a_serializer = serializer(field('a'))
+
+Children are serialized into nested columns, manys into a column of lists.
+Children whose serializer isn't a plain serializer, like a cached one, are
+serialized into a column of dicts.
+drop_empty does not apply to columns, every column has a value for every row.
+
+"""
+import datetime
+import numbers
+import operator
+
+from .exceptions import ErrorCollector
+from .context import check_context
+from .structure import run_validators, collecting_deserialize
+
+FIELD_KINDS = ('field', 'dict_field', 'multiple_field')
+
+
+def _check_serializer(translator):
+    if translator.kind != 'serializer':
+        raise TypeError('Columns can only be used with a serializer')
+
+
+def _getter(translator):
+    options = translator.options
+    if options.get('attr_getter'):
+        return options['attr_getter']
+
+    if translator.kind == 'dict_field':
+        source_field = options['source_field']
+        return lambda source: source.get(source_field)
+
+    return operator.attrgetter(options['source_field'])
+
+
+def _to_array(np, column):
+    """Returns column as a NumPy array if every value is a number, or a
+    datetime, otherwise returns it unchanged"""
+    types = set(map(type, column))
+    if not types:
+        return column
+
+    if all(issubclass(t, numbers.Real) for t in types):
+        return np.array(column)
+
+    if all(issubclass(t, datetime.datetime) for t in types):
+        # NumPy has no timezones, so aware datetimes are converted to UTC
+        return np.array([
+            value.replace(tzinfo=None) - value.utcoffset() if value.tzinfo else value
+            for value in column
+        ], dtype='datetime64[us]')
+
+    if all(issubclass(t, datetime.date) for t in types):
+        return np.array(column, dtype='datetime64[D]')
+
+    return column
+
+
+def _serialize_columns(translator, sources, context, np):
+    columns = {}
+
+    for field in translator.options['fields']:
+        kind = field.kind
+
+        if kind in FIELD_KINDS:
+            column = list(map(_getter(field), sources))
+            for formatter in field.options.get('formatters') or []:
+                column = [formatter(value, context) for value in column]
+        elif kind == 'child' and field.options['serializer'].kind == 'serializer':
+            column = _serialize_columns(field.options['serializer'],
+                                        list(map(_getter(field), sources)), context, np)
+        elif kind == 'child':
+            # Only a serializer has fields to make nested columns from
+            serialize = field.options['serializer'].serialize
+            column = [serialize(value, context=context) for value in map(_getter(field), sources)]
+        elif kind == 'many':
+            serialize = field.options['serializer'].serialize
+            column = [[serialize(item, context=context) for item in items]
+                      for items in map(_getter(field), sources)]
+        else:
+            # A custom translator can write any keys, so serialize it row by
+            # row, and pivot what it writes
+            for i, source in enumerate(sources):
+                for key, value in field.serialize(source, {}, context=context).items():
+                    columns.setdefault(key, [None] * len(sources))[i] = value
+            continue
+
+        if np is not None and kind in FIELD_KINDS:
+            column = _to_array(np, column)
+
+        columns[field.options['target_field']] = column
+
+    return columns
+
+
+def serialize_columns(translator, sources, context=None, numpy=False):
+    """Serializes objects with a serializer into a dict of columns, one for
+    each field, keyed by the target field.
+
+    :param sources: An iterable of objects
+    :param bool numpy: Return numeric, and datetime columns as NumPy arrays
+    """
+    _check_serializer(translator)
+
+    np = None
+    if numpy:
+        import numpy as np
+
+    return _serialize_columns(translator, list(sources), context, np)
+
+
+def _rows(columns, length):
+    """Pivots nested columns back into a list of dicts"""
+    keys = list(columns)
+    values = [_column(columns, key, length) for key in keys]
+
+    return [dict(zip(keys, row)) for row in zip(*values)] if keys else [{} for _ in range(length)]
+
+
+def _column(columns, key, length):
+    column = columns.get(key)
+    if column is None:
+        return [None] * length
+
+    if isinstance(column, dict):
+        return _rows(column, length)
+
+    if hasattr(column, 'tolist'):
+        column = column.tolist()
+
+    if len(column) != length:
+        raise ValueError('Column %s has %s rows, expected %s' % (key, len(column), length))
+
+    return column
+
+
+def _length(columns):
+    for column in columns.values():
+        if isinstance(column, dict):
+            length = _length(column)
+            if length is not None:
+                return length
+        elif column is not None:
+            return len(column)
+
+    return None
+
+
+def _deserialize_columns(translator, columns, length, context):
+    result = {}
+    row_errors = {}
+    fail_fast = check_context(context, 'fail_fast', False)
+
+    def errors_for(i):
+        errors = row_errors.get(i)
+        if errors is None:
+            errors = row_errors[i] = ErrorCollector()
+
+        return errors
+
+    for field in translator.options['fields']:
+        kind = field.kind
+        options = field.options
+
+        if kind in ('field', 'dict_field'):
+            target_field = options['target_field']
+            validators = options['validators']
+            column = _column(columns, target_field, length)
+
+            if validators:
+                validated = []
+                for i, value in enumerate(column):
+                    value, field_errors = run_validators(value, validators, context)
+                    if field_errors:
+                        errors_for(i).extend_errors((target_field,), field_errors)
+                    validated.append(value)
+                column = validated
+
+            result[options['source_field']] = column
+
+        elif kind == 'child' and options['serializer'].kind == 'serializer' \
+                and isinstance(columns.get(options['target_field']), dict) \
+                and not options.get('validators') and not options.get('full_validators'):
+            child_columns, child_errors = _deserialize_columns(
+                options['serializer'], columns[options['target_field']], length, context)
+
+            for i, errors in child_errors.items():
+                errors_for(i).merge((options['target_field'],), errors)
+
+            result[options['source_field']] = _rows(child_columns, length)
+
+        else:
+            # Everything else is deserialized row by row, from just the
+            # columns it reads
+            deserialize = collecting_deserialize(field)
+            keys = [options['target_field']] if 'target_field' in options else list(columns)
+            key_columns = [(key, _column(columns, key, length)) for key in keys]
+
+            for i in range(length):
+                errors = ErrorCollector()
+                target = deserialize(dict((key, column[i]) for key, column in key_columns),
+                                     {}, context, errors, ())
+                if errors:
+                    row_errors.setdefault(i, ErrorCollector()).extend(errors)
+                    continue
+
+                for key, value in target.items():
+                    result.setdefault(key, [None] * length)[i] = value
+
+        if row_errors and fail_fast:
+            break
+
+    return result, dict((i, errors.errors) for i, errors in row_errors.items())
+
+
+def deserialize_columns(translator, columns, context=None):
+    """Validates a dict of columns, keyed by target field, with a serializer,
+    a whole column at a time.
+
+    Columns can be lists, or anything with a `tolist` method, like a NumPy
+    array. A missing column counts as a column of None, and nested columns
+    can be given for a child.
+
+    Just like `deserialize_many`, returns the valid rows as a dict of columns,
+    keyed by source field, and a dict of errors keyed by the index of every
+    row that failed. With a fail_fast context it stops after the first column
+    with an error.
+    """
+    _check_serializer(translator)
+
+    length = _length(columns) or 0
+    result, error_dict = _deserialize_columns(translator, columns, length, context)
+
+    if error_dict:
+        valid = [i for i in range(length) if i not in error_dict]
+        result = dict((key, [column[i] for i in valid]) for key, column in result.items())
+
+    return result, error_dict
@@ -0,0 +1,385 @@
+"""
+Compiler
+========
+
+Compiling a serializer generates one specialized python function for each
+direction. When serializing, attribute access, formatter calls, and the
+drop_empty decision are written inline, instead of going through a closure for
+every field. When deserializing, key lookups and validator calls are written
+inline, and an error collector is only created once something actually
+fails.
+
+The compiled functions return, and raise, exactly what the regular serializer
+does.
+
+>>> from strainer import serializer, field
+>>> a_serializer = serializer(field('a'), compiled=True)
+
+"""
+import keyword
+import operator
+import re
+
+from .context import check_context
+from . import dedup
+from .lazy import is_lazy, LazyChild, LazyMany
+from .exceptions import ValidationException, ErrorCollector
+from .structure import (Translator, emptyish, deserialize_order,
+                        collecting_deserialize, partial_deserialize, profiled,
+                        not_awaited)
+
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+FIELD_KINDS = ('field', 'dict_field', 'multiple_field')
+
+# Collectors that were handed to nested structures, and came back empty. Valid
+# payloads reuse them, instead of making a new one for every item.
+_spare_collectors = []
+
+
+def is_identifier(name):
+    return bool(IDENTIFIER.match(name)) and not keyword.iskeyword(name)
+
+
+def attribute_expression(source_field):
+    """Returns python source for fetching source_field off of `source`, or
+    None if operator.attrgetter would have to be used instead."""
+    parts = source_field.split('.')
+    if all(is_identifier(part) for part in parts):
+        return 'source.' + '.'.join(parts)
+
+    return None
+
+
+class CodeBuilder(object):
+    """Collects lines of source, and the values they refer to"""
+
+    def __init__(self, fail_fast_lines=None):
+        self.lines = []
+        self.depth = 0
+        self.fail_fast_lines = fail_fast_lines or []
+        self.namespace = {
+            'check_context': check_context,
+            'emptyish': emptyish,
+            'ValidationException': ValidationException,
+            'ErrorCollector': ErrorCollector,
+        }
+
+    def line(self, text, indent=1):
+        self.lines.append('    ' * (self.depth + indent) + text)
+
+    def fail_fast(self, indent=1):
+        """Writes the lines that stop deserializing with a fail_fast context"""
+        self.line('if check_context(context, "fail_fast", False):', indent=indent)
+        for line in self.fail_fast_lines:
+            self.line(line, indent=indent + 1)
+
+    def constant(self, name, value):
+        self.namespace[name] = value
+        return name
+
+    def build(self, name):
+        source = '\n'.join(self.lines) + '\n'
+        code = compile(source, '<strainer-compiled %s>' % (name), 'exec')
+        exec(code, self.namespace)
+        function = self.namespace[name]
+        function.source = source
+
+        return function
+
+
+def _getter_expression(builder, translator, index):
+    options = translator.options
+    attr_getter = options.get('attr_getter')
+    source_field = options['source_field']
+
+    if attr_getter is None:
+        if translator.kind == 'dict_field':
+            return 'source.get(%r)' % (source_field)
+
+        expression = attribute_expression(source_field)
+        if expression:
+            return expression
+
+        attr_getter = operator.attrgetter(source_field)
+
+    return '%s(source)' % builder.constant('_getter_%s' % (index), attr_getter)
+
+
+def _serialize_field(builder, translator, index):
+    options = translator.options
+    builder.line('value = %s' % (_getter_expression(builder, translator, index)))
+
+    for i, formatter in enumerate(options.get('formatters') or []):
+        name = builder.constant('_formatter_%s_%s' % (index, i), formatter)
+        builder.line('value = %s(value, context)' % (name))
+
+    builder.line('if not drop_empty or not emptyish(value):')
+    builder.line('target[%r] = value' % (options['target_field']), indent=2)
+
+
+def _serialize_child(builder, translator, index):
+    options = translator.options
+    sub_serialize = builder.constant('_serialize_%s' % (index),
+                                     options['serializer'].serialize)
+    builder.line('if lazy:')
+    builder.line('target[%r] = LazyChild(%s, %s, context)' % (
+        options['target_field'], sub_serialize, _getter_expression(builder, translator, index)),
+        indent=2)
+    builder.line('else:')
+    builder.depth += 1
+    sub_serializer = builder.constant('_serializer_%s' % (index), options['serializer'])
+    getter = _getter_expression(builder, translator, index)
+    builder.line('if dedup:')
+    builder.line('value = dedup_serialize(%s, %s, context)' % (sub_serializer, getter), indent=2)
+    builder.line('else:')
+    builder.line('value = %s(%s, context=context)' % (sub_serialize, getter), indent=2)
+    builder.line('if not drop_empty or not emptyish(value):')
+    builder.line('target[%r] = value' % (options['target_field']), indent=2)
+    builder.depth -= 1
+
+
+def _serialize_many(builder, translator, index):
+    options = translator.options
+    sub_serialize = builder.constant('_serialize_%s' % (index),
+                                     options['serializer'].serialize)
+    builder.line('if lazy:')
+    builder.line('target[%r] = LazyMany(%s, %s, context)' % (
+        options['target_field'], sub_serialize, _getter_expression(builder, translator, index)),
+        indent=2)
+    builder.line('else:')
+    builder.depth += 1
+    sub_serializer = builder.constant('_serializer_%s' % (index), options['serializer'])
+    getter = _getter_expression(builder, translator, index)
+    builder.line('if dedup:')
+    builder.line('value = dedup_serialize_each(%s, %s, context)' % (sub_serializer, getter),
+                 indent=2)
+    builder.line('else:')
+    builder.line('value = [%s(i, context=context) for i in %s]' % (sub_serialize, getter),
+                 indent=2)
+    builder.line('if not drop_empty or not emptyish(value):')
+    builder.line('target[%r] = value' % (options['target_field']), indent=2)
+    builder.depth -= 1
+
+
+def _serialize_other(builder, translator, index):
+    name = builder.constant('_translator_%s' % (index), translator.serialize)
+    builder.line('%s(source, target, context=context)' % (name))
+
+
+def _serialize_setup(builder, translator):
+    """Writes the lines that check the context once, before serializing"""
+    builder.line('drop_empty = check_context(context, "drop_empty", False)')
+    if any(field.kind in ('child', 'many') for field in translator.options['fields']):
+        builder.constant('is_lazy', is_lazy)
+        builder.constant('LazyChild', LazyChild)
+        builder.constant('LazyMany', LazyMany)
+        builder.constant('dedup_serialize', dedup.serialize)
+        builder.constant('dedup_serialize_each', dedup.serialize_each)
+        builder.line('lazy = context is not None and is_lazy(context)')
+        builder.line('dedup = context is not None and check_context(context, "dedup")')
+
+
+def _serialize_body(builder, translator):
+    builder.line('target = {}')
+
+    for index, field in enumerate(translator.options['fields']):
+        if field.kind in FIELD_KINDS:
+            _serialize_field(builder, field, index)
+        elif field.kind == 'child':
+            _serialize_child(builder, field, index)
+        elif field.kind == 'many':
+            _serialize_many(builder, field, index)
+        else:
+            _serialize_other(builder, field, index)
+
+
+def _profile_dispatch(builder, translator, call):
+    """Writes the lines that hand a call over to the profiled copy of the
+    serializer, when the context has a profile"""
+    builder.constant('translator', translator)
+    builder.constant('profiled', profiled)
+    builder.line('if context is not None and check_context(context, "profile") is not None:')
+    builder.line('return profiled(translator).%s' % (call), indent=2)
+
+
+def compile_serialize(translator):
+    """Generates a serialize function for a serializer translator.
+
+    Fields, dict fields, multiple fields, children, and manys are written
+    inline, any other translator is called just like the serializer would.
+    """
+    builder = CodeBuilder()
+    builder.line('def serialize(source, context=None):', indent=0)
+    _profile_dispatch(builder, translator, 'serialize(source, context)')
+    builder.constant('dedup_needs_scope', dedup.needs_scope)
+    builder.constant('dedup_scoped', dedup.scoped)
+    builder.line('if context is not None and dedup_needs_scope(context):')
+    builder.line('return dedup_scoped(serialize, source, context)', indent=2)
+    _serialize_setup(builder, translator)
+    _serialize_body(builder, translator)
+    builder.line('return target')
+
+    return builder.build('serialize')
+
+
+def compile_serialize_many(translator):
+    """Generates a function that serializes an iterable of objects with a
+    serializer translator, and returns a list.
+
+    The context is only checked once for the whole batch.
+    """
+    builder = CodeBuilder()
+    builder.line('def serialize_many(sources, context=None):', indent=0)
+    _serialize_setup(builder, translator)
+    builder.line('results = []')
+    builder.line('append = results.append')
+    builder.line('for source in sources:')
+    builder.depth = 1
+    _serialize_body(builder, translator)
+    builder.line('append(target)')
+    builder.depth = 0
+    builder.line('return results')
+
+    return builder.build('serialize_many')
+
+
+def _check_awaitable(builder, name, indent):
+    builder.constant('not_awaited', not_awaited)
+    builder.line('if hasattr(value, "__await__"):', indent=indent)
+    builder.line('not_awaited(value, %s)' % (name), indent=indent + 1)
+
+
+def _deserialize_field(builder, translator, index):
+    options = translator.options
+    validators = options.get('validators') or []
+
+    if not validators:
+        builder.line('target[%r] = source.get(%r)' % (options['source_field'],
+                                                      options['target_field']))
+        return
+
+    builder.line('value = source.get(%r)' % (options['target_field']))
+    builder.line('field_errors = None')
+
+    for i, validator in enumerate(validators):
+        name = builder.constant('_validator_%s_%s' % (index, i), validator)
+        if i == 0:
+            builder.line('try:')
+            builder.line('value = %s(value, context=context)' % (name), indent=2)
+            _check_awaitable(builder, name, indent=2)
+            builder.line('except ValidationException as e:')
+            builder.line('field_errors = [e.errors]', indent=2)
+            continue
+
+        builder.line('if field_errors is None or not check_context(context, "fail_fast", False):')
+        builder.line('try:', indent=2)
+        builder.line('value = %s(value, context=context)' % (name), indent=3)
+        _check_awaitable(builder, name, indent=3)
+        builder.line('except ValidationException as e:', indent=2)
+        builder.line('if field_errors is None:', indent=3)
+        builder.line('field_errors = [e.errors]', indent=4)
+        builder.line('else:', indent=3)
+        builder.line('field_errors.append(e.errors)', indent=4)
+
+    builder.line('if field_errors is None:')
+    builder.line('target[%r] = value' % (options['source_field']), indent=2)
+    builder.line('else:')
+    builder.line('if errors is None:', indent=2)
+    builder.line('errors = ErrorCollector()', indent=3)
+    builder.line('errors.extend_errors(path + (%r,), field_errors)' % (options['target_field']),
+                 indent=2)
+    builder.fail_fast(indent=2)
+
+
+def _deserialize_other(builder, translator, index):
+    name = builder.constant('_translator_%s' % (index), collecting_deserialize(translator))
+    builder.constant('spare_collectors', _spare_collectors)
+    builder.line('if errors is None:')
+    builder.line('errors = spare_collectors.pop() if spare_collectors else ErrorCollector()',
+                 indent=2)
+    builder.line('%s(source, target, context, errors, path)' % (name))
+    builder.line('if errors:')
+    builder.fail_fast(indent=2)
+
+
+def _deserialize_body(builder, translator):
+    builder.line('target = {}')
+
+    options = translator.options
+    fields = deserialize_order(options['fields'], options.get('order_by_cost'))
+
+    for index, field in enumerate(fields):
+        if field.kind in ('field', 'dict_field'):
+            _deserialize_field(builder, field, index)
+        else:
+            _deserialize_other(builder, field, index)
+
+
+def _record_expression(builder, translator):
+    """Returns the expression for what a serializer deserializes to, the
+    target dict, or a record made from it"""
+    if translator._record is None:
+        return 'target'
+
+    return '%s(target)' % (builder.constant('make_record', translator._record.from_dict))
+
+
+def compile_deserialize(translator):
+    """Generates a deserialize function for a serializer translator.
+
+    Fields, and dict fields have their validators written inline, any other
+    translator is called just like the serializer would.
+    """
+    builder = CodeBuilder(['if owner:', '    raise errors.exception()', 'return target'])
+    builder.line('def deserialize(source, context=None, errors=None, path=(), partial=False):',
+                 indent=0)
+    _profile_dispatch(builder, translator, 'deserialize(source, context, errors, path, partial)')
+    builder.constant('partial_deserialize', partial_deserialize)
+    builder.line('if partial:')
+    builder.line('return partial_deserialize(translator, source, context, errors, path)', indent=2)
+    builder.constant('spare_collectors', _spare_collectors)
+    builder.line('owner = errors is None')
+    _deserialize_body(builder, translator)
+    builder.line('if owner and errors is not None:')
+    builder.line('if errors:', indent=2)
+    builder.line('raise errors.exception()', indent=3)
+    builder.line('spare_collectors.append(errors)', indent=2)
+    builder.line('return %s' % (_record_expression(builder, translator)))
+
+    return builder.build('deserialize')
+
+
+def compile_deserialize_many(translator):
+    """Generates a function that deserializes an iterable of items with a
+    serializer translator.
+
+    It returns a list of the items that deserialized, and a dict of errors
+    keyed by the index of the item that failed. With a fail_fast context it
+    stops at the first item that fails.
+    """
+    builder = CodeBuilder(['error_dict[index] = errors.errors', 'break'])
+    builder.line('def deserialize_many(sources, context=None):', indent=0)
+    builder.line('results = []')
+    builder.line('append = results.append')
+    builder.line('error_dict = {}')
+    builder.line('path = ()')
+    builder.line('errors = None')
+    builder.line('for index, source in enumerate(sources):')
+    builder.depth = 1
+    _deserialize_body(builder, translator)
+    builder.line('if errors:')
+    builder.line('error_dict[index] = errors.errors', indent=2)
+    # An empty collector is kept for the next item
+    builder.line('errors = None', indent=2)
+    builder.line('else:')
+    builder.line('append(%s)' % (_record_expression(builder, translator)), indent=2)
+    builder.depth = 0
+    builder.line('return results, error_dict')
+
+    return builder.build('deserialize_many')
+
+
+def compile_serializer(translator):
+    """Returns a new translator, with the compiled functions of a serializer"""
+    return Translator(compile_serialize(translator), compile_deserialize(translator),
+                      translator.kind, dict(translator.options, compiled=True))
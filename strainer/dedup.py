@@ -0,0 +1,102 @@
+"""
+Dedup
+=====
+
+When many objects point at the same few sub-objects, like 5000 posts written
+by 30 authors, every `child`, and `many` serializes each author over, and over
+again. Serializing with a context that has `dedup=True` remembers what every
+sub-object serialized to, keyed by its identity, so a repeated one is only
+serialized once, and the same dict is shared wherever it shows up.
+
+>>> from strainer import SerializationContext
+>>> context = SerializationContext(dedup=True)
+>>> posts = post_serializer.serialize_many(all_posts, context=context)  # doctest: +SKIP
+
+`dedup` can also be a function that returns a key for a sub-object, like
+`lambda user: user.id`, so different instances of the same row are shared too.
+
+The memo only lives for the outermost `serialize`, or `serialize_many` call,
+and each thread has its own, so a context can be shared between calls, and
+threads. Shared dicts should not be modified.
+
+While deduping, objects that refer back to themselves, directly or through
+other objects, raise a `CircularReferenceError` as soon as the same object is
+reached again with the same serializer, instead of recursing until Python
+runs out of stack.
+
+"""
+import threading
+
+from .context import check_context
+
+_local = threading.local()
+
+
+class CircularReferenceError(ValueError):
+    """Raised when serializing an object would serialize it again, forever"""
+
+
+class Memo(object):
+    """What sub-objects have serialized to, and which ones are being
+    serialized right now"""
+    __slots__ = ('values', 'active')
+
+    def __init__(self):
+        self.values = {}
+        self.active = set()
+
+
+def current():
+    """Returns the memo of the call being made in this thread, or None"""
+    return getattr(_local, 'memo', None)
+
+
+def needs_scope(context):
+    """Returns whether a call with context has to start a new memo"""
+    return bool(check_context(context, 'dedup')) and current() is None
+
+
+def scoped(function, source, context):
+    """Calls function with a new memo, that's dropped once it returns"""
+    _local.memo = Memo()
+    try:
+        return function(source, context=context)
+    finally:
+        _local.memo = None
+
+
+def serialize(serializer, source, context):
+    """Serializes source with serializer, unless it was already serialized
+    during this call"""
+    memo = current()
+    if memo is None:
+        return scoped(lambda source, context: serialize(serializer, source, context),
+                      source, context)
+
+    key_function = context.dedup
+    key = (serializer, key_function(source) if callable(key_function) else id(source))
+
+    found = memo.values.get(key)
+    if found is not None:
+        return found[0]
+
+    marker = (serializer, id(source))
+    active = memo.active
+    if marker in active:
+        raise CircularReferenceError('Circular reference detected, %r refers back to itself'
+                                     % (source,))
+
+    active.add(marker)
+    try:
+        value = serializer.serialize(source, context=context)
+    finally:
+        active.discard(marker)
+
+    # Keeping the source alive makes sure its id isn't reused during the call
+    memo.values[key] = (value, source)
+
+    return value
+
+
+def serialize_each(serializer, sources, context):
+    return [serialize(serializer, source, context) for source in sources]
@@ -0,0 +1,134 @@
+"""
+Document Cache
+==============
+
+Some embedded objects, like user profiles, or product cards, are serialized
+over, and over, across requests, and come out the same every time. `cached`
+wraps the serializer of a `child`, or `many` so what it serializes to is kept
+in a cache, and reused by every later call.
+
+.. code-block:: python
+
+  >>> from strainer import serializer, field, child
+  >>> from strainer.documents import cached, DocumentCache
+  >>> user_serializer = serializer(field('id'), field('name'))
+  >>> cached_users = cached(user_serializer, key=lambda user: user.id,
+  ...                       version=lambda user: user.updated_at,
+  ...                       cache=DocumentCache(maxsize=10000, ttl=300))
+  >>> post_serializer = serializer(field('title'), child('author', serializer=cached_users))
+
+Entries are keyed by the serializer, and the key of the object. Each entry
+remembers the version of the object it was serialized from, so an object with
+a new version is serialized again. `invalidate` drops an object explicitly.
+
+Any object with `get(key)`, `set(key, value)`, and `delete(key)` methods can be
+used as the cache, where `get` returns None for a missing key, like a client
+for a shared store. Keys are tuples, so a shared store needs a wrapper that
+turns them into strings, and a `name` for the serializer, since the
+serializer itself can't be part of a shared key.
+
+Only cache serializers whose output depends on nothing but the object.
+Cached dicts are shared between calls, so they should not be modified.
+
+"""
+import time
+
+from .cache import LRUCache, MISSING, DEFAULT_MAXSIZE
+from .context import check_context
+from .structure import Translator
+
+_timer = getattr(time, 'monotonic', time.time)
+
+
+class DocumentCache(LRUCache):
+    """An in-process cache for serialized documents, that holds at most
+    `maxsize` of them, and forgets each one `ttl` seconds after it was set.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=None, timer=_timer):
+        super(DocumentCache, self).__init__(maxsize)
+        self.ttl = ttl
+        self.timer = timer
+
+    def get(self, key, default=None):
+        entry = super(DocumentCache, self).get(key, MISSING)
+        if entry is MISSING:
+            return default
+
+        value, expires = entry
+        if expires is not None and expires <= self.timer():
+            self.delete(key)
+            self.hits -= 1
+            self.misses += 1
+            return default
+
+        return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else self.timer() + self.ttl
+        super(DocumentCache, self).set(key, (value, expires))
+
+
+class CachedSerializer(Translator):
+    """A serializer whose output is cached, see :func:`cached`"""
+
+    def __init__(self, serializer, key, version=None, cache=None, name=None):
+        super(CachedSerializer, self).__init__(self._serialize, serializer.deserialize)
+        self.serializer = serializer
+        self.key = key
+        self.version = version
+        self.cache = cache if cache is not None else DocumentCache()
+        self.name = name if name is not None else serializer
+        self.hits = 0
+        self.misses = 0
+
+    def _serialize(self, source, context=None):
+        serialize = self.serializer.serialize
+        if context is not None and (check_context(context, 'lazy', False) or
+                                    check_context(context, 'profile') is not None):
+            return serialize(source, context=context)
+
+        drop_empty = bool(check_context(context, 'drop_empty', False))
+        cache_key = (self.name, self.key(source), drop_empty)
+        version = self.version(source) if self.version is not None else None
+
+        entry = self.cache.get(cache_key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = serialize(source, context=context)
+        self.cache.set(cache_key, (version, value))
+
+        return value
+
+    def invalidate(self, key):
+        """Drops the cached documents of the object with this key"""
+        for drop_empty in (False, True):
+            self.cache.delete((self.name, key, drop_empty))
+
+    def info(self):
+        """Returns the hits, and misses of this serializer, and the stats of
+        the cache, if it has any"""
+        info = getattr(self.cache, 'info', None)
+        stats = dict(info()) if info is not None else {}
+        stats.update(hits=self.hits, misses=self.misses)
+
+        return stats
+
+
+def cached(serializer, key, version=None, cache=None, name=None):
+    """Wraps a serializer, so what it serializes each object to is cached
+    across calls. Deserializing isn't cached.
+
+    :param serializer: The serializer to cache the output of
+    :param key: A function that returns a hashable key for an object, like its id
+    :param version: A function that returns the version of an object, like when
+                    it was last updated. A cached document with a different
+                    version is serialized again.
+    :param cache: An object with `get`, `set`, and `delete` methods, a new
+                  `DocumentCache` by default
+    :param name: Used in place of the serializer in cache keys
+    """
+    return CachedSerializer(serializer, key, version=version, cache=cache, name=name)
@@ -0,0 +1,182 @@
+"""
+Encoder
+=======
+
+`Translator.dumps` writes JSON straight from the field definitions of a
+serializer, instead of building a dict, and then walking it again with
+`json.dumps`. Like :mod:`strainer.compiler` it generates a function for each
+serializer. The `"target_field": ` fragment of every field is encoded once,
+strings, numbers, booleans, and None are encoded as they are read, and children,
+and manys call the generated function of their serializer.
+
+Anything else, like a list, or a dict returned by a formatter, is encoded by
+`json.JSONEncoder`. The output is exactly what
+`json.dumps(serializer.serialize(obj))` returns, encoded as utf-8.
+
+The keys of a custom translator aren't known up front, and two fields can
+write the same key, so serializers like that are serialized to a dict first,
+which is then encoded.
+
+"""
+import json
+
+from six import text_type
+
+from . import lazy
+from .context import check_context
+from .compiler import CodeBuilder, FIELD_KINDS, _getter_expression
+
+try:
+    from json.encoder import c_encode_basestring_ascii as encode_string
+except ImportError:  # pragma: no cover
+    encode_string = None
+
+if encode_string is None:  # pragma: no cover
+    from json.encoder import encode_basestring_ascii as encode_string
+
+_encoder = json.JSONEncoder(default=lazy.default)
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+
+INFINITY = float('inf')
+
+
+def encode_float(value):
+    if value != value:
+        return 'NaN'
+    if value == INFINITY:
+        return 'Infinity'
+    if value == -INFINITY:
+        return '-Infinity'
+
+    return _float_repr(value)
+
+
+def encode(value):
+    """Encodes a single value, exactly like json.dumps"""
+    cls = value.__class__
+    if cls is text_type or cls is str:
+        return encode_string(value)
+    if cls is int:
+        return _int_repr(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if cls is float:
+        return encode_float(value)
+
+    return _encoder.encode(value)
+
+
+def _serialize_dumps(translator):
+    """Returns a function that serializes, and then encodes the dict"""
+    serialize = translator.serialize
+
+    def dumps(source, context=None, drop_empty=None):
+        return encode(serialize(source, context=context))
+
+    return dumps
+
+
+def _known_keys(translator):
+    """Returns whether every key a serializer writes is known up front, and
+    written once"""
+    target_fields = set()
+    for field in translator.options['fields']:
+        if field.kind not in FIELD_KINDS and field.kind not in ('child', 'many'):
+            return False
+
+        target_field = field.options['target_field']
+        if target_field in target_fields:
+            return False
+
+        target_fields.add(target_field)
+
+    return True
+
+
+def _nested_dumps(builder, translator, index):
+    """Returns the name of a function that encodes a nested serializer"""
+    sub_serializer = translator.options['serializer']
+    if sub_serializer.kind == 'serializer':
+        return builder.constant('_dumps_%s' % (index), text_dumps(sub_serializer))
+
+    return builder.constant('_dumps_%s' % (index), _serialize_dumps(sub_serializer))
+
+
+def _key(builder, translator, index):
+    return builder.constant('_key_%s' % (index),
+                            encode(translator.options['target_field']) + ': ')
+
+
+def compile_dumps(translator):
+    """Generates a function that encodes an object with a serializer into a
+    JSON string"""
+    if not _known_keys(translator):
+        return _serialize_dumps(translator)
+
+    builder = CodeBuilder()
+    builder.namespace.update(encode=encode, encode_string=encode_string, int_repr=_int_repr)
+    builder.line('def dumps(source, context=None, drop_empty=None):', indent=0)
+    builder.line('if drop_empty is None:')
+    builder.line('drop_empty = check_context(context, "drop_empty", False)', indent=2)
+    builder.line('parts = []')
+    builder.line('append = parts.append')
+
+    for index, field in enumerate(translator.options['fields']):
+        if field.kind in FIELD_KINDS:
+            key = _key(builder, field, index)
+            builder.line('value = %s' % (_getter_expression(builder, field, index)))
+            for i, formatter in enumerate(field.options.get('formatters') or []):
+                name = builder.constant('_formatter_%s_%s' % (index, i), formatter)
+                builder.line('value = %s(value, context)' % (name))
+            builder.line('if not drop_empty or not emptyish(value):')
+            # Strings, and ints are by far the most common, so they skip encode
+            builder.line('cls = value.__class__', indent=2)
+            builder.line('if cls is str:', indent=2)
+            builder.line('append(%s + encode_string(value))' % (key), indent=3)
+            builder.line('elif cls is int:', indent=2)
+            builder.line('append(%s + int_repr(value))' % (key), indent=3)
+            builder.line('else:', indent=2)
+            builder.line('append(%s + encode(value))' % (key), indent=3)
+        elif field.kind == 'child':
+            key = _key(builder, field, index)
+            builder.line('value = %s(%s, context, drop_empty)' % (
+                _nested_dumps(builder, field, index), _getter_expression(builder, field, index)))
+            # An empty dict is the only empty value a child can serialize to
+            builder.line('if not drop_empty or value != "{}":')
+            builder.line('append(%s + value)' % (key), indent=2)
+        else:
+            key = _key(builder, field, index)
+            builder.line('append(%s + "[" + ", ".join([%s(item, context, drop_empty) for item in %s]) + "]")' % (
+                key, _nested_dumps(builder, field, index),
+                _getter_expression(builder, field, index)))
+
+    builder.line('return "{" + ", ".join(parts) + "}"')
+
+    return builder.build('dumps')
+
+
+def text_dumps(translator):
+    """Returns the generated function of a serializer, building it the first
+    time it's needed"""
+    if translator._dumps is None:
+        translator._dumps = compile_dumps(translator)
+
+    return translator._dumps
+
+
+def dumps(translator, source, context=None):
+    """Serializes source with a serializer straight to JSON encoded as utf-8
+    bytes, the same bytes `json.dumps(translator.serialize(source))` would
+    give.
+    """
+    if translator.kind != 'serializer' or (
+            context is not None and check_context(context, 'profile') is not None):
+        return json.dumps(translator.serialize(source, context=context),
+                          default=lazy.default).encode('utf-8')
+
+    return text_dumps(translator)(source, context).encode('utf-8')
@@ -14,8 +14,81 @@ class ValidationException(Exception):
         super(ValidationException, self).__init__()
         self.errors = errors
 
+    @property
+    def pointers(self):
+        """The errors as a flat dict, keyed by a JSON pointer to where each
+        list of errors happened, like `/items/3/price`."""
+        return flatten_errors(self.errors)
+
     def __unicode__(self):
         return self.__str__()
 
     def __str__(self):
         return text_type(self.errors)
+
+
+def json_pointer(path):
+    """Turns a path, a tuple of keys, and indexes, into a JSON pointer"""
+    return u''.join(u'/' + text_type(key).replace(u'~', u'~0').replace(u'/', u'~1')
+                    for key in path)
+
+
+def flatten_errors(errors, path=()):
+    if not isinstance(errors, dict):
+        return {json_pointer(path): errors if isinstance(errors, list) else [errors]}
+
+    pointers = {}
+    for key, value in errors.items():
+        pointers.update(flatten_errors(value, path + (key,)))
+
+    return pointers
+
+
+class ErrorCollector(list):
+    """Collects the errors of a whole deserialization, each one addressed by
+    the path to where it happened.
+
+    Structures write into the collector they are passed, instead of raising,
+    and catching a new exception at every level they are nested. Only the
+    outermost structure raises a ValidationException, with errors in the
+    usual nested shape.
+    """
+
+    def add(self, path, error):
+        """Adds one error to the list of errors at path"""
+        self.append((path, error, False))
+
+    def extend_errors(self, path, errors):
+        """Adds each error in a list to the list of errors at path"""
+        for error in errors:
+            self.append((path, error, False))
+
+    def replace(self, path, error):
+        """Sets the errors at path to error as it is, instead of adding it to
+        a list, like the errors a nested custom serializer raised"""
+        self.append((path, error, True))
+
+    def merge(self, path, errors):
+        """Merges a dict of already nested errors in at path, like the errors
+        of a ValidationException raised by a custom translator"""
+        for key, value in errors.items():
+            self.append((path + (key,), value, True))
+
+    @property
+    def errors(self):
+        """The errors nested in dicts, in the shape of ValidationException.errors"""
+        errors = {}
+        for path, error, whole in self:
+            node = errors
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+
+            if whole:
+                node[path[-1]] = error
+            else:
+                node.setdefault(path[-1], []).append(error)
+
+        return errors
+
+    def exception(self):
+        return ValidationException(self.errors)
@@ -0,0 +1,115 @@
+"""
+Fieldsets
+=========
+
+API clients often ask for just a few fields, like `?fields=id,name,author.name`.
+`Translator.only`, and `Translator.exclude` derive a pruned serializer that
+only has those fields, recursing into children, and manys, so fields that
+weren't asked for are never fetched, or formatted.
+
+Paths use the target field names, joined by dots. Pruned serializers are
+cached on the serializer they came from, in a bounded LRU cache keyed by the
+set of paths, so repeated requests reuse them.
+
+>>> from strainer import serializer, field
+>>> a_serializer = serializer(field('id'), field('name'))
+>>> id_serializer = a_serializer.only('id')
+
+"""
+from six import string_types
+
+from .cache import LRUCache
+from .structure import serializer, STRUCTURES
+
+DEFAULT_MAXSIZE = 128
+
+
+def parse_paths(paths):
+    """Turns dotted paths into a tree of dicts, `['a', 'b.c']` becomes
+    `{'a': {}, 'b': {'c': {}}}`. A string is split on commas."""
+    if isinstance(paths, string_types):
+        paths = paths.split(',')
+
+    tree = {}
+    for path in paths:
+        path = path.strip()
+        if not path:
+            continue
+
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+
+    return tree
+
+
+def _freeze(tree):
+    return frozenset((name, _freeze(subtree)) for name, subtree in tree.items())
+
+
+def _with_serializer(field, sub_serializer):
+    return STRUCTURES[field.kind](**dict(field.options, serializer=sub_serializer))
+
+
+def _prune(translator, tree, keep):
+    """Returns a copy of a serializer with the fields in tree kept, or left
+    out, recursing into the serializers of children, and manys"""
+    fields = []
+    unknown = set(tree)
+
+    for field in translator.options['fields']:
+        name = field.options.get('target_field')
+        unknown.discard(name)
+        subtree = tree.get(name)
+
+        if subtree is None:
+            # Custom translators have no name, they are only kept by exclude
+            if not keep:
+                fields.append(field)
+            continue
+
+        sub_serializer = field.options.get('serializer')
+        if subtree:
+            if sub_serializer is None or sub_serializer.kind != 'serializer':
+                raise ValueError('Fields inside %s can not be selected' % (name))
+
+            fields.append(_with_serializer(field, fieldset(sub_serializer, subtree, keep)))
+        elif keep:
+            fields.append(field)
+
+    if unknown:
+        raise ValueError('Unknown fields: %s' % (', '.join(sorted(unknown))))
+
+    options = translator.options
+    return serializer(*fields, compiled=options.get('compiled', False),
+                      order_by_cost=options.get('order_by_cost', False),
+                      record=options.get('record', False))
+
+
+def fieldset(translator, tree, keep):
+    """Returns the pruned copy of a serializer for a tree of paths, from the
+    serializer's cache when it has already been built"""
+    if translator.kind != 'serializer':
+        raise TypeError('Only serializers can be pruned')
+
+    cache = translator._fieldsets
+    if cache is None:
+        cache = translator._fieldsets = LRUCache(DEFAULT_MAXSIZE)
+
+    key = (keep, _freeze(tree))
+    pruned = cache.get(key)
+    if pruned is None:
+        pruned = _prune(translator, tree, keep)
+        cache.set(key, pruned)
+
+    return pruned
+
+
+def only(translator, paths):
+    """Returns a copy of a serializer with only the fields in paths"""
+    return fieldset(translator, parse_paths(paths), True)
+
+
+def exclude(translator, paths):
+    """Returns a copy of a serializer without the fields in paths"""
+    return fieldset(translator, parse_paths(paths), False)
@@ -6,14 +6,21 @@ Formatters are functions that transform data.
 
 """
 import datetime
-from functools import partial, wraps
+from functools import wraps
+
+from .cache import memoize
+from .parallel import exported_partial
 
 
 def export_formatter(f):
 
     @wraps(f)
     def wrapper(*args, **kwargs):
-        return partial(f, *args, **kwargs)
+        # pure=True memoizes the formatter, see strainer.cache
+        if kwargs.pop('pure', False):
+            return memoize(exported_partial(wrapper, f, args, kwargs))
+
+        return exported_partial(wrapper, f, args, kwargs)
 
     return wrapper
 
@@ -0,0 +1,182 @@
+"""
+Lazy
+====
+
+Some responses are only partly read, a template that shows a few keys, or
+middleware that only looks at one. Serializing with a context that has
+`lazy=True` makes every `child` put a `LazyChild` in the output, and every
+`many` a `LazyMany`, instead of serializing them right away. The nested
+serializer only runs once the proxy is read, and a `LazyMany` only serializes
+the items that are read.
+
+Proxies behave like the dict, or list they stand in for. To encode them, pass
+`default` to `json.dumps`, which produces exactly the same output as
+serializing eagerly, or turn everything into plain dicts, and lists with
+`materialize`.
+
+>>> import json
+>>> from strainer import lazy, SerializationContext
+>>> context = SerializationContext(lazy=True)
+>>> data = a_serializer.serialize(album, context=context)  # doctest: +SKIP
+>>> json.dumps(data, default=lazy.default)  # doctest: +SKIP
+
+A `drop_empty` context has to know whether a nested value is empty, so it
+serializes eagerly.
+
+"""
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # pragma: no cover
+    from collections import Mapping, Sequence
+
+from .context import check_context
+
+
+def is_lazy(context):
+    """Returns whether children, and manys should be serialized lazily with
+    this context"""
+    return (check_context(context, 'lazy', False) and
+            not check_context(context, 'drop_empty', False))
+
+
+class LazyChild(Mapping):
+    """Stands in for the dict a child serializes to"""
+    __slots__ = ('_serialize', '_source', '_context', '_value')
+
+    def __init__(self, serialize, source, context):
+        self._serialize = serialize
+        self._source = source
+        self._context = context
+        self._value = None
+
+    def materialize(self):
+        """Serializes the child, if it hasn't been yet, and returns the dict"""
+        if self._value is None:
+            self._value = self._serialize(self._source, context=self._context)
+            self._source = None
+
+        return self._value
+
+    @property
+    def materialized(self):
+        return self._value is not None
+
+    def __getitem__(self, key):
+        return self.materialize()[key]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyChild, LazyMany)):
+            other = other.materialize()
+
+        return self.materialize() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self._value is None:
+            return '<LazyChild unserialized>'
+
+        return 'LazyChild(%r)' % (self._value,)
+
+
+MISSING = object()
+
+
+class LazyMany(Sequence):
+    """Stands in for the list a many serializes to. Items are serialized one
+    at a time, as they are read."""
+    __slots__ = ('_serialize', '_sources', '_context', '_values')
+
+    def __init__(self, serialize, sources, context):
+        self._serialize = serialize
+        self._sources = sources
+        self._context = context
+        self._values = None
+
+    def _items(self):
+        if self._values is None:
+            self._sources = list(self._sources)
+            self._values = [MISSING] * len(self._sources)
+
+        return self._values
+
+    def _item(self, index):
+        values = self._items()
+        value = values[index]
+        if value is MISSING:
+            value = values[index] = self._serialize(self._sources[index],
+                                                    context=self._context)
+
+        return value
+
+    def materialize(self):
+        """Serializes every item that hasn't been yet, and returns the list"""
+        values = self._items()
+        for index in range(len(values)):
+            if values[index] is MISSING:
+                self._item(index)
+
+        return values
+
+    @property
+    def materialized(self):
+        return self._values is not None and MISSING not in self._values
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self)))]
+
+        return self._item(index)
+
+    def __len__(self):
+        return len(self._items())
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyChild, LazyMany)):
+            other = other.materialize()
+
+        return self.materialize() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if not self.materialized:
+            return '<LazyMany unserialized>'
+
+        return 'LazyMany(%r)' % (self._values,)
+
+
+def default(value):
+    """A `default` hook for `json.dumps`, and `json.JSONEncoder`, that
+    serializes lazy proxies as they are encoded"""
+    if isinstance(value, (LazyChild, LazyMany)):
+        return value.materialize()
+
+    raise TypeError('Object of type %s is not JSON serializable' % (type(value).__name__))
+
+
+def materialize(value):
+    """Returns value with every lazy proxy in it, however deeply nested,
+    replaced by the plain dict, or list it stands for"""
+    if isinstance(value, (LazyChild, LazyMany)):
+        value = value.materialize()
+
+    if isinstance(value, dict):
+        return dict((key, materialize(item)) for key, item in value.items())
+
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+
+    return value
@@ -0,0 +1,121 @@
+"""
+Parallel
+========
+
+Deserializing a big batch is CPU bound, so it can be spread across a pool of
+processes. Translators built by strainer's structures can be pickled, they are
+rebuilt in each worker from the kind of structure they are, and the options
+they were built with.
+
+Custom attribute getters, validators, and formatters have to be picklable
+too, which means module level functions, or exported validators and
+formatters.
+
+"""
+from collections import deque
+from functools import partial
+from itertools import islice
+import multiprocessing
+
+from .context import check_context
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# How many chunks each worker can have waiting, so the pool stays busy without
+# reading the whole iterable ahead of the results
+CHUNKS_PER_WORKER = 2
+
+_worker = {}
+
+
+class ExportedPartial(partial):
+    """What an exported validator, or formatter returns. The function it
+    binds is only reachable through the exported wrapper, so it pickles as a
+    call to the wrapper instead."""
+
+    def __reduce__(self):
+        return (_call, (self.export, self.args, self.keywords or {}))
+
+
+def _call(export, args, keywords):
+    return export(*args, **keywords)
+
+
+def exported_partial(export, f, args, kwargs):
+    """Returns partial(f, *args, **kwargs), that can be pickled by
+    reference to export, the module level function f is exported as"""
+    bound = ExportedPartial(f, *args, **kwargs)
+    bound.export = export
+
+    return bound
+
+
+def _init_worker(translator, context):
+    _worker['translator'] = translator
+    _worker['context'] = context
+
+
+def _deserialize_chunk(chunk):
+    return _worker['translator'].deserialize_many(chunk, context=_worker['context'])
+
+
+def _chunks(items, chunk_size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def deserialize_parallel(translator, items, workers=None,
+                         chunk_size=DEFAULT_CHUNK_SIZE, context=None):
+    """Splits items into chunks, and deserializes them across a pool of
+    processes.
+
+    Returns the same thing as `Translator.deserialize_many`, a list of the
+    items that deserialized in order, and a dict of errors keyed by the index
+    of each item that failed.
+
+    :param int workers: How many processes to use, defaults to the number of CPUs
+    :param int chunk_size: How many items to send to a process at a time
+    :param context: A picklable context, passed to every deserialization
+
+    Only a few chunks per worker are read ahead, so items can be a generator
+    over a batch too big to hold at once. With a fail_fast context nothing
+    after the first chunk with an error is kept, or sent to the pool.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    fail_fast = check_context(context, 'fail_fast', False)
+    chunks = _chunks(items, chunk_size)
+    pending = deque()
+    collector = []
+    error_dict = {}
+    offset = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(translator, context)) as executor:
+        while True:
+            for chunk in islice(chunks, workers * CHUNKS_PER_WORKER - len(pending)):
+                pending.append(executor.submit(_deserialize_chunk, chunk))
+
+            if not pending:
+                break
+
+            results, errors = pending.popleft().result()
+            collector.extend(results)
+            for index, error in errors.items():
+                error_dict[offset + index] = error
+            offset += chunk_size
+
+            if errors and fail_fast:
+                for future in pending:
+                    future.cancel()
+                break
+
+    return collector, error_dict
@@ -0,0 +1,230 @@
+"""
+Profiling
+=========
+
+Finding out which field, validator, or formatter makes a payload slow.
+
+Pass a `Profile` to a serializer through the context, and every field records
+how many times it ran, and for how long, in both directions. So does every
+validator, and formatter. Nested fields are recorded under their full path,
+with `[]` standing in for the items of a many, like `tracks[].title`.
+
+>>> from strainer import serializer, field, SerializationContext
+>>> from strainer.profiling import Profile
+>>> profile = Profile()
+>>> a_serializer = serializer(field('a'))
+>>> context = SerializationContext(profile=profile)
+
+When profiling, a serializer hands the work to an instrumented copy of itself,
+built the first time it's needed. Without a profile in the context nothing is
+instrumented, and the only cost is looking the profile up.
+
+"""
+import operator
+from timeit import default_timer
+
+from .context import check_context
+from .structure import (Translator, serializer, validator_cost, STRUCTURES,
+                        DEFAULT_COST)
+
+VALIDATOR_OPTIONS = ('validators', 'full_validators', 'batch_validators')
+
+
+def _name(function):
+    """Returns a readable name for a validator, or formatter"""
+    while True:
+        inner = getattr(function, 'function', None) or getattr(function, 'func', None)
+        if inner is None:
+            break
+
+        function = inner
+
+    return getattr(function, '__name__', None) or repr(function)
+
+
+class Profile(object):
+    """Collects call counts, and cumulative time, keyed by direction, field
+    path, kind, and the name of the validator, or formatter."""
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, key, elapsed):
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = [1, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+
+    def clear(self):
+        self.stats.clear()
+
+    def rows(self, sort='total'):
+        """Returns a list of dicts, one per field, validator, and formatter,
+        sorted by `total`, `calls` or `path`"""
+        rows = [
+            dict(direction=direction, path=path, kind=kind, name=name,
+                 calls=calls, total=total)
+            for (direction, path, kind, name), (calls, total) in self.stats.items()
+        ]
+
+        if sort == 'path':
+            return sorted(rows, key=lambda row: (row['direction'], row['path'],
+                                                 row['kind'] != 'field', row['name']))
+
+        return sorted(rows, key=lambda row: row[sort], reverse=True)
+
+    def as_dict(self):
+        """Returns the stats nested by direction, and field path::
+
+            {'deserialize': {'a': {'calls': 1, 'total': 0.0001,
+                                   'validators': {'integer': {...}}}}}
+
+        Times are in seconds.
+        """
+        result = {}
+        for (direction, path, kind, name), (calls, total) in self.stats.items():
+            entry = result.setdefault(direction, {}).setdefault(path, {})
+            if kind == 'field':
+                entry.update(calls=calls, total=total)
+            else:
+                entry.setdefault(kind + 's', {})[name] = dict(calls=calls, total=total)
+
+        return result
+
+    def report(self, sort='total', limit=None):
+        """Returns a table of the stats, slowest first"""
+        rows = self.rows(sort)
+        if limit:
+            rows = rows[:limit]
+
+        lines = ['%-12s %-40s %-10s %10s %12s %12s' % (
+            'direction', 'path', 'kind', 'calls', 'total ms', 'per call us')]
+        for row in rows:
+            label = row['path'] if row['name'] is None else '%s:%s' % (row['path'], row['name'])
+            lines.append('%-12s %-40s %-10s %10d %12.3f %12.3f' % (
+                row['direction'], label, row['kind'], row['calls'],
+                row['total'] * 1e3, row['total'] / row['calls'] * 1e6))
+
+        return '\n'.join(lines)
+
+
+def _timed(function, key):
+    """Wraps a validator, or formatter, to record how long it takes"""
+    def wrapper(value, context=None):
+        profile = check_context(context, 'profile')
+        if profile is None:
+            return function(value, context=context)
+
+        start = default_timer()
+        try:
+            return function(value, context=context)
+        finally:
+            profile.record(key, default_timer() - start)
+
+    cost = validator_cost(function)
+    if cost != DEFAULT_COST:
+        wrapper.cost = cost
+
+    return wrapper
+
+
+def _attr_getter(translator):
+    source_field = translator.options['source_field']
+    if translator.kind == 'dict_field':
+        return lambda source: source.get(source_field)
+
+    return operator.attrgetter(source_field)
+
+
+def _timed_structure(translator, path):
+    serialize_key = ('serialize', path, 'field', None)
+    deserialize_key = ('deserialize', path, 'field', None)
+    inner_serialize = translator.serialize
+    inner_deserialize = translator.deserialize
+
+    def serialize(source, target, context=None):
+        profile = check_context(context, 'profile')
+        if profile is None:
+            return inner_serialize(source, target, context=context)
+
+        start = default_timer()
+        try:
+            return inner_serialize(source, target, context=context)
+        finally:
+            profile.record(serialize_key, default_timer() - start)
+
+    if translator.kind is None:
+        def deserialize(source, target, context=None):
+            profile = check_context(context, 'profile')
+            if profile is None:
+                return inner_deserialize(source, target, context=context)
+
+            start = default_timer()
+            try:
+                return inner_deserialize(source, target, context=context)
+            finally:
+                profile.record(deserialize_key, default_timer() - start)
+    else:
+        def deserialize(source, target, context=None, errors=None, path=()):
+            profile = check_context(context, 'profile')
+            if profile is None:
+                return inner_deserialize(source, target, context, errors, path)
+
+            start = default_timer()
+            try:
+                return inner_deserialize(source, target, context, errors, path)
+            finally:
+                profile.record(deserialize_key, default_timer() - start)
+
+    # A custom attr_getter keeps serializers from fetching this field in bulk,
+    # around the timed serialize
+    options = translator.options
+    if translator.kind in ('field', 'dict_field') and not options.get('attr_getter'):
+        options = dict(options, attr_getter=_attr_getter(translator))
+
+    return Translator(serialize, deserialize, translator.kind, options)
+
+
+def _instrument_field(field, prefix):
+    if field.kind is None:
+        return _timed_structure(field, prefix + '<custom>')
+
+    options = dict(field.options)
+    path = prefix + options['target_field']
+
+    for option in VALIDATOR_OPTIONS:
+        if options.get(option):
+            options[option] = [
+                _timed(validator, ('deserialize', path, 'validator', _name(validator)))
+                for validator in options[option]
+            ]
+
+    if options.get('formatters'):
+        options['formatters'] = [
+            _timed(formatter, ('serialize', path, 'formatter', _name(formatter)))
+            for formatter in options['formatters']
+        ]
+
+    if options.get('serializer') is not None:
+        sub_prefix = path + ('[].' if field.kind == 'many' else '.')
+        options['serializer'] = instrument(options['serializer'], sub_prefix)
+
+    return _timed_structure(STRUCTURES[field.kind](**options), path)
+
+
+def instrument(translator, prefix=''):
+    """Returns a copy of a serializer, whose fields, validators, and
+    formatters record into the profile of the context they are called with.
+    An instrumented serializer is its own profiled copy."""
+    if translator.kind != 'serializer':
+        return translator
+
+    options = translator.options
+    twin = serializer(*[_instrument_field(field, prefix) for field in options['fields']],
+                      order_by_cost=options.get('order_by_cost', False),
+                      record=options.get('record', False))
+    twin._profiled = twin
+
+    return twin
@@ -0,0 +1,138 @@
+"""
+Records
+=======
+
+Plain dicts carry a lot of overhead per object, which adds up when a worker
+holds a million validated items. A serializer built with `record=True`
+deserializes into instances of a record class generated from its fields,
+that keeps its values in `__slots__` instead of a dict.
+
+>>> from strainer import serializer, field
+>>> a_serializer = serializer(field('a'), field('b'), record=True)
+>>> item = a_serializer.deserialize({'a': 1, 'b': 2})
+>>> item.a
+1
+>>> item.to_dict()
+{'a': 1, 'b': 2}
+
+Each serializer makes its own records, so nested serializers need
+`record=True` too for a child, or the items of a many to be records.
+
+Records compare equal to records, and dicts with the same values, and can be
+pickled.
+
+"""
+from .compiler import is_identifier
+
+_classes = {}
+
+
+class Record(object):
+    """The base of every generated record class"""
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, values):
+        record = cls.__new__(cls)
+        for name, value in values.items():
+            setattr(record, name, value)
+
+        return record
+
+    @classmethod
+    def _build_from_dict(cls):
+        """Generates a faster from_dict for a record class, that sets every
+        slot directly when all of them are there"""
+        lines = ['def from_dict(values):',
+                 '    if len(values) != %s:' % (len(cls.__slots__)),
+                 '        return slow(values)',
+                 '    record = new(cls)']
+        lines += ['    record.%s = values[%r]' % (name, name) for name in cls.__slots__]
+        lines += ['    return record']
+
+        namespace = {'new': cls.__new__, 'cls': cls, 'slow': cls.from_dict}
+        exec('\n'.join(lines) + '\n', namespace)
+        return namespace['from_dict']
+
+    def _items(self):
+        for name in self.__slots__:
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:
+                # Partial deserialization leaves fields out
+                continue
+
+    def to_dict(self):
+        """Returns the values of the record as a dict, turning nested records
+        into dicts too"""
+        return dict((name, _plain(value)) for name, value in self._items())
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'Record(%s)' % (', '.join('%s=%r' % item for item in self._items()))
+
+    def __reduce__(self):
+        return (_unpickle, (self.__slots__, dict(self._items())))
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+
+    return value
+
+
+def record_class(names):
+    """Returns the record class with these slots, records with the same
+    fields share a class"""
+    names = tuple(names)
+    cls = _classes.get(names)
+    if cls is None:
+        cls = _classes[names] = type('Record', (Record,), {'__slots__': names})
+        cls.from_dict = staticmethod(cls._build_from_dict())
+
+    return cls
+
+
+def _unpickle(names, values):
+    return record_class(names).from_dict(values)
+
+
+def for_serializer(fields):
+    """Returns the record class for a serializer with these fields"""
+    names = []
+    for field in fields:
+        name = field.options.get('source_field') if field.kind else None
+        if name is None:
+            raise TypeError('A record serializer can not have custom translators')
+
+        # A slot named like a method of Record would replace it
+        if not is_identifier(name) or hasattr(Record, name):
+            raise ValueError('%r can not be the name of a record field' % (name,))
+
+        if name not in names:
+            names.append(name)
+
+    return record_class(names)
+
+
+def as_record(translator, target):
+    """Returns what a serializer deserialized as a record, if it makes them"""
+    cls = translator._record
+    if cls is None:
+        return target
+
+    return cls.from_dict(target)
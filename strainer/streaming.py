@@ -0,0 +1,242 @@
+"""
+Streaming
+=========
+
+Tools for working with JSON that is too big to hold in memory at once.
+
+`iter_json_array` is a small incremental parser. It reads a JSON array from a
+file-like object a chunk at a time, and yields each element as soon as it has
+been read, so memory stays flat no matter how long the array is. Only one
+element, and one chunk, are held in memory at a time.
+
+`dump_stream` goes the other way. It serializes objects one at a time, and
+writes them out a chunk at a time, as a JSON array or as JSON Lines.
+
+"""
+import codecs
+import io
+import json
+
+from . import lazy
+from .exceptions import ValidationException
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARACTERS = '0123456789.eE+-'
+# A decode error this close to the end of the buffer might just be a value
+# that's cut off, like `tru`, or `"\u12`
+CUT_OFF_LENGTH = 12
+
+
+class JSONStreamError(ValueError):
+    """Raised when a stream does not contain a well formed JSON array"""
+
+
+class _Reader(object):
+    """Buffers text read from a file-like object, decoding bytes as utf-8"""
+
+    def __init__(self, fileobj, chunk_size):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = u''
+        self.pos = 0
+        self.eof = False
+        self.offset = 0
+
+    def fill(self, size=None):
+        """Reads more text onto the end of the buffer, returns False at the
+        end of the stream"""
+        if self.eof:
+            return False
+
+        if self.pos:
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        chunk = self.fileobj.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buffer += self.decoder.decode(b'', final=True)
+            return False
+
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk)
+
+        self.buffer += chunk
+        return True
+
+    def peek(self):
+        """Skips whitespace, and returns the next character or None at the
+        end of the stream"""
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in WHITESPACE:
+                pos += 1
+
+            self.pos = pos
+            if pos < length:
+                return buffer[pos]
+
+            if not self.fill():
+                return None
+
+    def error(self, message):
+        return JSONStreamError('%s at character %s' % (message, self.offset + self.pos))
+
+
+def _cut_off(error, buffer):
+    """Returns whether a decode error might only be because the buffer ends
+    in the middle of a value, so reading more could fix it"""
+    pos = getattr(error, 'pos', None)
+    if pos is None:  # pragma: no cover
+        return True
+
+    return (len(buffer) - pos <= CUT_OFF_LENGTH or
+            getattr(error, 'msg', '').startswith('Unterminated string'))
+
+
+def _check_end(reader):
+    if reader.peek() is not None:
+        raise reader.error('Unexpected data after the end of the array')
+
+
+def iter_json_array(fileobj, chunk_size=DEFAULT_CHUNK_SIZE, decoder=None):
+    """Yields every element of a JSON array read from a file-like object.
+
+    :param fileobj: Any object with a `read(size)` method, returning bytes or text
+    :param int chunk_size: How much to read from fileobj at a time
+    :param decoder: A json.JSONDecoder to decode each element with
+    """
+    decoder = decoder or json.JSONDecoder()
+    reader = _Reader(fileobj, chunk_size)
+
+    if reader.peek() == u'\ufeff':
+        reader.pos += 1
+
+    if reader.peek() != u'[':
+        raise reader.error('Expected the start of a JSON array')
+
+    reader.pos += 1
+
+    if reader.peek() == u']':
+        reader.pos += 1
+        _check_end(reader)
+        return
+
+    while True:
+        if reader.peek() is None:
+            raise reader.error('Unexpected end of stream')
+
+        while True:
+            start = reader.pos
+            try:
+                value, end = decoder.raw_decode(reader.buffer, start)
+            except ValueError as e:
+                if not _cut_off(e, reader.buffer) or \
+                        not reader.fill(max(chunk_size, len(reader.buffer))):
+                    raise reader.error('Invalid JSON: %s' % (e))
+                continue
+
+            # A number cut off by the end of the buffer might not be complete
+            # yet, so read more, and decode it again
+            buffer = reader.buffer
+            cut_off = end == len(buffer) or (
+                buffer[end] in NUMBER_CHARACTERS and
+                not buffer[end:].strip(NUMBER_CHARACTERS))
+            if cut_off and reader.fill():
+                continue
+
+            break
+
+        # Reading more might have moved the start of the buffer
+        reader.pos += end - start
+        yield value
+
+        next_character = reader.peek()
+        reader.pos += 1
+
+        if next_character == u']':
+            _check_end(reader)
+            return
+
+        if next_character != u',':
+            reader.pos -= 1
+            raise reader.error('Expected , or ]')
+
+
+def iter_deserialize(translator, fileobj, context=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """Deserializes each element of a JSON array read from a file-like
+    object, one at a time.
+
+    Yields `(index, value)` for every valid element, and
+    `(index, ValidationException)` for every invalid one.
+    """
+    deserialize = translator.deserialize
+
+    for index, item in enumerate(iter_json_array(fileobj, chunk_size=chunk_size)):
+        try:
+            yield index, deserialize(item, context=context)
+        except ValidationException as e:
+            yield index, e
+
+
+def dump_stream(translator, sources, fileobj, format='json',
+                chunk_size=DEFAULT_CHUNK_SIZE, context=None, encoder=None):
+    """Serializes every object in an iterable, and writes the encoded output
+    to a file-like object, a chunk at a time.
+
+    With `format='json'` the output is exactly what `json.dumps` would produce
+    for the list of serialized objects. With `format='jsonl'` every object is
+    written on its own line.
+
+    :param fileobj: Any object with a `write` method, bytes are written unless
+                    it is a text stream
+    :param str format: Either `json`, or `jsonl`
+    :param int chunk_size: Roughly how much output to buffer between writes
+    :param encoder: A json.JSONEncoder to encode each object with
+    :returns: The number of objects written
+    """
+    if format == 'json':
+        opening, separator, closing = u'[', u', ', u']'
+    elif format == 'jsonl':
+        opening, separator, closing = u'', u'\n', u'\n'
+    else:
+        raise ValueError('Unknown format: %s' % (format))
+
+    encode = (encoder or json.JSONEncoder(default=lazy.default)).encode
+    serialize = translator.serialize
+    text_stream = isinstance(fileobj, io.TextIOBase)
+
+    def write(parts):
+        chunk = u''.join(parts)
+        fileobj.write(chunk if text_stream else chunk.encode('utf-8'))
+
+    parts = [opening]
+    size = len(opening)
+    count = 0
+
+    for source in sources:
+        if count:
+            parts.append(separator)
+
+        encoded = encode(serialize(source, context=context))
+        parts.append(encoded)
+        size += len(encoded)
+        count += 1
+
+        if size >= chunk_size:
+            write(parts)
+            parts = []
+            size = 0
+
+    if count or format == 'json':
+        parts.append(closing)
+
+    write(parts)
+
+    return count
@@ -11,18 +11,191 @@ excepton.
 
 
 """
+import json
 import operator
-from .exceptions import ValidationException
+import pickle
+from .exceptions import ValidationException, ErrorCollector
 from strainer.context import check_context
+from .lazy import is_lazy, LazyChild, LazyMany
+from . import dedup
 
 
 class Translator(object):
     """Translator is an internal data structure that holds a  reference to
     a serialize and deserialize function. All structures return a translator.
+
+    Translators built by strainer's structures also remember what kind of
+    structure they are, and the options they were built with, so that other
+    parts of strainer can inspect, or rebuild them.
     """
-    def __init__(self, serialize, deserialize):
+    def __init__(self, serialize, deserialize, kind=None, options=None):
         self.serialize = serialize
         self.deserialize = deserialize
+        self.kind = kind
+        self.options = options if options else {}
+        self._batch = None
+        self._profiled = None
+        self._fieldsets = None
+        self._dumps = None
+        self._changes = None
+        self._partial = None
+        self._record = None
+
+    def __reduce__(self):
+        if self.kind is None:
+            raise pickle.PicklingError('Only translators built by strainer structures can be pickled')
+
+        return (rebuild, (self.kind, self.options))
+
+    def _batch_functions(self):
+        if self._batch is None:
+            from .compiler import compile_serialize_many, compile_deserialize_many
+            self._batch = (compile_serialize_many(self), compile_deserialize_many(self))
+
+        return self._batch
+
+    def serialize_many(self, sources, context=None):
+        """Serializes every object in an iterable, and returns a list.
+
+        For a serializer the context is only checked once, and the per field
+        setup is done once for the whole batch, instead of once per object.
+        """
+        if context is not None and dedup.needs_scope(context):
+            return dedup.scoped(self.serialize_many, sources, context)
+
+        serialize = self.serialize
+        if self.kind == 'serializer':
+            if check_context(context, 'profile') is None:
+                return self._batch_functions()[0](sources, context=context)
+
+            serialize = profiled(self).serialize
+
+        return [serialize(source, context=context) for source in sources]
+
+    def deserialize_many(self, sources, context=None):
+        """Deserializes every item in an iterable.
+
+        Returns a list of the items that deserialized, in order, and a dict of
+        errors keyed by the index of each item that failed, just like `many`.
+        """
+        deserialize = self.deserialize
+        if self.kind == 'serializer':
+            if check_context(context, 'profile') is None:
+                return self._batch_functions()[1](sources, context=context)
+
+            deserialize = profiled(self).deserialize
+
+        collector = []
+        error_dict = {}
+        for i, source in enumerate(sources):
+            try:
+                collector.append(deserialize(source, context=context))
+            except ValidationException as e:
+                error_dict[i] = e.errors
+                if check_context(context, 'fail_fast', False):
+                    break
+
+        return collector, error_dict
+
+    def only(self, paths):
+        """Returns a copy of a serializer with only the fields in paths, like
+        `['id', 'author.name']`, or `'id,author.name'`, see
+        :mod:`strainer.fieldsets`.
+        """
+        from .fieldsets import only
+        return only(self, paths)
+
+    def exclude(self, paths):
+        """Returns a copy of a serializer without the fields in paths, see
+        :mod:`strainer.fieldsets`.
+        """
+        from .fieldsets import exclude
+        return exclude(self, paths)
+
+    def dumps(self, source, context=None):
+        """Serializes source straight to JSON, as utf-8 bytes, without
+        building the dict first, see :mod:`strainer.encoder`.
+        """
+        from .encoder import dumps
+        return dumps(self, source, context=context)
+
+    def loads(self, text, context=None):
+        """Parses a JSON document, given as text, or utf-8 bytes, and
+        deserializes it in one step.
+
+        Raises a ValueError if the document isn't valid JSON.
+        """
+        return self.deserialize(json.loads(text), context=context)
+
+    def serialize_changed(self, source, changed_fields, previous, context=None,
+                          patch='merge'):
+        """Updates the previous output of a serializer by only running the
+        fields that read a changed attribute, and returns the document, and a
+        patch, see :func:`strainer.changes.serialize_changed`.
+        """
+        from .changes import serialize_changed
+        return serialize_changed(self, source, changed_fields, previous,
+                                 context=context, patch=patch)
+
+    def serialize_columns(self, sources, context=None, numpy=False):
+        """Serializes objects into a dict of columns, keyed by target field,
+        see :func:`strainer.columns.serialize_columns`.
+        """
+        from .columns import serialize_columns
+        return serialize_columns(self, sources, context=context, numpy=numpy)
+
+    def deserialize_columns(self, columns, context=None):
+        """Validates a dict of columns, a whole column at a time, see
+        :func:`strainer.columns.deserialize_columns`.
+        """
+        from .columns import deserialize_columns
+        return deserialize_columns(self, columns, context=context)
+
+    def adeserialize(self, source, context=None):
+        """Returns a coroutine that deserializes source, awaiting any async
+        validators concurrently, see :mod:`strainer.aio`.
+        """
+        from .aio import adeserialize
+        return adeserialize(self, source, context=context)
+
+    def iter_deserialize(self, fileobj, context=None, chunk_size=None):
+        """Deserializes a JSON array read from a file-like object one element
+        at a time, see :func:`strainer.streaming.iter_deserialize`.
+        """
+        from .streaming import iter_deserialize, DEFAULT_CHUNK_SIZE
+        return iter_deserialize(self, fileobj, context=context,
+                                chunk_size=chunk_size or DEFAULT_CHUNK_SIZE)
+
+    def dump_stream(self, sources, fileobj, format='json', chunk_size=None,
+                    context=None):
+        """Serializes objects one at a time, and writes them to a file-like
+        object as JSON, or JSON Lines, see :func:`strainer.streaming.dump_stream`.
+        """
+        from .streaming import dump_stream, DEFAULT_CHUNK_SIZE
+        return dump_stream(self, sources, fileobj, format=format,
+                           chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                           context=context)
+
+    def deserialize_parallel(self, items, workers=None, chunk_size=None,
+                             context=None):
+        """Deserializes a batch across a pool of processes, see
+        :func:`strainer.parallel.deserialize_parallel`.
+        """
+        from .parallel import deserialize_parallel, DEFAULT_CHUNK_SIZE
+        return deserialize_parallel(self, items, workers=workers,
+                                    chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                                    context=context)
+
+
+def not_awaited(value, validator):
+    """Raises a TypeError for an awaitable a validator returned outside of
+    `adeserialize`, closing it, so it isn't reported as never awaited"""
+    close = getattr(value, 'close', None)
+    if close is not None:
+        close()
+
+    raise TypeError('%r returned an awaitable, async validators only run with adeserialize'
+                    % (validator,))
 
 
 def run_validators(value, full_validators, context):
@@ -30,12 +203,140 @@ def run_validators(value, full_validators, context):
     for validator in full_validators:
         try:
             value = validator(value, context=context)
+            if hasattr(value, '__await__'):
+                not_awaited(value, validator)
         except ValidationException as e:
             errors += [e.errors]
+            if check_context(context, 'fail_fast', False):
+                break
 
     return value, errors
 
 
+def run_batch_validators(values, batch_validators, context, errors, path):
+    """Runs validators that take a whole list at once, and returns the
+    converted list, and whether any of them failed. Errors keyed by index are
+    reported at the index of the item that failed."""
+    for validator in batch_validators:
+        try:
+            values = validator(values, context=context)
+            if hasattr(values, '__await__'):
+                not_awaited(values, validator)
+        except ValidationException as e:
+            if isinstance(e.errors, dict):
+                for i, error in e.errors.items():
+                    errors.add(path + (i,), error)
+            else:
+                errors.add(path + ('_full_errors',), e.errors)
+
+            return values, True
+
+    return values, False
+
+
+DEFAULT_COST = 5
+
+
+def validator_cost(validator):
+    """Returns the relative cost of running a validator, set with
+    `strainer.validators.validation_cost`."""
+    cost = getattr(validator, 'cost', None)
+    if cost is None:
+        cost = getattr(getattr(validator, 'func', None), 'cost', DEFAULT_COST)
+
+    return cost
+
+
+def structure_cost(translator):
+    """Estimates the relative cost of deserializing a structure, from the cost
+    of its validators, and the structures nested in it."""
+    kind = translator.kind
+    options = translator.options
+    cost = 1 + sum(validator_cost(v) for v in options.get('validators') or [])
+    cost += sum(validator_cost(v) for v in options.get('full_validators') or [])
+    cost += sum(validator_cost(v) for v in options.get('batch_validators') or [])
+
+    if kind in ('field', 'dict_field'):
+        return cost
+
+    if kind == 'multiple_field':
+        return 10 * cost
+
+    if kind == 'child':
+        return cost + structure_cost(options['serializer'])
+
+    if kind == 'many':
+        return cost + 10 * structure_cost(options['serializer'])
+
+    if kind == 'serializer':
+        return sum(structure_cost(field) for field in options['fields'])
+
+    return DEFAULT_COST
+
+
+def collect_errors(deserialize, *args):
+    """Calls a deserialize function with a new error collector, and raises a
+    ValidationException if anything failed. Structures do this when they are
+    called on their own, instead of from inside another structure."""
+    errors = ErrorCollector()
+    target = deserialize(*(args + (errors, ())))
+
+    if errors:
+        raise errors.exception()
+
+    return target
+
+
+def collecting_deserialize(translator):
+    """Returns the deserialize function of a field, that reports errors to an
+    error collector. Custom translators are wrapped, so the errors they raise
+    are merged into the collector."""
+    if translator.kind is not None:
+        return translator.deserialize
+
+    deserialize = translator.deserialize
+
+    def wrapper(source, target, context=None, errors=None, path=()):
+        try:
+            return deserialize(source, target, context=context)
+        except ValidationException as e:
+            errors.merge(path, e.errors)
+            return target
+
+    return wrapper
+
+
+def collecting_serializer_deserialize(translator):
+    """Just like collecting_deserialize, but for a nested serializer"""
+    if translator.kind is not None:
+        return translator.deserialize
+
+    deserialize = translator.deserialize
+
+    def wrapper(source, context=None, errors=None, path=()):
+        try:
+            return deserialize(source, context=context)
+        except ValidationException as e:
+            if isinstance(e.errors, dict):
+                errors.merge(path, e.errors)
+            else:
+                errors.replace(path, e.errors)
+
+    return wrapper
+
+
+def list_value(value):
+    """Returns the value of a multiple_field, or an empty list when it's
+    missing, without asking an array for its truth value"""
+    if value is None:
+        return []
+
+    if hasattr(value, '__len__'):
+        return value if len(value) else []
+
+    return value if value else []
+
+
 def emptyish(val):
     if val in [0, "", [], False]:
         return False
@@ -70,18 +371,11 @@ def field(source_field, target_field=None, validators=None,
     """
     target_field = target_field if target_field else source_field
     validators = validators if validators else []
+    options = dict(source_field=source_field, target_field=target_field,
+                   validators=validators, attr_getter=attr_getter,
+                   formatters=formatters)
     attr_getter = attr_getter or operator.attrgetter(source_field)
 
-    def _validate(value, field, context=None):
-        value, errors = run_validators(value, validators, context)
-
-        if errors:
-            raise ValidationException({
-                field: errors
-            })
-
-        return value
-
     def serialize(source, target, context=None):
         value = attr_getter(source)
 
@@ -97,35 +391,47 @@ def field(source_field, target_field=None, validators=None,
 
         return target
 
-    def deserialize(source, target, context=None):
-        value = source.get(target_field)
+    def deserialize(source, target, context=None, errors=None, path=()):
+        if errors is None:
+            return collect_errors(deserialize, source, target, context)
 
-        value = _validate(value, target_field, context=context)
+        value, field_errors = run_validators(source.get(target_field), validators, context)
+
+        if field_errors:
+            errors.extend_errors(path + (target_field,), field_errors)
+            return target
 
         target[source_field] = value
 
         return target
 
-    return Translator(serialize, deserialize)
+    return Translator(serialize, deserialize, 'field', options)
 
 
 def multiple_field(source_field, target_field=None, validators=None,
-                   attr_getter=None, formatters=None, full_validators=None):
+                   attr_getter=None, formatters=None, full_validators=None,
+                   batch_validators=None):
+    """A field whose value is a list, every item in the list is validated
+    on its own.
+
+    :param list full_validators: Validators applied to the whole list, after every item
+                                 has been validated.
+    :param list batch_validators: Validators that take the whole list at once, before
+                                  the item validators run, and return the converted
+                                  list. They raise errors as a dict keyed by the index
+                                  of each invalid item, which are reported just like the
+                                  errors of item validators.
+    """
 
     target_field = target_field if target_field else source_field
     validators = validators if validators else []
+    batch_validators = batch_validators if batch_validators else []
+    options = dict(source_field=source_field, target_field=target_field,
+                   validators=validators, attr_getter=attr_getter,
+                   formatters=formatters, full_validators=full_validators,
+                   batch_validators=batch_validators)
     attr_getter = attr_getter or operator.attrgetter(source_field)
 
-    def _validate(value, field, context=None):
-        value, errors = run_validators(value, validators, context)
-
-        if errors:
-            raise ValidationException({
-                field: errors
-            })
-
-        return value
-
     def serialize(source, target, context=None):
         value = attr_getter(source)
 
@@ -141,47 +447,68 @@ def multiple_field(source_field, target_field=None, validators=None,
 
         return target
 
-    def deserialize(source, target, context=None):
-        value = source.get(target_field)
+    def deserialize(source, target, context=None, errors=None, path=()):
+        if errors is None:
+            return collect_errors(deserialize, source, target, context)
 
-        if not value:
-            value = []
+        value = list_value(source.get(target_field))
 
-        errors = {}
-        new_value = []
+        if batch_validators:
+            value, failed = run_batch_validators(value, batch_validators, context,
+                                                 errors, path + (target_field,))
+            if failed:
+                return target
 
-        for i, v in enumerate(value):
-            try:
-                new_value += [_validate(v, i, context=context)]
-            except ValidationException as e:
-                errors.update(e.errors)
+        failed = False
+
+        if validators:
+            new_value = []
+
+            for i, v in enumerate(value):
+                v, item_errors = run_validators(v, validators, context)
+                if not item_errors:
+                    new_value += [v]
+                    continue
+
+                failed = True
+                errors.extend_errors(path + (target_field, i), item_errors)
+                if check_context(context, 'fail_fast', False):
+                    return target
 
-        value = new_value
+            value = new_value
+        elif not hasattr(value, 'dtype'):
+            # NumPy arrays returned by batch validators are kept as they are
+            value = list(value)
 
         if full_validators:
             value, full_errors = run_validators(value, full_validators, context)
             if full_errors:
-                errors.update({"_full_errors": full_errors})
+                failed = True
+                errors.extend_errors(path + (target_field, '_full_errors'), full_errors)
 
-        if errors:
-            raise ValidationException({
-                target_field: errors
-            })
+        if failed:
+            return target
 
         target[source_field] = value
 
         return target
 
-    return Translator(serialize, deserialize)
+    return Translator(serialize, deserialize, 'multiple_field', options)
 
 
-def dict_field(*args, **kwargs):
+def dict_field(source_field, *args, **kwargs):
     """dict_field is just like field except that it pulls attributes
     out of a dict, instead of off an object.
 
     """
-    kwargs.setdefault('attr_getter', lambda d: d.get(args[0]))
-    return field(*args, **kwargs)
+    attr_getter = kwargs.get('attr_getter')
+    if not attr_getter:
+        kwargs['attr_getter'] = lambda d: d.get(source_field)
+    translator = field(source_field, *args, **kwargs)
+    translator.kind = 'dict_field'
+    translator.options['attr_getter'] = attr_getter
+
+    return translator
 
 
 def child(source_field, target_field=None, serializer=None,
@@ -191,13 +518,24 @@ def child(source_field, target_field=None, serializer=None,
     """
 
     target_field = target_field if target_field else source_field
+    options = dict(source_field=source_field, target_field=target_field,
+                   serializer=serializer, validators=validators,
+                   attr_getter=attr_getter, full_validators=full_validators)
 
     _attr_getter = attr_getter if attr_getter else operator.attrgetter(source_field)
+    sub_deserialize = collecting_serializer_deserialize(serializer)
 
     def serialize(source, target, context=None):
         sub_source = _attr_getter(source)
 
-        value = serializer.serialize(sub_source, context=context)
+        if context is not None and is_lazy(context):
+            target[target_field] = LazyChild(serializer.serialize, sub_source, context)
+            return target
+
+        if context is not None and check_context(context, 'dedup'):
+            value = dedup.serialize(serializer, sub_source, context)
+        else:
+            value = serializer.serialize(sub_source, context=context)
 
         drop_empty = check_context(context, "drop_empty", False)
         if drop_empty and emptyish(value):
@@ -207,36 +545,35 @@ def child(source_field, target_field=None, serializer=None,
 
         return target
 
-    def deserialize(source, target, context=None):
+    def deserialize(source, target, context=None, errors=None, path=()):
+        if errors is None:
+            return collect_errors(deserialize, source, target, context)
+
         sub_source = source.get(target_field)
+        sub_path = path + (target_field,)
 
         if validators:
-            sub_source, errors = run_validators(sub_source, validators, context)
+            sub_source, child_errors = run_validators(sub_source, validators, context)
 
-            if errors:
-                raise ValidationException({
-                    target_field: errors
-                })
+            if child_errors:
+                errors.extend_errors(sub_path, child_errors)
+                return target
 
-        try:
-            target[source_field] = serializer.deserialize(sub_source, context=context)
-        except ValidationException as e:
-            raise ValidationException({
-                target_field: e.errors
-            })
+        error_count = len(errors)
+        value = sub_deserialize(sub_source, context, errors, sub_path)
+        if len(errors) > error_count:
+            return target
+
+        target[source_field] = value
 
         if full_validators:
             target, full_errors = run_validators(target, full_validators, context)
             if full_errors:
-                raise ValidationException({
-                    target_field: {
-                        '_full_errors': full_errors,
-                    }
-                })
+                errors.extend_errors(sub_path + ('_full_errors',), full_errors)
 
         return target
 
-    return Translator(serialize, deserialize)
+    return Translator(serialize, deserialize, 'child', options)
 
 
 def many(source_field, target_field=None, serializer=None,
@@ -244,13 +581,24 @@ def many(source_field, target_field=None, serializer=None,
     """Many allows you to nest a list of serializers"""
 
     target_field = target_field if target_field else source_field
+    options = dict(source_field=source_field, target_field=target_field,
+                   serializer=serializer, validators=validators,
+                   attr_getter=attr_getter)
 
     _attr_getter = attr_getter if attr_getter else operator.attrgetter(source_field)
+    sub_deserialize = collecting_serializer_deserialize(serializer)
 
     def serialize(source, target, context=None):
         sub_source = _attr_getter(source)
 
-        collector = [serializer.serialize(i, context=context) for i in sub_source]
+        if context is not None and is_lazy(context):
+            target[target_field] = LazyMany(serializer.serialize, sub_source, context)
+            return target
+
+        if context is not None and check_context(context, 'dedup'):
+            collector = dedup.serialize_each(serializer, sub_source, context)
+        else:
+            collector = [serializer.serialize(i, context=context) for i in sub_source]
 
         drop_empty = check_context(context, "drop_empty", False)
         if drop_empty and emptyish(collector):
@@ -260,62 +608,286 @@ def many(source_field, target_field=None, serializer=None,
 
         return target
 
-    def deserialize(source, target, context=None):
+    def deserialize(source, target, context=None, errors=None, path=()):
+        if errors is None:
+            return collect_errors(deserialize, source, target, context)
+
         sub_source = source.get(target_field, [])
         collector = []
-        errors = []
 
         if validators:
-            sub_source, errors = run_validators(sub_source, validators, context)
+            sub_source, many_errors = run_validators(sub_source, validators, context)
 
-            if errors:
-                raise ValidationException({
-                    target_field: {
-                        '_full_errors': errors
-                    }
-                })
+            if many_errors:
+                errors.extend_errors(path + (target_field, '_full_errors'), many_errors)
+                return target
 
-        error_dict = {}
+        many_path = path + (target_field,)
         for i, item in enumerate(sub_source):
-            try:
-                collector.append(serializer.deserialize(item, context=context))
-            except ValidationException as e:
-                error_dict[i] = e.errors
+            collector.append(sub_deserialize(item, context, errors, many_path + (i,)))
+            if errors and check_context(context, 'fail_fast', False):
+                break
 
         target[source_field] = collector
 
-        if error_dict:
-            raise ValidationException({
-                target_field: error_dict
-            })
-
         return target
 
-    return Translator(serialize, deserialize)
+    return Translator(serialize, deserialize, 'many', options)
+
+
+def deserialize_order(fields, order_by_cost=False):
+    """Returns the order fields should be deserialized in"""
+    if order_by_cost:
+        return tuple(sorted(fields, key=structure_cost))
+
+    return tuple(fields)
+
+
+def _getter(names, getter):
+    """Returns a getter that always returns a tuple, operator's getters only
+    return a tuple for more than one name"""
+    if not names:
+        return lambda source: ()
+
+    if len(names) == 1:
+        single = getter(names[0])
+        return lambda source: (single(source),)
+
+    return getter(*names)
+
+
+def bulk_fetch(fields):
+    """Plans how a serializer fetches the values of its fields.
+
+    Fields, and dict fields without a custom attr_getter are fetched all at
+    once, with a single `operator.attrgetter`, or for plain dicts
+    `operator.itemgetter`.
+    Returns a function that fetches those values into a tuple, and a step for
+    every field, `(position, target_field, formatters, None)` for the ones
+    fetched in bulk, and `(None, None, None, serialize)` for the rest. When no
+    field can be fetched in bulk, the function is None.
+    """
+    attributes = []
+    keys = []
+    plan = []
+    for field in fields:
+        options = field.options
+        if field.kind not in ('field', 'dict_field') or options.get('attr_getter'):
+            plan.append((None, None, field))
+        elif field.kind == 'field':
+            plan.append((attributes, len(attributes), field))
+            attributes.append(options['source_field'])
+        else:
+            plan.append((keys, len(keys), field))
+            keys.append(options['source_field'])
+
+    steps = []
+    for names, position, field in plan:
+        if names is None:
+            steps.append((None, None, None, field.serialize))
+            continue
+
+        if names is keys:
+            position += len(attributes)
+
+        steps.append((position, field.options['target_field'],
+                      field.options.get('formatters'), None))
+
+    if not attributes and not keys:
+        return None, steps
+
+    get_attributes = _getter(attributes, operator.attrgetter)
+    get_items = _getter(keys, operator.itemgetter)
+
+    def get_keys(source):
+        # Subclasses, like defaultdict, or Counter, might not agree with get
+        # on missing keys, so only plain dicts are fetched with itemgetter
+        if source.__class__ is dict:
+            try:
+                return get_items(source)
+            except KeyError:
+                pass
+
+        return tuple(source.get(key) for key in keys)
+
+    if not keys:
+        return get_attributes, steps
+
+    if not attributes:
+        return get_keys, steps
+
+    return lambda source: get_attributes(source) + get_keys(source), steps
+
+
+def serializer(*fields, **kwargs):
+    """This function creates a serializer from a list fo fields
+
+    :param bool compiled: Generate specialized serialize, and deserialize functions
+                          for this serializer, see :mod:`strainer.compiler`.
+    :param bool order_by_cost: Deserialize the cheapest fields first, so with a
+                               `fail_fast` context invalid input is rejected by
+                               the cheapest check.
+
+    :param bool record: Deserialize into instances of a `__slots__` record class
+                        generated from the fields, instead of dicts, see
+                        :mod:`strainer.records`.
 
+    The serializer's `deserialize` also takes `partial=True`, which only
+    deserializes the fields whose keys are in the input, for PATCH requests.
+    """
+    compiled = kwargs.pop('compiled', False)
+    order_by_cost = kwargs.pop('order_by_cost', False)
+    record = kwargs.pop('record', False)
+    if kwargs:
+        raise TypeError('Unexpected keyword arguments: %s' % (', '.join(kwargs)))
+
+    fetch, steps = bulk_fetch(fields)
 
-def serializer(*fields):
-    """This function creates a serializer from a list fo fields"""
     def serialize(source, context=None):
+        if context is not None and check_context(context, 'profile') is not None:
+            twin = profiled(translator)
+            if twin is not translator:
+                return twin.serialize(source, context)
+
+        if context is not None and dedup.needs_scope(context):
+            return dedup.scoped(serialize, source, context)
+
         target = {}
 
-        [field.serialize(source, target, context=context) for field in fields]
+        if fetch is None:
+            [field.serialize(source, target, context=context) for field in fields]
+            return target
+
+        values = fetch(source)
+        drop_empty = check_context(context, "drop_empty", False)
+
+        for position, target_field, formatters, field_serialize in steps:
+            if field_serialize is not None:
+                field_serialize(source, target, context=context)
+                continue
+
+            value = values[position]
+            if formatters:
+                for formater in formatters:
+                    value = formater(value, context)
+
+            if drop_empty and emptyish(value):
+                continue
+
+            target[target_field] = value
 
         return target
 
-    def deserialize(source, context=None):
+    deserializers = [collecting_deserialize(field)
+                     for field in deserialize_order(fields, order_by_cost)]
+
+    def deserialize(source, context=None, errors=None, path=(), partial=False):
+        if context is not None and check_context(context, 'profile') is not None:
+            twin = profiled(translator)
+            if twin is not translator:
+                return twin.deserialize(source, context, errors, path, partial)
+
+        if partial:
+            return partial_deserialize(translator, source, context, errors, path)
+
+        if errors is None:
+            return collect_errors(deserialize, source, context)
+
         target = {}
-        errors = {}
 
-        for field in fields:
-            try:
-                field.deserialize(source, target, context=context)
-            except ValidationException as e:
-                errors.update(e.errors)
+        for field_deserialize in deserializers:
+            field_deserialize(source, target, context, errors, path)
+            if errors and check_context(context, 'fail_fast', False):
+                break
 
-        if errors:
-            raise ValidationException(errors)
+        if translator._record is not None:
+            return translator._record.from_dict(target)
 
         return target
 
-    return Translator(serialize, deserialize)
+    translator = Translator(serialize, deserialize, 'serializer',
+                            dict(fields=fields, compiled=compiled,
+                                 order_by_cost=order_by_cost, record=record))
+
+    if record:
+        from .records import for_serializer
+        translator._record = for_serializer(fields)
+
+    if compiled:
+        from .compiler import compile_serialize, compile_deserialize
+        translator.serialize = compile_serialize(translator)
+        translator.deserialize = compile_deserialize(translator)
+
+    return translator
+
+
+def partial_deserialize(translator, source, context=None, errors=None, path=()):
+    """Deserializes only the fields whose keys are in source, like the body of
+    a PATCH request. Custom translators don't declare a key, so they are
+    skipped."""
+    index = translator._partial
+    if index is None:
+        index = {}
+        options = translator.options
+        for position, field in enumerate(deserialize_order(options['fields'],
+                                                           options.get('order_by_cost'))):
+            target_field = field.options.get('target_field') if field.kind else None
+            if target_field is not None:
+                index.setdefault(target_field, []).append((position, collecting_deserialize(field)))
+
+        translator._partial = index
+
+    owner = errors is None
+    if owner:
+        errors = ErrorCollector()
+
+    present = []
+    for key in source:
+        present.extend(index.get(key, ()))
+    present.sort(key=operator.itemgetter(0))
+
+    target = {}
+    for _, field_deserialize in present:
+        field_deserialize(source, target, context, errors, path)
+        if errors and check_context(context, 'fail_fast', False):
+            break
+
+    if owner and errors:
+        raise errors.exception()
+
+    if translator._record is not None:
+        return translator._record.from_dict(target)
+
+    return target
+
+
+def profiled(translator):
+    """Returns the copy of a serializer that records into the profile of a
+    context, see :mod:`strainer.profiling`. It's built the first time it's
+    needed."""
+    if translator._profiled is None:
+        from .profiling import instrument
+        translator._profiled = instrument(translator)
+
+    return translator._profiled
+
+
+STRUCTURES = {
+    'field': field,
+    'multiple_field': multiple_field,
+    'dict_field': dict_field,
+    'child': child,
+    'many': many,
+}
+
+
+def rebuild(kind, options):
+    """Rebuilds a translator from the kind of structure it is, and the options
+    it was built with. This is how translators are unpickled.
+    """
+    if kind == 'serializer':
+        options = dict(options)
+        fields = options.pop('fields')
+        return serializer(*fields, **options)
+
+    return STRUCTURES[kind](**options)
@@ -5,28 +5,52 @@ Validators
 Validators are functions that validate data.
 
 """
+import datetime as _datetime
+import re
+
 import iso8601
+from iso8601.iso8601 import parse_timezone
 
+from .cache import memoize
+from .parallel import exported_partial
 from .exceptions import ValidationException
-from functools import partial, wraps
-from six import text_type
+from functools import wraps
+from six import string_types, text_type
 
 
 def export_validator(f):
 
     @wraps(f)
     def wrapper(*args, **kwargs):
-        return partial(f, *args, **kwargs)
+        # pure=True memoizes the validator, see strainer.cache
+        if kwargs.pop('pure', False):
+            return memoize(exported_partial(wrapper, f, args, kwargs))
+
+        return exported_partial(wrapper, f, args, kwargs)
 
     return wrapper
 
 
+def validation_cost(cost):
+    """Sets the relative cost of running a validator. Serializers built with
+    `order_by_cost=True` deserialize fields with cheap validators first.
+
+    Validators without a cost are assumed to cost 5.
+    """
+    def decorator(f):
+        f.cost = cost
+        return f
+
+    return decorator
+
+
 def clamp_to_interval(value, bounds):
     min_bound, max_bound = bounds
     return min(max_bound, max(min_bound, value))
 
 
 @export_validator
+@validation_cost(2)
 def integer(value, bounds=None, context=None):
     """converts a value to integer, applying optional bounds
     """
@@ -39,7 +63,150 @@ def integer(value, bounds=None, context=None):
         raise ValidationException('This field is not an integer')
 
 
+def _numpy(values):
+    """Returns the numpy module if values is a NumPy array, otherwise None"""
+    if type(values).__module__ == 'numpy' and hasattr(values, 'dtype'):
+        import numpy
+        return numpy
+
+    return None
+
+
+def _convert_each(values, convert, message):
+    """Converts values one at a time, and raises the errors keyed by index"""
+    results = []
+    errors = {}
+    for i, value in enumerate(values):
+        try:
+            results.append(convert(value))
+        except (TypeError, ValueError):
+            errors[i] = message
+
+    if errors:
+        raise ValidationException(errors)
+
+    return results
+
+
+def _convert_all(values, convert, message):
+    """Converts a whole list at once, only going one value at a time to find
+    out which ones failed"""
+    try:
+        return list(map(convert, values))
+    except (TypeError, ValueError):
+        return _convert_each(values, convert, message)
+
+
+def _clamp_all(values, bounds):
+    if not bounds or not values:
+        return values
+
+    min_bound, max_bound = bounds
+    if min(values) < min_bound or max(values) > max_bound:
+        return [clamp_to_interval(value, bounds) for value in values]
+
+    return values
+
+
+def _converted_bounds(bounds, convert):
+    """Returns bounds as the same type as the values they clamp, so a clamped
+    value isn't the odd one out"""
+    if not bounds:
+        return bounds
+
+    return tuple(convert(bound) for bound in bounds)
+
+
+# Floats at, or past these don't fit in an int64, casting would wrap them
+INT64_MIN = -2.0 ** 63
+INT64_MAX = 2.0 ** 63
+
+
+def _invalid_numbers(numpy, values, message):
+    errors = dict((int(i), message) for i in numpy.flatnonzero(~numpy.isfinite(values)))
+
+    out_of_range = (values < INT64_MIN) | (values >= INT64_MAX)
+    for i in numpy.flatnonzero(out_of_range):
+        errors.setdefault(int(i), 'This field is out of range')
+
+    if errors:
+        raise ValidationException(errors)
+
+
+@export_validator
+@validation_cost(2)
+def integers(values, bounds=None, context=None):
+    """converts a whole list, or NumPy array, to integers at once, applying
+    optional bounds. Use it as one of a multiple_field's batch_validators.
+
+    NumPy arrays of numbers stay NumPy arrays. Errors are raised as a dict
+    keyed by the index of each invalid value.
+    """
+    message = 'This field is not an integer'
+    numpy = _numpy(values)
+    bounds = _converted_bounds(bounds, int)
+
+    if numpy is not None and values.dtype.kind in 'biuf':
+        if values.dtype.kind == 'f':
+            _invalid_numbers(numpy, values, message)
+
+        if values.dtype.kind in 'bf':
+            values = values.astype(numpy.int64)
+
+        return numpy.clip(values, *bounds) if bounds else values
+
+    if numpy is not None:
+        values = values.tolist()
+
+    return _clamp_all(_convert_all(values, int, message), bounds)
+
+
+@export_validator
+@validation_cost(2)
+def floats(values, bounds=None, context=None):
+    """converts a whole list, or NumPy array, to floats at once, applying
+    optional bounds. Use it as one of a multiple_field's batch_validators.
+
+    NumPy arrays of numbers stay NumPy arrays. Errors are raised as a dict
+    keyed by the index of each invalid value.
+    """
+    message = 'This field is not a float'
+    numpy = _numpy(values)
+    bounds = _converted_bounds(bounds, float)
+
+    if numpy is not None and values.dtype.kind in 'biuf':
+        if values.dtype.kind != 'f':
+            values = values.astype(numpy.float64)
+
+        return numpy.clip(values, *bounds) if bounds else values
+
+    if numpy is not None:
+        values = values.tolist()
+
+    return _clamp_all(_convert_all(values, float, message), bounds)
+
+
+@export_validator
+@validation_cost(1)
+def booleans(values, context=None):
+    """converts a whole list, or NumPy array, to booleans at once. Use it as
+    one of a multiple_field's batch_validators.
+
+    NumPy arrays of numbers stay NumPy arrays.
+    """
+    numpy = _numpy(values)
+
+    if numpy is not None and values.dtype.kind in 'biuf':
+        return values.astype(bool)
+
+    if numpy is not None:
+        values = values.tolist()
+
+    return _convert_all(values, bool, 'This field is suppose to be boolean')
+
+
 @export_validator
+@validation_cost(2)
 def string(value, max_length=None, context=None):
     """converts a value into a string, optionally with a max length"""
     if not value:
@@ -57,6 +224,7 @@ def string(value, max_length=None, context=None):
 
 
 @export_validator
+@validation_cost(1)
 def required(value, context=None):
     """validates that a field exists in the input"""
     if value:
@@ -69,6 +237,7 @@ def required(value, context=None):
 
 
 @export_validator
+@validation_cost(1)
 def boolean(value, context=None):
     """Converts a field into a boolean"""
     try:
@@ -77,13 +246,89 @@ def boolean(value, context=None):
         raise ValidationException('This field is suppose to be boolean')
 
 
+# The RFC 3339 shapes nearly every timestamp comes in, anything else is left
+# to iso8601. [0-9] because \d matches any unicode digit on python 3.
+RFC3339 = re.compile(
+    r'([0-9]{4})-([0-9]{2})-([0-9]{2})'
+    r'(?:[T ]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]{1,6}))?'
+    r'(Z|(?P<tz_sign>[-+])(?P<tz_hour>[0-9]{2}):(?P<tz_minute>[0-9]{2}))?)?\Z'
+)
+
+_timezones = {}
+
+
+def _timezone(match, timezone, default_tzinfo):
+    if timezone is None:
+        return default_tzinfo
+
+    tzinfo = _timezones.get(timezone)
+    if tzinfo is None:
+        tzinfo = _timezones[timezone] = parse_timezone(dict(
+            match.groupdict(), timezone=timezone
+        ))
+
+    return tzinfo
+
+
+def parse_datetime(value, default_tzinfo=iso8601.UTC):
+    """Parses an ISO 8601 string into a datetime, exactly like
+    `iso8601.parse_date`, but common RFC 3339 strings skip iso8601's much
+    slower general purpose parser.
+    """
+    match = RFC3339.match(value) if isinstance(value, string_types) else None
+
+    if match is not None:
+        year, month, day, hour, minute, second, fraction, timezone = match.groups()[:8]
+        try:
+            return _datetime.datetime(
+                int(year), int(month), int(day),
+                int(hour) if hour else 0,
+                int(minute) if minute else 0,
+                int(second) if second else 0,
+                int(fraction.ljust(6, '0')) if fraction else 0,
+                _timezone(match, timezone, default_tzinfo),
+            )
+        except ValueError:
+            pass
+
+    return iso8601.parse_date(value, default_timezone=default_tzinfo)
+
+
 @export_validator
+@validation_cost(20)
 def datetime(value, default_tzinfo=iso8601.UTC, context=None):
     """validates that a a field is an ISO 8601 string, and converts it to a datetime object."""
     if not value:
         return
 
     try:
-        return iso8601.parse_date(value, default_timezone=default_tzinfo)
+        return parse_datetime(value, default_tzinfo)
     except iso8601.ParseError as e:
         raise ValidationException('Invalid date: %s' % (e))
+
+
+@export_validator
+@validation_cost(20)
+def datetimes(values, default_tzinfo=iso8601.UTC, context=None):
+    """validates a whole list of ISO 8601 strings at once, and converts them to
+    datetime objects. Use it as one of a multiple_field's batch_validators.
+
+    Errors are raised as a dict keyed by the index of each invalid value.
+    """
+    results = []
+    errors = {}
+
+    for i, value in enumerate(values):
+        if not value:
+            results.append(None)
+            continue
+
+        try:
+            results.append(parse_datetime(value, default_tzinfo))
+        except iso8601.ParseError as e:
+            errors[i] = 'Invalid date: %s' % (e)
+
+    if errors:
+        raise ValidationException(errors)
+
+    return results
@@ -0,0 +1,14 @@
+class Counter(object):
+    """Counts the calls of `counted`, tests reset it before counting"""
+    calls = 0
+
+
+def counted(value, context=None):
+    """A formatter that counts how many times it ran"""
+    Counter.calls += 1
+    return value
+
+
+class Model(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from strainer import (serializer, field, multiple_field, child, many,
+                      validators, ValidationException)
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+
+async def exists(value, context=None):
+    await asyncio.sleep(0)
+    if value == 'missing':
+        raise ValidationException('Does not exist')
+
+    return value
+
+
+def rendezvous(count):
+    """Returns an async validator that only finishes once `count` calls are
+    waiting on it at the same time, so it deadlocks unless they are awaited
+    concurrently."""
+    state = {'waiting': 0, 'event': None}
+
+    async def validator(value, context=None):
+        if state['event'] is None:
+            state['event'] = asyncio.Event()
+
+        state['waiting'] += 1
+        if state['waiting'] == count:
+            state['event'].set()
+
+        await state['event'].wait()
+        return value
+
+    return validator
+
+
+def test_adeserialize():
+    child_serializer = serializer(
+        field('c1', validators=[validators.required(), exists]),
+    )
+    a_serializer = serializer(
+        field('a', validators=[validators.integer()]),
+        field('b', validators=[exists, validators.string()]),
+        multiple_field('d', validators=[exists]),
+        child('e', serializer=child_serializer),
+        many('f', serializer=child_serializer),
+    )
+
+    payload = {'a': '1', 'b': 'x', 'd': ['y'], 'e': {'c1': 'z'}, 'f': [{'c1': 'q'}]}
+    assert run(a_serializer.adeserialize(payload)) == {
+        'a': 1, 'b': 'x', 'd': ['y'], 'e': {'c1': 'z'}, 'f': [{'c1': 'q'}]
+    }
+    assert list(run(a_serializer.adeserialize(payload))) == ['a', 'b', 'd', 'e', 'f']
+
+    payload = {'a': 'x', 'b': 'missing', 'd': ['y', 'missing'],
+               'e': {'c1': 'missing'}, 'f': [{'c1': 'q'}, {}]}
+    with pytest.raises(ValidationException) as e:
+        run(a_serializer.adeserialize(payload))
+
+    assert e.value.errors == {
+        'a': ['This field is not an integer'],
+        'b': ['Does not exist'],
+        'd': {1: ['Does not exist']},
+        'e': {'c1': ['Does not exist']},
+        'f': {1: {'c1': ['This field is required']}},
+    }
+
+
+def test_adeserialize_matches_deserialize():
+    child_serializer = serializer(field('c1', validators=[validators.required()]))
+    a_serializer = serializer(
+        field('a', validators=[validators.integer()]),
+        child('e', serializer=child_serializer, validators=[validators.required()]),
+        many('f', serializer=child_serializer, validators=[validators.required()]),
+        multiple_field('g', batch_validators=[validators.datetimes()]),
+    )
+
+    for payload in [{'a': 1, 'e': {'c1': 1}, 'f': [{'c1': 2}], 'g': ['2017-01-01']},
+                    {'a': 'x', 'f': [{}], 'g': ['2017-01-01', 'x']}, {}]:
+        try:
+            expected = a_serializer.deserialize(payload)
+        except ValidationException as e:
+            expected = e.errors
+
+        try:
+            actual = run(a_serializer.adeserialize(payload))
+        except ValidationException as e:
+            actual = e.errors
+
+        assert expected == actual
+
+
+def test_adeserialize_is_concurrent():
+    validator = rendezvous(5)
+    child_serializer = serializer(field('c1', validators=[validator]))
+    a_serializer = serializer(
+        field('a', validators=[validator]),
+        field('b', validators=[validator]),
+        child('e', serializer=child_serializer),
+        many('f', serializer=child_serializer),
+    )
+
+    payload = {'a': 1, 'b': 2, 'e': {'c1': 3}, 'f': [{'c1': 4}, {'c1': 5}]}
+    assert run(a_serializer.adeserialize(payload)) == payload
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_async_validator_with_deserialize(compiled):
+    a_serializer = serializer(field('a', validators=[exists]),
+                              multiple_field('b', validators=[exists]),
+                              compiled=compiled)
+
+    with pytest.raises(TypeError):
+        a_serializer.deserialize({'a': 'x', 'b': []})
+
+    with pytest.raises(TypeError):
+        a_serializer.deserialize({'a': None, 'b': ['x']}, partial=True)
+
+
+def test_child_full_validators_see_earlier_fields():
+    seen = []
+
+    def full_validator(value, context=None):
+        seen.append(sorted(value))
+        if value['a'] == 'bad':
+            raise ValidationException('a is bad')
+        return value
+
+    a_serializer = serializer(
+        field('a'),
+        child('c', serializer=serializer(field('d')), full_validators=[full_validator]),
+        field('e'),
+    )
+
+    payload = {'a': 'ok', 'c': {'d': 1}, 'e': 2}
+    assert run(a_serializer.adeserialize(payload)) == a_serializer.deserialize(payload)
+    assert seen == [['a', 'c'], ['a', 'c']]
+
+    payload['a'] = 'bad'
+    with pytest.raises(ValidationException) as sync_error:
+        a_serializer.deserialize(payload)
+
+    with pytest.raises(ValidationException) as async_error:
+        run(a_serializer.adeserialize(payload))
+
+    assert async_error.value.errors == sync_error.value.errors == {
+        'c': {'_full_errors': ['a is bad']},
+    }
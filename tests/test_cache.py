@@ -0,0 +1,130 @@
+import datetime
+import pickle
+
+import pytest
+
+from strainer import (serializer, field, formatters, validators,
+                      ValidationException, SerializationContext)
+from strainer.cache import LRUCache, memoize
+from strainer.structure import validator_cost
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.get('b', 'missing') == 'missing'
+    assert cache.info() == {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2}
+
+    cache.clear()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def counting(allowed):
+    calls = []
+
+    def validator(value, context=None):
+        calls.append(value)
+        if value not in allowed:
+            raise ValidationException('Unknown %s' % (value))
+
+        return value
+
+    return validator, calls
+
+
+def test_memoize():
+    validator, calls = counting(['a', 1])
+    memoized = memoize(validator, maxsize=10)
+
+    assert [memoized('a'), memoized('a'), memoized(1)] == ['a', 'a', 1]
+    assert type(memoized(1.0)) is float
+    assert calls == ['a', 1, 1.0]
+    assert memoized.cache.info() == {'hits': 1, 'misses': 3, 'size': 3, 'maxsize': 10}
+
+    for _ in range(2):
+        with pytest.raises(ValidationException) as e:
+            memoized('x')
+        assert e.value.errors == 'Unknown x'
+
+    assert calls == ['a', 1, 1.0, 'x']
+
+    # Unhashable values are passed straight through
+    with pytest.raises(ValidationException):
+        memoized(['a'])
+    assert calls[-1] == ['a']
+
+
+def test_memoize_call_scope():
+    validator, calls = counting(['a'])
+    memoized = memoize(validator, scope='call')
+
+    assert memoized('a') == 'a'
+    assert memoized('a') == 'a'
+    assert calls == ['a', 'a']
+
+    context = SerializationContext()
+    assert memoized('a', context=context) == 'a'
+    assert memoized('a', context=context) == 'a'
+    assert calls == ['a', 'a', 'a']
+    assert memoized.cache_for(context).hits == 1
+
+    assert memoized('a', context=SerializationContext()) == 'a'
+    assert calls == ['a', 'a', 'a', 'a']
+
+    with pytest.raises(ValueError):
+        memoize(validator, scope='thread')
+
+
+def test_pure():
+    parse = validators.datetime(pure=True)
+    when = parse('2017-01-01T00:00:00Z')
+
+    assert parse('2017-01-01T00:00:00Z') is when
+    assert parse.cache.hits == 1
+    assert validator_cost(parse) == validator_cost(validators.datetime())
+
+    for _ in range(2):
+        with pytest.raises(ValidationException) as e:
+            parse('x')
+        assert e.value.errors.startswith('Invalid date:')
+
+    format_datetime = formatters.format_datetime(pure=True)
+    assert format_datetime(datetime.date(2017, 1, 1)) == '2017-01-01'
+    assert format_datetime(datetime.date(2017, 1, 1)) == '2017-01-01'
+    assert format_datetime.cache.info()['hits'] == 1
+
+
+class Event(object):
+    def __init__(self, when, name):
+        self.when = when
+        self.name = name
+
+
+def test_pure_serializer():
+    a_serializer = serializer(
+        field('when', validators=[validators.datetime(pure=True)],
+              formatters=[formatters.format_datetime(pure=True)]),
+        field('name', validators=[validators.string(max_length=3, pure=True)]),
+    )
+
+    data = a_serializer.deserialize({'when': '2017-01-01', 'name': 'abc'})
+    assert a_serializer.serialize(Event(**data)) == {
+        'when': '2017-01-01T00:00:00Z', 'name': 'abc',
+    }
+
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize({'when': '2017-01-01', 'name': 'abcd'})
+    assert e.value.errors == {'name': ['This field is to long, max length is 3']}
+
+    copy = pickle.loads(pickle.dumps(a_serializer))
+    assert copy.deserialize({'when': '2017-01-01', 'name': 'abc'}) == data
@@ -0,0 +1,117 @@
+import pytest
+
+from strainer import serializer, field, child, many, SerializationContext
+from strainer.changes import merge_patch, json_patch
+from strainer.structure import Translator
+
+from . import Counter, counted, Model
+
+
+def custom_serialize(source, target, context=None):
+    target['custom'] = source.id * 10
+    return target
+
+
+track_serializer = serializer(field('title'))
+album_serializer = serializer(
+    field('id', formatters=[counted]),
+    field('title', target_field='name', formatters=[counted]),
+    field('label', formatters=[counted]),
+    child('artist', serializer=serializer(field('name'), field('country'))),
+    many('tracks', serializer=track_serializer),
+    Translator(custom_serialize, lambda source, target, context=None: target),
+)
+
+
+def make():
+    return Model(id=1, title='Hunky Dory', label='RCA',
+                 artist=Model(name='David Bowie', country='UK'),
+                 tracks=[Model(title='Changes'), Model(title='Kooks')])
+
+
+def test_serialize_changed():
+    album = make()
+    previous = album_serializer.serialize(album)
+
+    album.title = 'Low'
+    album.artist.country = 'GB'
+    album.tracks[1].title = 'Quicksand'
+
+    Counter.calls = 0
+    document, patch = album_serializer.serialize_changed(
+        album, ['title', 'artist', 'tracks'], previous)
+
+    assert Counter.calls == 1
+    assert document == album_serializer.serialize(album)
+    assert list(document) == list(album_serializer.serialize(album))
+    assert previous['name'] == 'Hunky Dory'
+    assert patch == {'name': 'Low', 'artist': {'country': 'GB'},
+                     'tracks': [{'title': 'Changes'}, {'title': 'Quicksand'}]}
+
+    document, patch = album_serializer.serialize_changed(
+        album, ['title', 'artist', 'tracks'], previous, patch='json')
+
+    assert sorted(patch, key=lambda operation: operation['path']) == [
+        {'op': 'replace', 'path': '/artist/country', 'value': 'GB'},
+        {'op': 'replace', 'path': '/name', 'value': 'Low'},
+        {'op': 'replace', 'path': '/tracks/1/title', 'value': 'Quicksand'},
+    ]
+
+
+def test_serialize_changed_drop_empty():
+    context = SerializationContext(drop_empty=True)
+    album = make()
+    previous = album_serializer.serialize(album, context=context)
+
+    album.label = None
+    document, patch = album_serializer.serialize_changed(album, ['label'], previous,
+                                                         context=context)
+    assert 'label' not in document
+    assert patch == {'label': None}
+
+    album.label = 'EMI'
+    document, patch = album_serializer.serialize_changed(album, ['label'], document,
+                                                         context=context, patch='json')
+    assert patch == [{'op': 'add', 'path': '/label', 'value': 'EMI'}]
+    assert list(document) == list(album_serializer.serialize(album, context=context))
+
+    document, patch = album_serializer.serialize_changed(album, ['label'], document)
+    assert patch == {}
+
+
+def test_serialize_changed_attr_getter():
+    def full_name(model):
+        return model.first + ' ' + model.last
+
+    a_serializer = serializer(field('id'), field('name', attr_getter=full_name))
+    model = Model(id=1, first='a', last='b')
+    previous = a_serializer.serialize(model)
+
+    model.first = 'z'
+    document, patch = a_serializer.serialize_changed(model, ['first'], previous)
+
+    assert document == a_serializer.serialize(model)
+    assert patch == {'name': 'z b'}
+
+
+def test_serialize_changed_errors():
+    with pytest.raises(TypeError):
+        track_serializer.options['fields'][0].serialize_changed(make(), ['title'], {})
+
+    with pytest.raises(ValueError):
+        track_serializer.serialize_changed(make(), ['title'], {}, patch='xml')
+
+
+def test_patches():
+    old = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': [1, 2], 'f/g': 1}
+    new = {'a': 1, 'b': {'c': 4}, 'e': [1, 2, 3], 'h': None}
+
+    assert merge_patch(old, new) == {'b': {'c': 4, 'd': None}, 'e': [1, 2, 3],
+                                     'f/g': None, 'h': None}
+    assert sorted(json_patch(old, new), key=lambda operation: operation['path']) == [
+        {'op': 'replace', 'path': '/b/c', 'value': 4},
+        {'op': 'remove', 'path': '/b/d'},
+        {'op': 'replace', 'path': '/e', 'value': [1, 2, 3]},
+        {'op': 'remove', 'path': '/f~1g'},
+        {'op': 'add', 'path': '/h', 'value': None},
+    ]
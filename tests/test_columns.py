@@ -0,0 +1,166 @@
+import datetime
+
+import iso8601
+import pytest
+
+from strainer import (serializer, field, dict_field, multiple_field, child, many,
+                      formatters, validators, SerializationContext)
+from strainer.documents import cached
+from strainer.structure import Translator
+
+
+class Artist(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class Track(object):
+    def __init__(self, i):
+        self.id = i
+        self.title = 'track %s' % (i)
+        self.score = i * 1.5
+        self.tags = ['a'] * i
+        self.released = datetime.datetime(2017, 1, i + 1, tzinfo=iso8601.UTC)
+        self.artist = Artist('artist %s' % (i))
+        self.parts = [Artist('part %s' % (n)) for n in range(i)]
+
+
+artist_serializer = serializer(field('name', validators=[validators.required()]))
+
+track_serializer = serializer(
+    field('id', validators=[validators.required(), validators.integer()]),
+    field('title', target_field='name'),
+    field('score'),
+    multiple_field('tags', validators=[validators.string(max_length=1)]),
+    field('released', validators=[validators.datetime()],
+          formatters=[formatters.format_datetime()]),
+    child('artist', serializer=artist_serializer),
+    many('parts', serializer=artist_serializer),
+)
+
+
+def test_serialize_columns():
+    tracks = [Track(i) for i in range(3)]
+    columns = track_serializer.serialize_columns(iter(tracks))
+
+    assert columns == {
+        'id': [0, 1, 2],
+        'name': ['track 0', 'track 1', 'track 2'],
+        'score': [0.0, 1.5, 3.0],
+        'tags': [[], ['a'], ['a', 'a']],
+        'released': ['2017-01-01T00:00:00Z', '2017-01-02T00:00:00Z', '2017-01-03T00:00:00Z'],
+        'artist': {'name': ['artist 0', 'artist 1', 'artist 2']},
+        'parts': [[], [{'name': 'part 0'}], [{'name': 'part 0'}, {'name': 'part 1'}]],
+    }
+
+    rows = [track_serializer.serialize(track) for track in tracks]
+    for key, column in columns.items():
+        if key != 'artist':
+            assert column == [row[key] for row in rows]
+
+    assert track_serializer.serialize_columns([]) == {
+        'id': [], 'name': [], 'score': [], 'tags': [], 'released': [],
+        'artist': {'name': []}, 'parts': [],
+    }
+
+
+def test_serialize_columns_dict_and_custom():
+    def serialize(source, target, context=None):
+        target['double'] = source['a'] * 2
+        return target
+
+    a_serializer = serializer(dict_field('a'), Translator(serialize, None))
+    assert a_serializer.serialize_columns([{'a': 1}, {'a': 2}]) == {
+        'a': [1, 2], 'double': [2, 4],
+    }
+
+    with pytest.raises(TypeError):
+        field('a').serialize_columns([])
+
+
+def test_columns_cached_child():
+    a_serializer = serializer(
+        field('id'),
+        child('artist', serializer=cached(artist_serializer, key=lambda artist: artist.name)),
+    )
+    tracks = [Track(i) for i in range(3)]
+    columns = a_serializer.serialize_columns(tracks)
+
+    assert columns == {
+        'id': [0, 1, 2],
+        'artist': [{'name': 'artist 0'}, {'name': 'artist 1'}, {'name': 'artist 2'}],
+    }
+
+    columns['artist'][1] = {}
+    result, errors = a_serializer.deserialize_columns(columns)
+
+    assert result == {'id': [0, 2], 'artist': [{'name': 'artist 0'}, {'name': 'artist 2'}]}
+    assert errors == {1: {'artist': {'name': ['This field is required']}}}
+
+
+def test_serialize_columns_numpy():
+    np = pytest.importorskip('numpy')
+
+    a_serializer = serializer(field('id'), field('score'), field('title'),
+                              field('released'), child('artist', serializer=artist_serializer))
+    columns = a_serializer.serialize_columns([Track(i) for i in range(3)], numpy=True)
+
+    assert columns['id'].dtype.kind == 'i'
+    assert columns['score'].tolist() == [0.0, 1.5, 3.0]
+    assert columns['title'] == ['track 0', 'track 1', 'track 2']
+    assert columns['released'].dtype == np.dtype('datetime64[us]')
+    assert str(columns['released'][1]) == '2017-01-02T00:00:00.000000'
+    assert columns['artist'] == {'name': ['artist 0', 'artist 1', 'artist 2']}
+
+
+def test_deserialize_columns():
+    tracks = [Track(i) for i in range(3)]
+    columns = track_serializer.serialize_columns(tracks)
+    rows, errors = track_serializer.deserialize_many(
+        [track_serializer.serialize(track) for track in tracks])
+
+    result, column_errors = track_serializer.deserialize_columns(columns)
+
+    assert column_errors == errors == {}
+    for key, column in result.items():
+        assert column == [row[key] for row in rows]
+
+
+def test_deserialize_columns_errors():
+    columns = {
+        'id': ['1', 'x', None, '4'],
+        'tags': [['a'], ['a'], ['bb'], []],
+        'artist': {'name': ['a', 'b', 'c', None]},
+        'parts': [[], [{}], [], []],
+    }
+
+    result, errors = track_serializer.deserialize_columns(columns)
+
+    assert errors == {
+        1: {'id': ['This field is not an integer'],
+            'parts': {0: {'name': ['This field is required']}}},
+        2: {'id': ['This field is required', 'This field is not an integer'],
+            'tags': {0: ['This field is to long, max length is 1']}},
+        3: {'artist': {'name': ['This field is required']}},
+    }
+    assert result['id'] == [1]
+    assert result['title'] == [None]
+    assert result['artist'] == [{'name': 'a'}]
+
+    _, errors = track_serializer.deserialize_columns(
+        columns, context=SerializationContext(fail_fast=True))
+    assert sorted(errors) == [1, 2]
+
+    with pytest.raises(ValueError):
+        track_serializer.deserialize_columns({'id': [1], 'name': [1, 2]})
+
+
+def test_deserialize_columns_numpy():
+    np = pytest.importorskip('numpy')
+
+    a_serializer = serializer(field('id', validators=[validators.integer()]))
+    result, errors = a_serializer.deserialize_columns({'id': np.array([1, 2])})
+
+    assert errors == {}
+    assert result['id'] == [1, 2]
+    assert type(result['id'][0]) is int
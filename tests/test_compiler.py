@@ -0,0 +1,273 @@
+import datetime
+import json
+
+import pytest
+
+from strainer import (field, dict_field, multiple_field, serializer,
+                      child, many, formatters, validators, ValidationException)
+from strainer.compiler import (compile_serialize, compile_deserialize,
+                               compile_serializer)
+from strainer.context import SerializationContext
+from strainer.exceptions import ErrorCollector
+from strainer.structure import Translator
+
+
+serialization_context = SerializationContext(drop_empty=True)
+
+
+class ChildTestObject(object):
+    c1 = 'a'
+    c2 = None
+    when = datetime.datetime(1984, 6, 11, 12, 1)
+
+
+class EmptyChildTestObject(object):
+    c1 = None
+    c2 = None
+    when = None
+
+
+class TestObject(object):
+    a = 1
+    b = ChildTestObject()
+    b2 = EmptyChildTestObject()
+    c = [ChildTestObject(), ChildTestObject()]
+    d = [1, 2]
+    e = []
+    empty = None
+    zero = 0
+
+
+child_serializer = serializer(
+    field('c1'),
+    field('c2'),
+    field('when', formatters=[formatters.format_datetime()]),
+)
+
+
+def build_serializers(*fields):
+    return serializer(*fields), serializer(*fields, compiled=True)
+
+
+def assert_identical(fields, source):
+    plain, compiled = build_serializers(*fields)
+
+    for context in [None, serialization_context]:
+        expected = plain.serialize(source, context=context)
+        actual = compiled.serialize(source, context=context)
+        assert expected == actual
+        assert json.dumps(expected) == json.dumps(actual)
+
+
+def deserialize_result(a_serializer, source):
+    try:
+        return a_serializer.deserialize(source), None
+    except ValidationException as e:
+        return None, e.errors
+
+
+def assert_identical_deserialize(fields, sources):
+    plain, compiled = build_serializers(*fields)
+
+    for source in sources:
+        assert deserialize_result(plain, source) == deserialize_result(compiled, source)
+
+
+def fail_validator(value, context=None):
+    raise ValidationException('Failed')
+
+
+def test_compiled_field():
+    assert_identical([
+        field('a'),
+        field('a', target_field='z'),
+        field('empty'),
+        field('zero'),
+        field('a', attr_getter=lambda x: x.a + 1),
+        field('b.c1', target_field='b_c1'),
+    ], TestObject())
+
+
+def test_compiled_dict_field():
+    source = {'a': 1, 'empty': None, 'b': 'c', 'class': 'x'}
+    assert_identical([
+        dict_field('a'),
+        dict_field('empty'),
+        dict_field('missing'),
+        dict_field('class'),
+        dict_field('b', target_field='z', attr_getter=lambda x: x['b'] * 2),
+    ], source)
+
+
+def test_compiled_multiple_field():
+    assert_identical([
+        multiple_field('d'),
+        multiple_field('e'),
+    ], TestObject())
+
+
+def test_compiled_child():
+    assert_identical([
+        field('a'),
+        child('b', serializer=child_serializer),
+        child('b2', serializer=child_serializer),
+        child('b', target_field='z', serializer=child_serializer,
+              attr_getter=lambda x: x.b),
+    ], TestObject())
+
+
+def test_compiled_many():
+    assert_identical([
+        field('a'),
+        many('c', serializer=child_serializer),
+        many('e', serializer=child_serializer),
+        many('c', target_field='z', serializer=child_serializer,
+             attr_getter=lambda x: x.c[:1]),
+    ], TestObject())
+
+
+def test_compiled_nested_compiled():
+    inner = serializer(field('c1'), field('c2'), compiled=True)
+    assert_identical([
+        child('b', serializer=inner),
+        many('c', serializer=inner),
+    ], TestObject())
+
+
+def test_compiled_custom_translator():
+    def serialize(source, target, context=None):
+        target['custom'] = source.a * 10
+        return target
+
+    custom = Translator(serialize, None)
+
+    assert_identical([field('a'), custom], TestObject())
+
+
+def test_compiled_source_is_inlined():
+    a_serializer = serializer(field('a'), dict_field('b'),
+                              field('c', formatters=[formatters.format_datetime()]))
+    serialize = compile_serialize(a_serializer)
+
+    assert 'source.a' in serialize.source
+    assert "source.get('b')" in serialize.source
+    assert 'drop_empty = check_context' in serialize.source
+
+
+def test_compiled_deserialize_field():
+    fields = [
+        field('a', validators=[validators.required(), validators.integer()]),
+        field('b', target_field='z', validators=[validators.string(max_length=2)]),
+        dict_field('c'),
+        field('d', validators=[fail_validator, fail_validator, validators.integer()]),
+    ]
+    assert_identical_deserialize(fields, [
+        {'a': '1', 'z': 'ab', 'c': 3},
+        {'a': None, 'z': 'abc'},
+        {},
+    ])
+
+    _, compiled = build_serializers(*fields[:3])
+    assert compiled.deserialize({'a': '1', 'z': 'ab', 'c': 3}) == {'a': 1, 'b': 'ab', 'c': 3}
+
+    _, errors = deserialize_result(compiled, {'a': 'x', 'z': 'abc'})
+    assert errors == {
+        'a': ['This field is not an integer'],
+        'z': ['This field is to long, max length is 2'],
+    }
+
+    _, errors = deserialize_result(serializer(*fields, compiled=True), {'a': 1, 'd': 2})
+    assert errors == {'d': ['Failed', 'Failed']}
+
+
+def test_compiled_deserialize_nested():
+    inner = serializer(field('c1', validators=[validators.required()]))
+    compiled_inner = serializer(field('c1', validators=[validators.required()]),
+                                compiled=True)
+
+    for child_serializer in [inner, compiled_inner]:
+        fields = [
+            field('a', validators=[validators.integer()]),
+            multiple_field('d', validators=[validators.integer()]),
+            child('b', serializer=child_serializer, validators=[validators.required()]),
+            many('c', serializer=child_serializer),
+        ]
+        assert_identical_deserialize(fields, [
+            {'a': 1, 'd': [1, '2'], 'b': {'c1': 'x'}, 'c': [{'c1': 'y'}]},
+            {'a': 'x', 'd': [1, 'x'], 'b': {}, 'c': [{'c1': 'y'}, {}]},
+            {'a': 1},
+        ])
+
+
+def test_compiled_deserialize_source():
+    a_serializer = serializer(field('a', validators=[validators.integer()]),
+                              dict_field('b'))
+    deserialize = compile_deserialize(a_serializer)
+
+    assert "value = source.get('a')" in deserialize.source
+    assert "target['b'] = source.get('b')" in deserialize.source
+
+    with pytest.raises(ValidationException):
+        deserialize({'a': 'x'})
+
+
+def test_compiled_deserialize_reuses_collectors():
+    created = []
+
+    class CountedCollector(ErrorCollector):
+        def __init__(self):
+            super(CountedCollector, self).__init__()
+            created.append(self)
+
+    a_serializer = serializer(field('a'), child('b', serializer=serializer(field('c'))),
+                              many('d', serializer=serializer(field('c'))))
+    deserialize = compile_deserialize(a_serializer)
+    deserialize.__globals__['ErrorCollector'] = CountedCollector
+    payload = {'a': 1, 'b': {'c': 2}, 'd': [{'c': 3}]}
+
+    for _ in range(3):
+        assert deserialize(payload) == payload
+
+    assert len(created) <= 1
+
+
+def test_compile_serializer():
+    a_serializer = serializer(field('a'))
+    compiled = compile_serializer(a_serializer)
+
+    assert compiled.kind == 'serializer'
+    assert compiled.options['compiled'] is True
+    assert compiled.serialize(TestObject()) == {'a': 1}
+    assert compiled.deserialize({'a': 1}) == {'a': 1}
+
+
+def test_compiled_fail_fast():
+    context = SerializationContext(fail_fast=True)
+    child_serializer = serializer(field('c1', validators=[validators.required()]))
+    fields = [
+        field('when', validators=[validators.datetime()]),
+        field('a', validators=[fail_validator, fail_validator]),
+        many('c', serializer=child_serializer),
+        field('b', validators=[validators.required(), validators.integer()]),
+    ]
+    payloads = [
+        {'when': 'x', 'c': [{}, {}]},
+        {'when': '2017-01-01', 'c': [{}, {}]},
+        {'when': '2017-01-01', 'c': [{'c1': 1}]},
+    ]
+
+    for order_by_cost in [False, True]:
+        plain = serializer(*fields, order_by_cost=order_by_cost)
+        compiled = serializer(*fields, order_by_cost=order_by_cost, compiled=True)
+
+        for payload in payloads:
+            with pytest.raises(ValidationException) as expected:
+                plain.deserialize(payload, context=context)
+            with pytest.raises(ValidationException) as actual:
+                compiled.deserialize(payload, context=context)
+
+            assert expected.value.errors == actual.value.errors
+            assert len(actual.value.errors) == 1
+
+        assert (plain.deserialize_many(payloads, context=context) ==
+                compiled.deserialize_many(payloads, context=context))
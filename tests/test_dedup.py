@@ -0,0 +1,85 @@
+import pytest
+
+from strainer import serializer, field, child, many, SerializationContext
+from strainer.dedup import CircularReferenceError, current
+from strainer.structure import Translator
+
+from . import Counter, counted, Model
+
+
+user_serializer = serializer(field('name', formatters=[counted]))
+
+
+def make_posts():
+    authors = [Model(id=n, name='User %s' % (n)) for n in range(3)]
+    return [Model(title='Post %s' % (n), author=authors[n % 3], readers=authors)
+            for n in range(10)]
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_dedup(compiled):
+    post_serializer = serializer(
+        field('title'),
+        child('author', serializer=user_serializer),
+        many('readers', serializer=user_serializer),
+        compiled=compiled,
+    )
+    posts = make_posts()
+    expected = post_serializer.serialize_many(posts)
+
+    Counter.calls = 0
+    result = post_serializer.serialize_many(posts, context=SerializationContext(dedup=True))
+
+    assert result == expected
+    assert Counter.calls == 3
+    assert result[0]['author'] is result[3]['author']
+    assert result[0]['readers'][0] is result[0]['author']
+
+
+def test_dedup_key_function():
+    post_serializer = serializer(child('author', serializer=user_serializer))
+    posts = [Model(author=Model(id=1, name='Same')) for _ in range(4)]
+    context = SerializationContext(dedup=lambda user: user.id)
+
+    Counter.calls = 0
+    result = post_serializer.serialize_many(posts, context=context)
+
+    assert result == [{'author': {'name': 'Same'}}] * 4
+    assert Counter.calls == 1
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_dedup_is_per_call(compiled):
+    post_serializer = serializer(child('author', serializer=user_serializer),
+                                 compiled=compiled)
+    post = make_posts()[0]
+    context = SerializationContext(dedup=True)
+
+    Counter.calls = 0
+    assert post_serializer.serialize(post, context=context) == {'author': {'name': 'User 0'}}
+
+    post.author.name = 'Renamed'
+    assert post_serializer.serialize(post, context=context) == {'author': {'name': 'Renamed'}}
+    assert post_serializer.serialize_many([post], context=context) == [
+        {'author': {'name': 'Renamed'}},
+    ]
+
+    assert Counter.calls == 3
+    assert current() is None
+    assert not hasattr(context, '_dedup')
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_circular_reference(compiled):
+    # A serializer can only refer to itself through a translator that looks
+    # it up when called
+    parent = Translator(lambda source, context=None: node_serializer.serialize(source, context),
+                        lambda source, context=None: source)
+    node_serializer = serializer(field('name'), child('parent', serializer=parent),
+                                 compiled=compiled)
+
+    node = Model(name='a')
+    node.parent = Model(name='b', parent=node)
+
+    with pytest.raises(CircularReferenceError):
+        node_serializer.serialize(node, context=SerializationContext(dedup=True))
@@ -0,0 +1,110 @@
+from strainer import serializer, field, child, many, SerializationContext
+from strainer.documents import cached, DocumentCache
+
+from . import Counter, counted, Model
+
+
+class Clock(object):
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DictStore(object):
+    """Stands in for a shared store, like memcached"""
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(repr(key))
+
+    def set(self, key, value):
+        self.data[repr(key)] = value
+
+    def delete(self, key):
+        self.data.pop(repr(key), None)
+
+
+user_serializer = serializer(field('id'), field('name', formatters=[counted]))
+
+
+def test_document_cache_ttl():
+    clock = Clock()
+    cache = DocumentCache(maxsize=2, ttl=10, timer=clock)
+
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    clock.now = 10
+    assert cache.get('a') is None
+    assert 'a' not in cache
+    assert cache.info() == {'hits': 1, 'misses': 1, 'size': 0, 'maxsize': 2}
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+    assert 'a' not in cache
+    assert cache.get('c') == 3
+
+
+def test_cached():
+    users = cached(user_serializer, key=lambda user: user.id,
+                   version=lambda user: user.version)
+    post_serializer = serializer(child('author', serializer=users),
+                                 many('readers', serializer=users))
+    author = Model(id=1, name='David', version=1)
+    post = Model(author=author, readers=[author, Model(id=2, name='Iggy', version=1)])
+    expected = {'author': {'id': 1, 'name': 'David'},
+                'readers': [{'id': 1, 'name': 'David'}, {'id': 2, 'name': 'Iggy'}]}
+
+    Counter.calls = 0
+    assert post_serializer.serialize(post) == expected
+    assert post_serializer.serialize(post) == expected
+    assert Counter.calls == 2
+    assert users.info()['hits'] == 4
+    assert users.info()['misses'] == 2
+
+    author.name = 'Bowie'
+    assert post_serializer.serialize(post)['author']['name'] == 'David'
+
+    author.version = 2
+    assert post_serializer.serialize(post)['author']['name'] == 'Bowie'
+
+    author.name = 'Jones'
+    users.invalidate(1)
+    assert post_serializer.serialize(post)['author']['name'] == 'Jones'
+
+
+def test_cached_drop_empty_and_lazy():
+    users = cached(user_serializer, key=lambda user: user.id)
+    post_serializer = serializer(child('author', serializer=users))
+    post = Model(author=Model(id=1, name=None))
+
+    assert post_serializer.serialize(post) == {'author': {'id': 1, 'name': None}}
+    assert post_serializer.serialize(post, context=SerializationContext(drop_empty=True)) == {
+        'author': {'id': 1},
+    }
+
+    result = post_serializer.serialize(post, context=SerializationContext(lazy=True))
+    assert result['author'] == {'id': 1, 'name': None}
+    assert users.info()['hits'] == 0
+
+
+def test_cached_shared_store():
+    store = DictStore()
+    users = cached(user_serializer, key=lambda user: user.id, cache=store, name='user')
+    post_serializer = serializer(child('author', serializer=users))
+    post = Model(author=Model(id=1, name='David'))
+
+    Counter.calls = 0
+    post_serializer.serialize(post)
+    post_serializer.serialize(post)
+
+    assert Counter.calls == 1
+    assert list(store.data) == [repr(('user', 1, False))]
+    assert users.info() == {'hits': 1, 'misses': 1}
+
+    assert post_serializer.deserialize({'author': {'id': 1, 'name': 'David'}}) == {
+        'author': {'id': 1, 'name': 'David'},
+    }
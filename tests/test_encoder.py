@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+import pickle
+
+from strainer import (serializer, field, dict_field, child, many, multiple_field,
+                      formatters, SerializationContext)
+from strainer.structure import Translator
+from strainer.encoder import encode
+
+from . import Model
+
+
+def custom_serialize(source, target, context=None):
+    target['custom'] = {'nested': [source.a, None]}
+    return target
+
+
+custom = Translator(custom_serialize, lambda source, target, context=None: target)
+
+artist_serializer = serializer(field('name'), field('rating'))
+album_serializer = serializer(
+    field('a'),
+    field('title', target_field='name'),
+    field('rating'),
+    field('label'),
+    field('explicit'),
+    multiple_field('tags'),
+    field('released', formatters=[formatters.format_datetime()]),
+    child('artist', serializer=artist_serializer),
+    many('tracks', serializer=artist_serializer),
+)
+
+
+def make():
+    return Model(
+        a=1, title=u'Hunky Doré "live"', rating=4.5, label=None, explicit=False,
+        tags=['glam', 1], released=datetime.datetime(1971, 12, 17),
+        artist=Model(name='David Bowie', rating=float('inf')),
+        tracks=[Model(name='Changes', rating=0), Model(name=u'☃', rating=-1.25)],
+    )
+
+
+def expected(a_serializer, source, context=None):
+    return json.dumps(a_serializer.serialize(source, context=context)).encode('utf-8')
+
+
+def test_dumps_matches_json_dumps():
+    assert album_serializer.dumps(make()) == expected(album_serializer, make())
+
+
+def test_dumps_compiled_serializer():
+    compiled = serializer(*album_serializer.options['fields'], compiled=True)
+    assert compiled.dumps(make()) == expected(album_serializer, make())
+
+
+def test_dumps_drop_empty():
+    source = make()
+    source.a = 0
+    source.tracks = []
+    source.artist = Model(name=None, rating=None)
+    context = SerializationContext(drop_empty=True)
+
+    result = album_serializer.dumps(source, context=context)
+
+    assert result == expected(album_serializer, source, context=context)
+    assert b'"a": 0' in result
+    assert b'"label"' not in result
+    assert b'"artist"' not in result
+    assert b'"tracks": []' in result
+
+
+def test_dumps_dict_fields_and_lazy_context():
+    a_serializer = serializer(dict_field('a'), dict_field('b', target_field='c'),
+                              dict_field('missing'))
+    source = {'a': 1, 'b': [1.5, {'x': None}]}
+    context = SerializationContext(lazy=True)
+
+    assert a_serializer.dumps(source, context=context) == expected(a_serializer, source)
+
+
+def test_dumps_unknown_or_repeated_keys():
+    fields = album_serializer.options['fields']
+    serializers = [
+        serializer(*(fields + (custom,))),
+        serializer(field('a', target_field='custom'), custom),
+        serializer(field('a', target_field='name'), *fields),
+        serializer(child('artist', serializer=serializer(field('name'), field('name')))),
+    ]
+
+    for a_serializer in serializers:
+        assert a_serializer.dumps(make()) == expected(a_serializer, make())
+
+
+def test_dumps_is_cached_and_pickles():
+    artist_serializer.dumps(make().artist)
+    assert artist_serializer._dumps is not None
+
+    restored = pickle.loads(pickle.dumps(artist_serializer))
+    assert restored.dumps(make().artist) == expected(artist_serializer, make().artist)
+
+
+def test_encode():
+    values = [u'é\n', 'a', 10, -3, 2 ** 70, 1.0, 1e100, float('nan'), float('-inf'),
+              True, False, None, [1, 'a'], {'a': 1}]
+
+    for value in values:
+        assert encode(value) == json.dumps(value)
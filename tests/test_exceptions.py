@@ -0,0 +1,91 @@
+from strainer import (serializer, field, child, many, multiple_field,
+                      validators, ValidationException)
+from strainer.exceptions import ErrorCollector, json_pointer
+
+
+def test_error_collector():
+    errors = ErrorCollector()
+    assert not errors
+
+    errors.add(('a',), 'Failed')
+    errors.add(('a',), 'Failed, again')
+    errors.extend_errors(('items', 3, 'price'), ['Not an integer'])
+    errors.merge(('custom',), {'x': ['Bad']})
+    errors.replace(('items', 4), 'Bad')
+
+    assert errors
+    assert errors.errors == {
+        'a': ['Failed', 'Failed, again'],
+        'items': {3: {'price': ['Not an integer']}, 4: 'Bad'},
+        'custom': {'x': ['Bad']},
+    }
+
+    e = errors.exception()
+    assert isinstance(e, ValidationException)
+    assert e.errors == errors.errors
+
+
+def test_pointers():
+    e = ValidationException({
+        'a': ['Failed'],
+        'items': {3: {'price': ['Not an integer']}, '_full_errors': ['Too short']},
+        'a/b~c': ['Odd'],
+    })
+
+    assert e.pointers == {
+        '/a': ['Failed'],
+        '/items/3/price': ['Not an integer'],
+        '/items/_full_errors': ['Too short'],
+        '/a~1b~0c': ['Odd'],
+    }
+    assert ValidationException('Failed').pointers == {'': ['Failed']}
+    assert json_pointer(()) == ''
+
+
+def test_nested_errors_raise_once(monkeypatch):
+    leaf = serializer(field('price', validators=[validators.integer()]))
+    a_serializer = leaf
+    for depth in range(5):
+        a_serializer = serializer(child('c', serializer=a_serializer))
+
+    payload = {'price': 'x'}
+    for depth in range(5):
+        payload = {'c': payload}
+
+    constructed = []
+    original = ValidationException.__init__
+
+    def counting_init(self, errors):
+        constructed.append(errors)
+        original(self, errors)
+
+    monkeypatch.setattr(ValidationException, '__init__', counting_init)
+
+    try:
+        a_serializer.deserialize(payload)
+    except ValidationException as e:
+        assert e.pointers == {'/c/c/c/c/c/price': ['This field is not an integer']}
+
+    # One raised by the validator, and one raised by the outermost serializer
+    assert len(constructed) == 2
+
+
+def test_structure_error_pointers():
+    item_serializer = serializer(field('price', validators=[validators.integer()]))
+    a_serializer = serializer(
+        many('items', serializer=item_serializer),
+        multiple_field('tags', validators=[validators.string(max_length=1)]),
+    )
+
+    try:
+        a_serializer.deserialize({'items': [{'price': 1}, {'price': 'x'}],
+                                  'tags': ['a', 'bb']})
+    except ValidationException as e:
+        assert e.errors == {
+            'items': {1: {'price': ['This field is not an integer']}},
+            'tags': {1: ['This field is to long, max length is 1']},
+        }
+        assert e.pointers == {
+            '/items/1/price': ['This field is not an integer'],
+            '/tags/1': ['This field is to long, max length is 1'],
+        }
@@ -0,0 +1,124 @@
+import pytest
+
+from strainer import serializer, field, child, many, formatters, validators
+from strainer.fieldsets import parse_paths
+from strainer.structure import Translator
+
+
+class Author(object):
+    def __init__(self, name):
+        self.name = name
+        self.email = '%s@example.com' % (name)
+
+
+class Book(object):
+    id = 1
+    title = 'Ziggy'
+    author = Author('bowie')
+    editors = [Author('a'), Author('b')]
+
+
+def exploding(source):
+    raise AssertionError('Should not have been fetched')
+
+
+def explode_formatter(value, context=None):
+    raise AssertionError('Should not have been formatted')
+
+
+author_serializer = serializer(
+    field('name', validators=[validators.required()]),
+    field('email'),
+)
+
+book_serializer = serializer(
+    field('id'),
+    field('title', formatters=[formatters.format_datetime()]),
+    child('author', serializer=author_serializer),
+    many('editors', serializer=author_serializer),
+)
+
+
+def test_parse_paths():
+    assert parse_paths('id, author.name,,author.email') == {
+        'id': {}, 'author': {'name': {}, 'email': {}},
+    }
+    assert parse_paths(['a.b.c']) == {'a': {'b': {'c': {}}}}
+
+
+def test_only():
+    assert book_serializer.only('id,author.name,editors.email').serialize(Book()) == {
+        'id': 1,
+        'author': {'name': 'bowie'},
+        'editors': [{'email': 'a@example.com'}, {'email': 'b@example.com'}],
+    }
+    assert book_serializer.only(['author']).serialize(Book()) == {
+        'author': {'name': 'bowie', 'email': 'bowie@example.com'},
+    }
+    assert book_serializer.only([]).serialize(Book()) == {}
+
+    pruned = book_serializer.only('author.email')
+    assert pruned.deserialize({'author': {'email': 'x'}}) == {'author': {'email': 'x'}}
+
+    with pytest.raises(ValueError):
+        book_serializer.only('nope')
+
+    with pytest.raises(ValueError):
+        book_serializer.only('author.nope')
+
+
+def test_sub_paths_of_unprunable_fields():
+    from strainer.documents import cached
+
+    cached_author = serializer(child('author', serializer=cached(author_serializer,
+                                                                 key=lambda author: author.name)),
+                               field('id'))
+
+    for paths in ['author.email', 'id.x']:
+        with pytest.raises(ValueError):
+            cached_author.exclude(paths)
+
+        with pytest.raises(ValueError):
+            cached_author.only(paths)
+
+    assert cached_author.only('author').serialize(Book()) == {
+        'author': author_serializer.serialize(Book.author),
+    }
+
+
+def test_exclude():
+    assert book_serializer.exclude('title,editors,author.email').serialize(Book()) == {
+        'id': 1, 'author': {'name': 'bowie'},
+    }
+    assert book_serializer.exclude([]).serialize(Book()) == book_serializer.serialize(Book())
+
+
+def test_pruned_fields_are_never_called():
+    a_serializer = serializer(
+        field('id'),
+        field('title', attr_getter=exploding),
+        field('name', formatters=[explode_formatter]),
+        child('author', serializer=serializer(field('name'), field('email', attr_getter=exploding))),
+        many('editors', serializer=author_serializer, attr_getter=exploding),
+        Translator(lambda source, target, context=None: exploding(source), None),
+    )
+
+    assert a_serializer.only('id,author.name').serialize(Book()) == {
+        'id': 1, 'author': {'name': 'bowie'},
+    }
+
+
+def test_fieldsets_are_cached():
+    pruned = book_serializer.only('id,author.name')
+
+    assert book_serializer.only('author.name, id') is pruned
+    assert book_serializer.only(['id', 'author.name']) is pruned
+    assert book_serializer.exclude('id,author.name') is not pruned
+    assert book_serializer._fieldsets.hits >= 2
+
+    compiled = serializer(field('id'), field('title'), compiled=True)
+    assert compiled.only('id').options['compiled'] is True
+    assert compiled.only('id').serialize(Book()) == {'id': 1}
+
+    with pytest.raises(TypeError):
+        field('id').only('id')
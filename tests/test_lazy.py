@@ -0,0 +1,109 @@
+import io
+import json
+
+import pytest
+
+from strainer import serializer, field, child, many, SerializationContext
+from strainer.lazy import LazyChild, LazyMany, default, materialize
+
+from . import Counter, counted
+
+
+class Artist(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class Album(object):
+    def __init__(self):
+        self.title = 'Hunky Dory'
+        self.artist = Artist('David Bowie')
+        self.tracks = [Artist('Changes'), Artist('Kooks'), Artist('Quicksand')]
+        self.empty = []
+
+
+artist_serializer = serializer(field('name', formatters=[counted]))
+
+fields = [
+    field('title'),
+    child('artist', serializer=artist_serializer),
+    many('tracks', serializer=artist_serializer),
+    many('empty', serializer=artist_serializer),
+]
+
+lazy_context = SerializationContext(lazy=True)
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_lazy_serialize(compiled):
+    album_serializer = serializer(*fields, compiled=compiled)
+    expected = album_serializer.serialize(Album())
+
+    Counter.calls = 0
+    data = album_serializer.serialize(Album(), context=lazy_context)
+
+    assert isinstance(data['artist'], LazyChild)
+    assert isinstance(data['tracks'], LazyMany)
+    assert Counter.calls == 0
+
+    assert data['artist']['name'] == 'David Bowie'
+    assert Counter.calls == 1
+
+    assert data['tracks'][1] == {'name': 'Kooks'}
+    assert len(data['tracks']) == 3
+    assert Counter.calls == 2
+    assert data['tracks'][1:] == [{'name': 'Kooks'}, {'name': 'Quicksand'}]
+    assert Counter.calls == 3
+
+    assert data == expected
+    assert json.dumps(data, default=default, sort_keys=True) == \
+        json.dumps(expected, sort_keys=True)
+
+    plain = materialize(data)
+    assert type(plain['artist']) is dict and type(plain['tracks']) is list
+    assert plain == expected
+
+
+def test_lazy_proxies():
+    proxy = LazyChild(artist_serializer.serialize, Artist('a'), None)
+    assert repr(proxy) == '<LazyChild unserialized>'
+    assert not proxy.materialized
+    assert dict(proxy) == {'name': 'a'}
+    assert proxy.materialized
+    assert repr(proxy) == "LazyChild({'name': 'a'})"
+
+    proxy = LazyMany(artist_serializer.serialize, iter([Artist('a')]), None)
+    assert list(proxy) == [{'name': 'a'}]
+    assert proxy.materialize() == [{'name': 'a'}]
+    assert proxy != []
+
+    with pytest.raises(TypeError):
+        default(object())
+
+
+def test_lazy_nested_and_drop_empty():
+    inner = serializer(field('name'), many('tracks', serializer=artist_serializer))
+    outer = serializer(child('album', serializer=inner))
+
+    class Outer(object):
+        album = Album()
+        album.name = 'x'
+
+    data = outer.serialize(Outer(), context=lazy_context)
+    assert isinstance(data['album']['tracks'], LazyMany)
+    assert materialize(data) == outer.serialize(Outer())
+
+    context = SerializationContext(lazy=True, drop_empty=True)
+    album_serializer = serializer(*fields)
+    assert album_serializer.serialize(Album(), context=context) == \
+        album_serializer.serialize(Album(), context=SerializationContext(drop_empty=True))
+    assert type(album_serializer.serialize(Album(), context=context)['artist']) is dict
+
+
+def test_lazy_dump_stream():
+    album_serializer = serializer(*fields)
+    fileobj = io.BytesIO()
+
+    album_serializer.dump_stream([Album()], fileobj, context=lazy_context)
+
+    assert json.loads(fileobj.getvalue().decode('utf-8')) == [album_serializer.serialize(Album())]
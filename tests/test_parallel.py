@@ -0,0 +1,111 @@
+import datetime
+import itertools
+import pickle
+
+import pytest
+
+from strainer import (serializer, field, dict_field, multiple_field, child,
+                      many, validators, formatters, SerializationContext,
+                      ValidationException)
+
+
+class ChildTestObject(object):
+    c1 = 'a'
+
+
+class TestObject(object):
+    a = 1
+    b = ChildTestObject()
+    c = [ChildTestObject(), ChildTestObject()]
+    d = [1, 2]
+    when = datetime.datetime(1984, 6, 11, 12, 1)
+
+
+child_serializer = serializer(
+    field('c1', validators=[validators.required(), validators.string(max_length=2)])
+)
+
+a_serializer = serializer(
+    field('a', validators=[validators.integer(bounds=(0, 10))]),
+    field('when', validators=[validators.datetime()],
+          formatters=[formatters.format_datetime()]),
+    multiple_field('d', validators=[validators.integer()]),
+    child('b', serializer=child_serializer, validators=[validators.required()]),
+    many('c', serializer=child_serializer),
+)
+
+
+def test_pickle_translators():
+    for a_serializer_ in [a_serializer, serializer(field('a'), compiled=True)]:
+        clone = pickle.loads(pickle.dumps(a_serializer_))
+
+        assert clone.kind == a_serializer_.kind
+        assert clone.serialize(TestObject()) == a_serializer_.serialize(TestObject())
+
+    clone = pickle.loads(pickle.dumps(a_serializer))
+    payload = a_serializer.serialize(TestObject())
+    assert clone.deserialize(payload) == a_serializer.deserialize(payload)
+
+    clone = pickle.loads(pickle.dumps(dict_field('x')))
+    target = {}
+    clone.serialize({'x': 1}, target)
+    assert target == {'x': 1}
+
+
+def test_pickle_unpicklable():
+    with pytest.raises(Exception):
+        pickle.dumps(serializer(field('a', attr_getter=lambda x: x.a)))
+
+
+@validators.export_validator
+def at_least(value, minimum, context=None):
+    if value < minimum:
+        raise ValidationException('Too small')
+
+    return value
+
+
+def test_pickle_exported():
+    exported = [at_least(3), validators.integer(bounds=(0, 10)), formatters.format_datetime()]
+    for function in exported:
+        clone = pickle.loads(pickle.dumps(function))
+        assert (clone.func, clone.args, clone.keywords) == (function.func, function.args,
+                                                           function.keywords)
+
+    assert clone(datetime.date(2017, 1, 1)) == '2017-01-01'
+    assert getattr(at_least(3).func, '__qualname__', 'at_least') == 'at_least'
+
+
+def test_deserialize_parallel():
+    items = []
+    for i in range(250):
+        items.append({
+            'a': 'x' if i % 7 == 0 else i,
+            'd': [i, i + 1],
+            'b': {'c1': 'a'},
+            'c': [{'c1': 'b'}, {} if i % 11 == 0 else {'c1': 'c'}],
+        })
+
+    expected = a_serializer.deserialize_many(items)
+    results = a_serializer.deserialize_parallel(iter(items), workers=2, chunk_size=16)
+
+    assert results == expected
+    assert sorted(results[1]) == sorted(set(range(0, 250, 7)) | set(range(0, 250, 11)))
+
+    context = SerializationContext(drop_empty=True)
+    assert a_serializer.deserialize_parallel([], workers=1, context=context) == ([], {})
+
+
+def test_deserialize_parallel_fail_fast():
+    valid = {'a': 1, 'd': [1], 'b': {'c1': 'a'}, 'c': []}
+    items = [valid] * 40 + [{'a': 'x', 'b': {'c1': 'a'}}, {'b': {}}] + [valid] * 40
+    context = SerializationContext(fail_fast=True)
+
+    expected = a_serializer.deserialize_many(items, context=context)
+    assert a_serializer.deserialize_parallel(items, workers=2, chunk_size=16,
+                                             context=context) == expected
+
+    # Chunks are only read a few at a time, so an endless iterable still stops
+    endless = itertools.chain(items, itertools.repeat(valid))
+    assert a_serializer.deserialize_parallel(endless, workers=2, chunk_size=16,
+                                             context=context) == expected
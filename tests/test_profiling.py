@@ -0,0 +1,135 @@
+import pytest
+
+from strainer import (serializer, field, dict_field, multiple_field, child, many,
+                      formatters, validators, ValidationException,
+                      SerializationContext)
+from strainer.profiling import Profile
+from strainer.structure import Translator, profiled
+
+
+class Track(object):
+    def __init__(self, title):
+        self.title = title
+
+
+class Album(object):
+    def __init__(self):
+        self.title = 'Hunky Dory'
+        self.tags = ['rock']
+        self.artist = Track('David Bowie')
+        self.tracks = [Track('Changes'), Track('Oh! You Pretty Things')]
+
+
+track_serializer = serializer(
+    field('title', validators=[validators.required(), validators.string()]),
+)
+
+
+def build(compiled=False):
+    return serializer(
+        field('title', validators=[validators.required()],
+              formatters=[formatters.format_datetime()]),
+        multiple_field('tags', validators=[validators.string()]),
+        child('artist', serializer=track_serializer),
+        many('tracks', serializer=track_serializer),
+        compiled=compiled,
+    )
+
+
+def test_profile_serialize_and_deserialize():
+    for compiled in [False, True]:
+        album_serializer = build(compiled)
+        profile = Profile()
+        context = SerializationContext(profile=profile)
+
+        data = album_serializer.serialize(Album(), context=context)
+        assert data == album_serializer.serialize(Album())
+        assert album_serializer.deserialize(data, context=context) == \
+            album_serializer.deserialize(data)
+
+        stats = profile.as_dict()
+        assert sorted(stats['serialize']) == [
+            'artist', 'artist.title', 'tags', 'title', 'tracks', 'tracks[].title',
+        ]
+        assert stats['serialize']['tracks']['calls'] == 1
+        assert stats['serialize']['tracks[].title']['calls'] == 2
+        assert stats['serialize']['title']['formatters']['format_datetime']['calls'] == 1
+
+        validators_run = stats['deserialize']['tracks[].title']['validators']
+        assert sorted(validators_run) == ['required', 'string']
+        assert validators_run['required']['calls'] == 2
+        assert stats['deserialize']['tags']['validators']['string']['calls'] == 1
+
+
+def test_profile_errors_and_batches():
+    album_serializer = build()
+    profile = Profile()
+    context = SerializationContext(profile=profile)
+
+    with pytest.raises(ValidationException) as e:
+        album_serializer.deserialize({'artist': {}, 'tracks': [{}]}, context=context)
+
+    assert e.value.errors == {
+        'title': ['This field is required'],
+        'artist': {'title': ['This field is required']},
+        'tracks': {0: {'title': ['This field is required']}},
+    }
+
+    album_serializer.serialize_many([Album(), Album()], context=context)
+    results, errors = album_serializer.deserialize_many(
+        [{'title': 'a', 'artist': {'title': 'b'}}, {'artist': {}}], context=context)
+    assert len(results) == 1 and list(errors) == [1]
+
+    stats = profile.as_dict()
+    assert stats['serialize']['title']['calls'] == 2
+    assert stats['deserialize']['title']['calls'] == 3
+
+
+def test_profile_report():
+    profile = Profile()
+    a_serializer = serializer(field('a', validators=[validators.integer()]),
+                              dict_field('b'))
+    a_serializer.deserialize({'a': '1'}, context=SerializationContext(profile=profile))
+
+    rows = profile.rows()
+    assert [row['total'] for row in rows] == sorted([row['total'] for row in rows],
+                                                    reverse=True)
+    assert [(row['path'], row['name']) for row in profile.rows(sort='path')] == [
+        ('a', None), ('a', 'integer'), ('b', None),
+    ]
+
+    report = profile.report(limit=2).split('\n')
+    assert len(report) == 3
+    assert report[0].split()[:3] == ['direction', 'path', 'kind']
+
+    profile.clear()
+    assert profile.as_dict() == {}
+
+
+def test_profile_custom_translator():
+    def serialize(source, target, context=None):
+        target['custom'] = 1
+        return target
+
+    def deserialize(source, target, context=None):
+        raise ValidationException({'custom': 'Nope'})
+
+    a_serializer = serializer(field('title'), Translator(serialize, deserialize))
+    profile = Profile()
+    context = SerializationContext(profile=profile)
+
+    assert a_serializer.serialize(Track('x'), context=context) == {'title': 'x', 'custom': 1}
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize({}, context=context)
+
+    assert e.value.errors == {'custom': 'Nope'}
+    assert profile.as_dict()['deserialize']['<custom>']['calls'] == 1
+
+
+def test_profiled_is_built_once():
+    a_serializer = build()
+    twin = profiled(a_serializer)
+
+    assert profiled(a_serializer) is twin
+    assert profiled(twin) is twin
+    assert a_serializer.serialize(Album()) == twin.serialize(Album())
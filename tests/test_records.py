@@ -0,0 +1,84 @@
+import asyncio
+import pickle
+
+import pytest
+
+from strainer import serializer, field, child, many, validators, ValidationException
+from strainer.records import Record
+from strainer.structure import Translator
+
+
+track_serializer = serializer(field('title'), field('number', validators=[validators.integer()]),
+                              record=True)
+
+
+def album_serializer(**kwargs):
+    return serializer(
+        field('title', validators=[validators.required()]),
+        child('artist', serializer=serializer(field('name'), record=True)),
+        many('tracks', serializer=track_serializer),
+        record=True, **kwargs
+    )
+
+
+data = {'title': 'Low', 'artist': {'name': 'David Bowie'},
+        'tracks': [{'title': 'Speed of Life', 'number': '1'}]}
+expected = {'title': 'Low', 'artist': {'name': 'David Bowie'},
+            'tracks': [{'title': 'Speed of Life', 'number': 1}]}
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_records(compiled):
+    a_serializer = album_serializer(compiled=compiled)
+    album = a_serializer.deserialize(data)
+
+    assert isinstance(album, Record)
+    assert not hasattr(album, '__dict__')
+    assert album.title == 'Low'
+    assert album.artist.name == 'David Bowie'
+    assert album.tracks[0].number == 1
+    assert album.to_dict() == expected
+    assert album == expected
+
+    albums, errors = a_serializer.deserialize_many([data, {'title': None, 'artist': {}, 'tracks': []}])
+    assert albums == [expected]
+    assert isinstance(albums[0], Record)
+    assert list(errors) == [1]
+
+    with pytest.raises(ValidationException):
+        a_serializer.deserialize({'title': None, 'artist': {}, 'tracks': []})
+
+
+def test_records_partial_pickle_and_async():
+    a_serializer = album_serializer()
+
+    album = a_serializer.deserialize({'title': 'Low'}, partial=True)
+    assert album.to_dict() == {'title': 'Low'}
+    with pytest.raises(AttributeError):
+        album.artist
+
+    album = a_serializer.deserialize(data)
+    assert pickle.loads(pickle.dumps(album)) == album
+    assert type(pickle.loads(pickle.dumps(album.artist))) is type(album.artist)
+
+    album = asyncio.run(a_serializer.adeserialize(data))
+    assert isinstance(album, Record)
+    assert album == expected
+
+    only_title = a_serializer.only('title').deserialize(data)
+    assert only_title.to_dict() == {'title': 'Low'}
+
+
+def test_records_fields():
+    custom = Translator(lambda source, target, context=None: target,
+                        lambda source, target, context=None: target)
+
+    with pytest.raises(TypeError):
+        serializer(field('a'), custom, record=True)
+
+    with pytest.raises(ValueError):
+        serializer(field('a.b'), record=True)
+
+    for name in ['to_dict', 'from_dict', '_items', '_build_from_dict', '__eq__']:
+        with pytest.raises(ValueError):
+            serializer(field(name), record=True)
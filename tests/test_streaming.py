@@ -0,0 +1,162 @@
+import io
+import json
+
+import pytest
+
+from strainer import (serializer, field, child, many, validators,
+                      ValidationException, SerializationContext)
+from strainer.streaming import iter_json_array, JSONStreamError
+
+
+def parse(text, chunk_size=1):
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+
+    return list(iter_json_array(io.BytesIO(text), chunk_size=chunk_size))
+
+
+def test_iter_json_array():
+    values = [1, 12345, -1.5e10, 'a', u'snøwman ☃', True, False, None,
+              {'a': [1, {'b': 'c]'}]}, [], {}, '\\"', [[1, 2], [3]]]
+    text = json.dumps(values, ensure_ascii=False)
+
+    for chunk_size in [1, 2, 3, 7, 1024]:
+        assert parse(text, chunk_size) == values
+        assert parse(json.dumps(values), chunk_size) == values
+
+
+def test_iter_json_array_whitespace():
+    assert parse(' \n[ 1 ,\t2\n, 3 ] \n') == [1, 2, 3]
+    assert parse('[]') == []
+    assert parse('  [  ]  ') == []
+    assert parse(u'﻿[1]') == [1]
+
+
+def test_iter_json_array_text_stream():
+    assert list(iter_json_array(io.StringIO(u'[1, "a"]'), chunk_size=2)) == [1, 'a']
+
+
+def test_iter_json_array_errors():
+    for text in ['', '{}', '[1, 2', '[1 2]', '[1,]', '[{"a": }]', '["abc', '[1]x', '[] []']:
+        with pytest.raises(JSONStreamError):
+            parse(text)
+
+
+def test_iter_json_array_error_does_not_read_the_rest():
+    data = io.BytesIO(b'[1, tru, ' + b', '.join([b'1'] * 100000) + b']')
+
+    with pytest.raises(JSONStreamError):
+        list(iter_json_array(data, chunk_size=64))
+
+    assert data.tell() <= 128
+
+
+def test_iter_json_array_is_lazy():
+    class CountingReader(object):
+        def __init__(self, count):
+            self.reads = 0
+            self.data = io.BytesIO(json.dumps(list(range(count))).encode('utf-8'))
+
+        def read(self, size):
+            self.reads += 1
+            return self.data.read(size)
+
+    reader = CountingReader(100000)
+    items = iter_json_array(reader, chunk_size=64)
+
+    assert next(items) == 0
+    assert reader.reads == 1
+
+    assert sum(items) == sum(range(100000))
+
+
+def test_iter_deserialize():
+    child_serializer = serializer(
+        field('c1', validators=[validators.required()])
+    )
+    a_serializer = serializer(
+        field('a', validators=[validators.integer()]),
+        child('b', serializer=child_serializer),
+        many('c', serializer=child_serializer),
+    )
+    payload = [
+        {'a': '1', 'b': {'c1': 'x'}, 'c': [{'c1': 'y'}]},
+        {'a': 'x', 'b': {}, 'c': [{}]},
+        {'a': 2, 'b': {'c1': 'x'}, 'ignored': [1, 2, 3]},
+    ]
+    fileobj = io.BytesIO(json.dumps(payload).encode('utf-8'))
+
+    results = list(a_serializer.iter_deserialize(fileobj, chunk_size=5))
+
+    assert [index for index, _ in results] == [0, 1, 2]
+    assert results[0][1] == {'a': 1, 'b': {'c1': 'x'}, 'c': [{'c1': 'y'}]}
+    assert results[2][1] == {'a': 2, 'b': {'c1': 'x'}, 'c': []}
+
+    assert isinstance(results[1][1], ValidationException)
+    assert results[1][1].errors == {
+        'a': ['This field is not an integer'],
+        'b': {'c1': ['This field is required']},
+        'c': {0: {'c1': ['This field is required']}},
+    }
+
+
+class Row(object):
+    def __init__(self, i):
+        self.a = i
+        self.b = u'røw %s' % (i) if i % 2 else None
+
+
+row_serializer = serializer(field('a'), field('b'))
+
+
+def test_dump_stream_json():
+    rows = [Row(i) for i in range(50)]
+
+    for chunk_size in [1, 100, 1024 * 1024]:
+        fileobj = io.BytesIO()
+        count = row_serializer.dump_stream(iter(rows), fileobj, chunk_size=chunk_size)
+
+        assert count == 50
+        expected = json.dumps([row_serializer.serialize(row) for row in rows])
+        assert fileobj.getvalue() == expected.encode('utf-8')
+
+    fileobj = io.BytesIO()
+    assert row_serializer.dump_stream([], fileobj) == 0
+    assert fileobj.getvalue() == b'[]'
+
+
+def test_dump_stream_jsonl():
+    rows = [Row(i) for i in range(5)]
+    fileobj = io.StringIO()
+
+    row_serializer.dump_stream(rows, fileobj, format='jsonl', chunk_size=10)
+
+    lines = fileobj.getvalue().split('\n')
+    assert lines[-1] == ''
+    assert [json.loads(line) for line in lines[:-1]] == [
+        row_serializer.serialize(row) for row in rows
+    ]
+
+    fileobj = io.StringIO()
+    row_serializer.dump_stream([], fileobj, format='jsonl')
+    assert fileobj.getvalue() == ''
+
+    with pytest.raises(ValueError):
+        row_serializer.dump_stream([], fileobj, format='xml')
+
+
+def test_dump_stream_context_and_gzip():
+    import gzip
+
+    rows = [Row(i) for i in range(10)]
+    context = SerializationContext(drop_empty=True)
+    raw = io.BytesIO()
+
+    with gzip.GzipFile(fileobj=raw, mode='wb') as fileobj:
+        row_serializer.dump_stream(rows, fileobj, chunk_size=16, context=context)
+
+    written = gzip.GzipFile(fileobj=io.BytesIO(raw.getvalue())).read()
+    assert json.loads(written.decode('utf-8')) == [
+        row_serializer.serialize(row, context=context) for row in rows
+    ]
+    assert {'a': 0} in json.loads(written.decode('utf-8'))
@@ -4,7 +4,7 @@ from strainer import (field, dict_field, multiple_field,
                       serializer, child, many, validators,
                       ValidationException)
 
-from strainer.structure import emptyish, run_validators
+from strainer.structure import Translator, emptyish, run_validators, structure_cost
 from strainer.context import SerializationContext
 
 
@@ -159,6 +159,52 @@ def test_serializer():
     assert {'a': 1} == target
 
 
+def test_serializer_bulk_fetch():
+    from strainer import formatters
+
+    a_serializer = serializer(
+        field('a', target_field='z'),
+        field('b.c1'),
+        many('c', serializer=serializer(field('b1'))),
+        field('empty', formatters=[lambda value, context=None: value or 'x']),
+        field('a', target_field='custom', attr_getter=lambda source: source.a + 1),
+        field('e'),
+        field('e2'),
+    )
+
+    target = a_serializer.serialize(TestObject())
+    assert target == {'z': 1, 'b.c1': 'a', 'c': [{'b1': 2}, {'b1': 2}],
+                      'empty': 'x', 'custom': 2, 'e': [], 'e2': None}
+    assert list(target) == ['z', 'b.c1', 'c', 'empty', 'custom', 'e', 'e2']
+
+    target = a_serializer.serialize(TestObject(), context=serialization_context)
+    assert list(target) == ['z', 'b.c1', 'c', 'empty', 'custom', 'e']
+
+    dict_serializer = serializer(dict_field('a'), dict_field('b', target_field='y'),
+                                 dict_field('c', formatters=[formatters.format_datetime()]))
+    assert dict_serializer.serialize({'a': 1, 'b': 2, 'c': None}) == {'a': 1, 'y': 2, 'c': None}
+    assert dict_serializer.serialize({'b': 2}) == {'a': None, 'y': 2, 'c': None}
+    assert serializer(dict_field('a')).serialize({}) == {'a': None}
+
+    class Both(dict):
+        a = 'attribute'
+
+    mixed_serializer = serializer(dict_field('b'), field('a'), dict_field('c'))
+    assert mixed_serializer.serialize(Both(b=1)) == {'b': 1, 'a': 'attribute', 'c': None}
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_serializer_dict_subclasses(compiled):
+    from collections import Counter, defaultdict
+
+    a_serializer = serializer(dict_field('x'), dict_field('y'), compiled=compiled)
+    assert a_serializer.serialize(Counter(y=2)) == {'x': None, 'y': 2}
+
+    source = defaultdict(list, y=1)
+    assert a_serializer.serialize(source) == {'x': None, 'y': 1}
+    assert dict(source) == {'y': 1}
+
+
 def test_child():
     child_serializer = serializer(
         field('b1')
@@ -336,6 +382,57 @@ def test_multiple_field_full_validation():
     assert errors == {'e': {1: ['This field is to long, max length is 1'], '_full_errors': ['Invalid']}}
 
 
+def test_multiple_field_batch_validation():
+    serializer = multiple_field('e', batch_validators=[validators.datetimes()],
+                                validators=[validators.required()])
+
+    target = serializer.deserialize({'e': ['2017-01-01', '2017-01-02T10:00:00Z']}, {})
+    assert [d.day for d in target['e']] == [1, 2]
+
+    errors = None
+    try:
+        serializer.deserialize({'e': ['2017-01-01', 'x', None]}, {})
+    except ValidationException as e:
+        errors = e.errors
+
+    assert list(errors) == ['e']
+    assert list(errors['e']) == [1]
+    assert errors['e'][1][0].startswith('Invalid date:')
+
+    try:
+        serializer.deserialize({'e': ['2017-01-01', None]}, {})
+    except ValidationException as e:
+        errors = e.errors
+
+    assert errors == {'e': {1: ['This field is required']}}
+
+
+def test_multiple_field_vectorized_validation():
+    serializer = multiple_field('e', batch_validators=[validators.integers(bounds=(0, 10))])
+
+    assert serializer.deserialize({'e': ['1', 2, 50]}, {}) == {'e': [1, 2, 10]}
+    assert serializer.deserialize({'e': None}, {}) == {'e': []}
+
+    errors = None
+    try:
+        serializer.deserialize({'e': ['1', 'x', 2, None]}, {})
+    except ValidationException as e:
+        errors = e.errors
+
+    assert errors == {'e': {1: ['This field is not an integer'],
+                            3: ['This field is not an integer']}}
+
+
+def test_multiple_field_numpy():
+    np = pytest.importorskip('numpy')
+
+    serializer = multiple_field('e', batch_validators=[validators.floats()])
+    result = serializer.deserialize({'e': np.array([1, 2])}, {})
+    assert result['e'].tolist() == [1.0, 2.0]
+
+    assert serializer.deserialize({'e': np.array([])}, {}) == {'e': []}
+
+
 def test_many_full_validation():
     size_serializer = serializer(
         dict_field('size')
@@ -366,3 +463,238 @@ def test_multiple_field_empty():
     target = serializer.deserialize(test_obj, target)
 
     assert target['e2'] == []
+
+
+def test_serialize_many():
+    child_serializer = serializer(
+        field('c1'),
+        field('b1'),
+    )
+    a_serializer = serializer(
+        field('a'),
+        field('empty'),
+        child('b', serializer=child_serializer),
+        many('c', serializer=child_serializer),
+    )
+    objects = [TestObject(), TestObject(), TestObject()]
+
+    for context in [None, serialization_context]:
+        expected = [a_serializer.serialize(o, context=context) for o in objects]
+        assert a_serializer.serialize_many(objects, context=context) == expected
+        assert a_serializer.serialize_many(iter(objects), context=context) == expected
+
+    assert a_serializer.serialize_many([]) == []
+
+
+def test_deserialize_many():
+    child_serializer = serializer(
+        field('c1', validators=[validators.required()])
+    )
+    a_serializer = serializer(
+        field('a', validators=[validators.integer()]),
+        many('c', serializer=child_serializer),
+    )
+
+    items = [
+        {'a': '1', 'c': [{'c1': 'a'}]},
+        {'a': 'b', 'c': [{'c1': 'a'}]},
+        {'a': 2, 'c': [{}, {'c1': 'a'}]},
+        {'a': 3},
+    ]
+
+    results, errors = a_serializer.deserialize_many(items)
+
+    assert results == [{'a': 1, 'c': [{'c1': 'a'}]}, {'a': 3, 'c': []}]
+    assert errors == {
+        1: {'a': ['This field is not an integer']},
+        2: {'c': {0: {'c1': ['This field is required']}}},
+    }
+
+
+def test_translator_many_fallback():
+    double = Translator(lambda x, context=None: x * 2, lambda x, context=None: int(x))
+
+    assert double.serialize_many([1, 2]) == [2, 4]
+    assert double.deserialize_many(['1', '2']) == ([1, 2], {})
+
+
+fail_fast_context = SerializationContext(fail_fast=True)
+
+
+def counting_validator(calls):
+    def validator(value, context=None):
+        calls.append(value)
+        return value
+
+    return validator
+
+
+def test_fail_fast():
+    calls = []
+    child_serializer = serializer(
+        field('c1', validators=[validators.required()]),
+        field('c2', validators=[counting_validator(calls)]),
+    )
+    a_serializer = serializer(
+        field('a', validators=[validators.integer(), validators.required()]),
+        multiple_field('d', validators=[validators.integer(), counting_validator(calls)]),
+        many('c', serializer=child_serializer),
+        field('z', validators=[counting_validator(calls)]),
+    )
+
+    payload = {'a': 'x', 'd': ['x', 1], 'c': [{}, {}], 'z': 1}
+
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize(payload, context=fail_fast_context)
+
+    assert e.value.errors == {'a': ['This field is not an integer']}
+    assert calls == []
+
+    payload['a'] = 1
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize(payload, context=fail_fast_context)
+
+    assert e.value.errors == {'d': {0: ['This field is not an integer']}}
+    assert calls == []
+
+    payload['d'] = [1]
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize(payload, context=fail_fast_context)
+
+    assert e.value.errors == {'c': {0: {'c1': ['This field is required']}}}
+    assert calls == [1]
+
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize(payload)
+
+    assert e.value.errors == {'c': {0: {'c1': ['This field is required']},
+                                    1: {'c1': ['This field is required']}}}
+
+
+def test_fail_fast_deserialize_many():
+    a_serializer = serializer(field('a', validators=[validators.integer()]))
+
+    items = [{'a': 1}, {'a': 'x'}, {'a': 'y'}, {'a': 2}]
+
+    assert a_serializer.deserialize_many(items, context=fail_fast_context) == (
+        [{'a': 1}], {1: {'a': ['This field is not an integer']}}
+    )
+    assert len(a_serializer.deserialize_many(items)[1]) == 2
+
+
+def test_order_by_cost():
+    calls = []
+    child_serializer = serializer(field('c1', validators=[counting_validator(calls)]))
+
+    fields = [
+        many('c', serializer=child_serializer),
+        field('when', validators=[validators.datetime()]),
+        field('a', validators=[validators.required(), validators.integer()]),
+    ]
+    payload = {'c': [{'c1': 1}], 'when': 'not a date', 'a': None}
+
+    ordered = serializer(*fields, order_by_cost=True)
+
+    with pytest.raises(ValidationException) as e:
+        ordered.deserialize(payload, context=fail_fast_context)
+
+    assert e.value.errors == {'a': ['This field is required']}
+    assert calls == []
+
+    with pytest.raises(ValidationException) as e:
+        serializer(*fields).deserialize(payload, context=fail_fast_context)
+
+    assert calls == [1]
+    assert list(e.value.errors) == ['when']
+
+    payload = {'c': [{'c1': 1}], 'when': '2017-01-01', 'a': '1'}
+    assert ordered.deserialize(payload) == serializer(*fields).deserialize(payload)
+    assert list(ordered.deserialize(payload)) == ['a', 'when', 'c']
+
+
+def test_structure_cost():
+    child_serializer = serializer(field('c1'))
+
+    assert structure_cost(field('a')) == 1
+    assert structure_cost(field('a', validators=[validators.required()])) == 2
+    assert structure_cost(field('a', validators=[lambda x, context=None: x])) == 6
+    assert (structure_cost(field('a', validators=[validators.datetime()])) >
+            structure_cost(field('a', validators=[validators.integer()])))
+    assert (structure_cost(many('c', serializer=child_serializer)) >
+            structure_cost(child('c', serializer=child_serializer)))
+
+
+def test_custom_translator_errors():
+    def deserialize(source, target, context=None):
+        raise ValidationException({'custom': ['Invalid']})
+
+    custom = Translator(lambda source, target, context=None: target, deserialize)
+    custom_serializer = Translator(None, lambda source, context=None: raise_validator(source))
+
+    a_serializer = serializer(
+        field('a', validators=[validators.integer()]),
+        custom,
+        child('b', serializer=custom_serializer),
+        many('c', serializer=custom_serializer),
+    )
+
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize({'a': 'x', 'b': {}, 'c': [{}, {}]})
+
+    # Errors a nested serializer raises are kept as they are
+    assert e.value.errors == {
+        'a': ['This field is not an integer'],
+        'custom': ['Invalid'],
+        'b': 'Invalid',
+        'c': {0: 'Invalid', 1: 'Invalid'},
+    }
+
+
+def test_loads():
+    a_serializer = serializer(field('a', validators=[validators.integer()]),
+                              child('b', serializer=serializer(field('c'))))
+
+    assert a_serializer.loads('{"a": "1", "b": {"c": 2}, "d": [1]}') == {'a': 1, 'b': {'c': 2}}
+    assert a_serializer.loads(b'{"a": 1, "b": {}}') == {'a': 1, 'b': {'c': None}}
+
+    with pytest.raises(ValidationException):
+        a_serializer.loads('{"a": "x", "b": {}}')
+
+    with pytest.raises(ValueError):
+        a_serializer.loads('{"a": 1')
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_partial_deserialize(compiled):
+    def full_validator(value, context=None):
+        if value['c'] == {'d': 2}:
+            raise ValidationException('d can not be 2')
+        return value
+
+    a_serializer = serializer(
+        field('a', validators=[validators.required(), validators.integer()]),
+        field('b', validators=[validators.integer()]),
+        child('c', serializer=serializer(field('d', validators=[validators.required()])),
+              full_validators=[full_validator]),
+        Translator(lambda source, target, context=None: target,
+                   lambda source, target, context=None: target.update(x=1) or target),
+        compiled=compiled,
+    )
+
+    assert a_serializer.deserialize({'b': '1', 'other': 1}, partial=True) == {'b': 1}
+    assert a_serializer.deserialize({}, partial=True) == {}
+    assert a_serializer.deserialize({'c': {'d': 1}}, partial=True) == {'c': {'d': 1}}
+
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize({'b': 'x', 'c': {}}, partial=True)
+
+    assert e.value.errors == {'b': ['This field is not an integer'],
+                              'c': {'d': ['This field is required']}}
+
+    with pytest.raises(ValidationException) as e:
+        a_serializer.deserialize({'c': {'d': 2}}, partial=True)
+
+    assert e.value.errors == {'c': {'_full_errors': ['d can not be 2']}}
+
+    with pytest.raises(ValidationException):
+        a_serializer.deserialize({'b': '1', 'c': {'d': 1}})
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 import pytest
 import datetime
 
@@ -68,3 +69,100 @@ def test_datetime():
     assert type(validator('1970-01-01')) is datetime.datetime
     assert validator('') is None
     assert validator(None) is None
+
+
+def test_datetime_matches_iso8601():
+    import iso8601
+
+    values = [
+        '1970-01-01', '2017-06-11T12:01:02', '2017-06-11 12:01:02.5',
+        '2017-06-11T12:01:02.123456Z', '2017-06-11T12:01:02+05:30',
+        '2017-06-11T12:01:02-00:00', '2017-06-11T12:01', '20170611T120102Z',
+    ]
+    validator = validators.datetime()
+
+    for value in values:
+        expected = iso8601.parse_date(value)
+        actual = validator(value)
+        assert actual == expected
+        assert actual.tzinfo.tzname(actual) == expected.tzinfo.tzname(expected)
+
+    for value in ['2017-02-30', '2017-13-01T00:00:00Z', u'٢٠١٧-01-01', 'x', 1]:
+        with pytest.raises(iso8601.ParseError) as expected:
+            iso8601.parse_date(value)
+        with pytest.raises(ValidationException) as actual:
+            validator(value)
+
+        assert actual.value.errors == 'Invalid date: %s' % (expected.value)
+
+
+def test_datetimes():
+    validator = validators.datetimes()
+    assert validator(['1970-01-01', None, '']) == [
+        validators.datetime()('1970-01-01'), None, None,
+    ]
+
+    with pytest.raises(ValidationException) as e:
+        validator(['1970-01-01', 'x', '2017-02-30'])
+
+    assert sorted(e.value.errors) == [1, 2]
+    assert e.value.errors[1].startswith('Invalid date:')
+
+
+def test_integers():
+    validator = validators.integers()
+    assert validator([1, '2', 3.5, True]) == [1, 2, 3, 1]
+    assert validator([]) == []
+
+    with pytest.raises(ValidationException) as e:
+        validator([1, 'x', None, '4'])
+    assert e.value.errors == {1: 'This field is not an integer',
+                              2: 'This field is not an integer'}
+
+    validator = validators.integers(bounds=(10, 15))
+    assert validator(['9', 10, 15, 16]) == [10, 10, 15, 15]
+    assert validator([10, 11]) == [10, 11]
+
+
+def test_floats_and_booleans():
+    assert validators.floats()(['1.5', 2, 3.25]) == [1.5, 2.0, 3.25]
+    result = validators.floats(bounds=(0, 1))([-1, 0.5, 2])
+    assert result == [0, 0.5, 1]
+    assert [type(value) for value in result] == [float, float, float]
+
+    with pytest.raises(ValidationException) as e:
+        validators.floats()(['1.5', 'x'])
+    assert e.value.errors == {1: 'This field is not a float'}
+
+    assert validators.booleans()(['1', 0, None, [1]]) == [True, False, False, True]
+
+
+def test_vectorized_numpy():
+    np = pytest.importorskip('numpy')
+
+    result = validators.integers(bounds=(0, 10))(np.array([-5, 5, 50]))
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == [0, 5, 10]
+
+    assert validators.integers()(np.array([1.5, 2.0])).tolist() == [1, 2]
+    with pytest.raises(ValidationException) as e:
+        validators.integers()(np.array([1.0, np.nan, np.inf]))
+    assert e.value.errors == {1: 'This field is not an integer',
+                              2: 'This field is not an integer'}
+
+    with pytest.raises(ValidationException) as e:
+        validators.integers()(np.array([1.0, 1e19, -1e19, 2.0 ** 63, -2.0 ** 63]))
+    assert e.value.errors == {1: 'This field is out of range',
+                              2: 'This field is out of range',
+                              3: 'This field is out of range'}
+
+    assert validators.integers()(np.array(['1', '2'])) == [1, 2]
+
+    result = validators.floats()(np.array([1, 2]))
+    assert result.dtype == np.float64
+
+    result = validators.floats(bounds=(0, 1))(np.array([-1, 2]))
+    assert result.dtype == np.float64
+    assert result.tolist() == [0.0, 1.0]
+
+    assert validators.booleans()(np.array([0, 2])).tolist() == [False, True]